@@ -10,6 +10,13 @@ Chaque action prend en paramètre:
 Les méthodes valident l'entrée et retournent True si l'action réussit.
 """
 
+import debuglog
+import events
+import journal
+import savegame
+import undo
+from beamer import DEFAULT_SLOT
+
 # Messages d'erreur informatifs
 MSG0 = ("\n❌ Erreur: La commande '{command_word}' ne prend pas de paramètre.\n"
         "   Utilisation: {command_word}\n")
@@ -33,6 +40,43 @@ def _validate_param_count(list_of_words, expected_count):
         return False, f"attendu {expected_count}, reçu {actual_count}"
     return True, ""
 
+def _parse_quantity(list_of_words, usage):
+    """
+    Lire la quantité optionnelle d'une commande `<verbe> <item> [quantité]`.
+
+    Args:
+        list_of_words (list): Liste des mots saisis
+        usage (str): Utilisation de la commande, affichée en cas d'erreur
+
+    Returns:
+        int: La quantité (1 par défaut), None si elle est invalide
+    """
+    if len(list_of_words) < 3 or not list_of_words[2]:
+        return 1
+    if len(list_of_words) > 3 or not list_of_words[2].isdigit() \
+            or int(list_of_words[2]) < 1:
+        print("\n❌ Erreur: La quantité doit être un entier positif.")
+        print(f"   Utilisation: {usage}\n")
+        return None
+    return int(list_of_words[2])
+
+def _print_suggestion(game, source, name):
+    """
+    Proposer le nom le plus proche d'un nom introuvable (faute de frappe).
+
+    Args:
+        game (Game): L'instance du jeu
+        source (str): Noms candidats (voir completion.COMMAND_SOURCES)
+        name (str): Le nom saisi
+    """
+    names = game.completer.suggest(source, name)
+    if names:
+        print(f"   💡 Vouliez-vous dire '{names[0]}' ?")
+
+def _quantity_label(name, count):
+    """Désignation de `count` exemplaires de l'objet `name` dans les messages."""
+    return f"'{name}'" if count == 1 else f"{count} × '{name}'"
+
 class Actions:
     """
     Classe contenant toutes les actions disponibles du jeu.
@@ -136,16 +180,11 @@ class Actions:
         print("\n🔄 Redémarrage du jeu...\n")
 
         # Réinitialisation complète de l'état du jeu
-        game.rooms = []
-        game.commands = {}
-        game.valid_directions = set()
-        game.player = None
-        game.quest_manager = None
-        game.finished = False
-        game.victory = False
+        game.reset()
 
         # Relancer la configuration
         game.setup()
+        game.mark_dirty()
 
         # Afficher le message de bienvenue
         game.print_welcome()
@@ -222,8 +261,8 @@ class Actions:
             print("\n📭 Il n'y a aucun objet dans ce lieu.")
         else:
             print("\n📦 Vous voyez les objets suivants :")
-            for item in room.inventory.values():
-                print(f"    - {item}")
+            for item, quantity in room.inventory.stacks():
+                print(f"    - {item.describe(quantity)}")
 
         return False
 
@@ -231,31 +270,36 @@ class Actions:
     @staticmethod
     def take(game, list_of_words, _number_of_parameters):
         """
-        Prendre un objet dans la salle actuelle.
+        Prendre un objet (ou plusieurs exemplaires d'une pile) dans la salle actuelle.
         
         Paramètres:
             game (Game): L'instance du jeu
-            list_of_words (list): ["take", nom_item]
+            list_of_words (list): ["take", nom_item] ou ["take", nom_item, quantité]
             number_of_parameters (int): 1
             
         Validation:
-        - L'item doit exister dans la salle
+        - L'item doit exister dans la salle, en quantité suffisante
         - Le poids total ne doit pas dépasser la limite (10 kg)
         
         Erreurs possibles:
         - Item introuvable
+        - Quantité invalide ou insuffisante
         - Inventaire plein (poids)
         
         Exemples:
             >>> take(game, ["take", "tresor"], 1)  # Prendre un trésor
+            >>> take(game, ["take", "noix", "3"], 1)  # Prendre 3 noix
         """
         # Validation du nombre de paramètres
         if len(list_of_words) < 2:
             print("\n❌ Erreur: Prendre quoi ?")
-            print("   Utilisation: take <nom_item>\n")
+            print("   Utilisation: take <nom_item> [quantité]\n")
             return False
 
         item_name = list_of_words[1].strip().lower()
+        count = _parse_quantity(list_of_words, "take <nom_item> [quantité]")
+        if count is None:
+            return False
 
         # Validation: nom d'item non vide
         if not item_name:
@@ -272,30 +316,40 @@ class Actions:
 
         if not found_item:
             print(f"\n❌ Il n'y a pas de '{item_name}' ici.")
+            _print_suggestion(game, "room_items", item_name)
             items_str = ', '.join(room.inventory.keys()) if room.inventory else 'aucun'
             print(f"   Items disponibles : {items_str}\n")
             return False
 
         item = room.inventory[found_item]
+        available = room.inventory.quantity(found_item)
+        if count > available:
+            print(f"\n❌ Il n'y a que {available} '{found_item}' ici.\n")
+            return False
 
         # Vérifier si le joueur peut porter l'objet (poids)
-        current_weight = sum(i.weight for i in game.player.inventory.values())
+        current_weight = game.player.inventory.weight()
         max_weight = game.player.max_weight
+        weight = item.weight * count
+        label = _quantity_label(found_item, count)
+        what = label if count > 1 else f"l'objet {label}"
 
-        if current_weight + item.weight > max_weight:
+        if current_weight + weight > max_weight:
             remaining_capacity = max_weight - current_weight
-            print(f"\n❌ Vous ne pouvez pas porter '{found_item}'.")
+            print(f"\n❌ Vous ne pouvez pas porter {label}.")
             print(f"   Poids actuel : {current_weight:.1f} kg / {max_weight} kg")
-            print(f"   Poids de l'item : {item.weight:.1f} kg")
+            print(f"   Poids de l'item : {weight:.1f} kg")
             print(f"   Capacité restante : {remaining_capacity:.1f} kg\n")
             return False
 
         # Ajouter l'item à l'inventaire du joueur
-        game.player.inventory[found_item] = item
-        del room.inventory[found_item]
+        undo.add_items(game.player.inventory, item, count)
+        undo.remove_items(room.inventory, found_item, count)
+        events.emit(events.ItemTaken, game.player.name, room.name, found_item, count)
+        game.broadcast(room, f"👤 {game.player.name} prend {label}.", exclude=game.player)
 
-        print(f"\n✅ Vous avez pris l'objet '{found_item}'.")
-        print(f"   Poids actuel : {current_weight + item.weight:.1f} kg / {max_weight} kg\n")
+        print(f"\n✅ Vous avez pris {what}.")
+        print(f"   Poids actuel : {current_weight + weight:.1f} kg / {max_weight} kg\n")
 
         # Vérifier les objectifs de quête
         try:
@@ -310,15 +364,15 @@ class Actions:
     @staticmethod
     def drop(game, list_of_words, _number_of_parameters):
         """
-        Déposer un objet de l'inventaire dans la salle actuelle.
+        Déposer un objet (ou plusieurs exemplaires d'une pile) dans la salle actuelle.
         
         Paramètres:
             game (Game): L'instance du jeu
-            list_of_words (list): ["drop", nom_item]
+            list_of_words (list): ["drop", nom_item] ou ["drop", nom_item, quantité]
             number_of_parameters (int): 1
             
         Validation:
-        - L'item doit être dans l'inventaire du joueur
+        - L'item doit être dans l'inventaire du joueur, en quantité suffisante
         
         Exemples:
             >>> drop(game, ["drop", "tresor"], 1)  # Déposer un trésor
@@ -326,10 +380,13 @@ class Actions:
         # Validation du nombre de paramètres
         if len(list_of_words) < 2:
             print("\n❌ Erreur: Déposer quoi ?")
-            print("   Utilisation: drop <nom_item>\n")
+            print("   Utilisation: drop <nom_item> [quantité]\n")
             return False
 
         item_name = list_of_words[1].strip().lower()
+        count = _parse_quantity(list_of_words, "drop <nom_item> [quantité]")
+        if count is None:
+            return False
 
         # Validation: nom d'item non vide
         if not item_name:
@@ -345,30 +402,37 @@ class Actions:
 
         if not found_item:
             print(f"\n❌ Vous n'avez pas de '{item_name}' dans votre inventaire.")
+            _print_suggestion(game, "inventory", item_name)
             inv_list = ', '.join(game.player.inventory.keys()) if game.player.inventory else 'vide'
             print(f"   Inventaire: {inv_list}\n")
             return False
 
         item = game.player.inventory[found_item]
+        available = game.player.inventory.quantity(found_item)
+        if count > available:
+            print(f"\n❌ Vous n'avez que {available} '{found_item}'.\n")
+            return False
+        label = _quantity_label(found_item, count)
+        what = label if count > 1 else f"l'objet {label}"
 
         # Ajouter l'item à la pièce
-        game.player.current_room.inventory[found_item] = item
-        del game.player.inventory[found_item]
+        undo.add_items(game.player.current_room.inventory, item, count)
+        undo.remove_items(game.player.inventory, found_item, count)
+        events.emit(events.ItemDropped, game.player.name, game.player.current_room.name,
+                    found_item, count)
+        game.broadcast(game.player.current_room, f"👤 {game.player.name} dépose {label}.",
+                       exclude=game.player)
 
-        print(f"\n✅ Vous avez déposé l'objet '{found_item}'.\n")
+        print(f"\n✅ Vous avez déposé {what}.\n")
 
         # Interaction spécifique : Bananes -> Singes (via drop)
         if found_item == "bananes" and "Singes" in game.player.current_room.characters:
             print("Les singes se précipitent sur les bananes que vous avez laissées tomber !")
             print("Singes disent : 'Merci, tu peux désormais continuer ton aventure.'\n")
 
-            # Mettre à jour le message des singes
-            msg = ["Merci, tu peux désormais continuer ton aventure."]
-            game.player.current_room.characters["Singes"].msgs = msg
-
-            # Les singes prennent les bananes (on les retire du sol)
+            # Les singes prennent les bananes déposées (on les retire du sol)
             if found_item in game.player.current_room.inventory:
-                del game.player.current_room.inventory[found_item]
+                undo.remove_items(game.player.current_room.inventory, found_item, count)
 
             # Valider l'objectif de quête "donner bananes"
             try:
@@ -412,15 +476,15 @@ class Actions:
         if not inventory:
             print("\n📭 Votre inventaire est vide.\n")
         else:
-            current_weight = sum(i.weight for i in inventory.values())
+            current_weight = inventory.weight()
             max_weight = player.max_weight
             remaining = max_weight - current_weight
 
             print("\n" + "="*50)
             print("📦 INVENTAIRE")
             print("="*50)
-            for item in inventory.values():
-                print(f"  - {item}")
+            for item, quantity in inventory.stacks():
+                print(f"  - {item.describe(quantity)}")
             print("-" * 50)
             print(f"Poids total : {current_weight:.1f} kg / {max_weight} kg")
             print(f"Capacité restante : {remaining:.1f} kg")
@@ -431,8 +495,18 @@ class Actions:
     # Charge the beamer
 
     @staticmethod
-    def charge(game, _params, _n_params):
-        """Charger le beamer si le joueur en possède un."""
+    def charge(game, params, _n_params):
+        """
+        Charger le beamer : enregistrer la salle actuelle dans un emplacement.
+
+        Paramètres:
+            game (Game): L'instance du jeu
+            params (list): ["charge"] ou ["charge", emplacement]
+            _n_params (int): 1 (optionnel)
+
+        Exemples:
+            >>> charge(game, ["charge", "grotte"], 1)  # Mémoriser la salle sous "grotte"
+        """
         player = game.player
 
         # Vérifier si le joueur possède un beamer
@@ -441,14 +515,16 @@ class Actions:
             return False
 
         beamer = player.inventory["beamer"]
+        slot = params[1].strip().lower() if len(params) > 1 and params[1] else DEFAULT_SLOT
 
-        if getattr(beamer, "fixed_destination", False):
+        # Enregistrer la salle actuelle
+        if not beamer.charge(slot, player.current_room):
             print("\nCe beamer est déjà programmé pour une destination précise.\n")
             return False
-
-        # Enregistrer la salle actuelle
-        beamer.saved_room = player.current_room
-        print("\nLe beamer est chargé !\n")
+        if slot == DEFAULT_SLOT:
+            print("\nLe beamer est chargé !\n")
+        else:
+            print(f"\nLe beamer est chargé (emplacement '{slot}') !\n")
         try:
             if hasattr(game, 'quest_manager'):
                 game.quest_manager.check_action_objectives("charger", "beamer")
@@ -457,8 +533,19 @@ class Actions:
         return True
 
     @staticmethod
-    def fire(game, _params, _n_params):
-        """Utiliser le beamer pour se téléporter."""
+    def fire(game, params, _n_params):
+        """
+        Utiliser le beamer pour se téléporter.
+
+        La destination est lue dans l'emplacement demandé (celui par défaut
+        sans paramètre) ; l'arrivée déclenche l'effet déclaré pour la salle
+        dans Game.arrival_triggers.
+
+        Paramètres:
+            game (Game): L'instance du jeu
+            params (list): ["fire"] ou ["fire", emplacement]
+            _n_params (int): 1 (optionnel)
+        """
         player = game.player
 
         if "beamer" not in player.inventory:
@@ -466,35 +553,29 @@ class Actions:
             return False
 
         beamer = player.inventory["beamer"]
+        slot = params[1].strip().lower() if len(params) > 1 and params[1] else DEFAULT_SLOT
+        destination = beamer.target(slot)
 
         # Le beamer n'a jamais été chargé
-        if not hasattr(beamer, "saved_room"):
-            print("\nLe beamer n'est pas chargé !\n")
+        if destination is None:
+            if slot == DEFAULT_SLOT:
+                print("\nLe beamer n'est pas chargé !\n")
+            else:
+                slots = ', '.join(beamer.slots) if beamer.slots else 'aucun'
+                print(f"\nL'emplacement '{slot}' du beamer est vide !")
+                print(f"   Emplacements chargés : {slots}\n")
             return False
 
         # Téléportation
-        player.current_room = beamer.saved_room
-
-        if player.current_room.name == "Beach":
-            print("\nVous voilà de retour à la plage, Jacob semble vouloir parler.\n")
-
-            jacob = None
-            if "Jacob" in player.current_room.characters:
-                jacob = player.current_room.characters["Jacob"]
-            else:
-                for room in game.rooms:
-                    if "Jacob" in room.characters:
-                        jacob = room.characters.pop("Jacob")
-                        player.current_room.characters["Jacob"] = jacob
-                        jacob.current_room = player.current_room
-                        break
-
-            if jacob:
-                msg = ["Capitaine, vous et votre équipage avez réussi ! "
-                       "Êtes-vous prêt à repartir ? (oui/non)"]
-                jacob.msgs = msg
-                player.endgame_ready = True
-                player.endgame_awaiting_response = False
+        left_room = player.current_room
+        undo.record_attribute(player, "current_room")
+        player.current_room = destination
+        events.emit(events.PlayerMoved, player.name, left_room.name, destination.name)
+        game.announce_move(left_room, "disparaît dans un éclair")
+
+        trigger = game.arrival_triggers.get(destination.name)
+        if trigger is not None:
+            trigger.apply(game, destination)
         else:
             print("\nVous êtes téléporté !\n")
 
@@ -552,6 +633,7 @@ class Actions:
         # Vérifier si le personnage est dans la pièce actuelle
         if not found_key:
             print(f"\n❌ {character_name} n'est pas ici.")
+            _print_suggestion(game, "characters", character_name)
             if room.characters:
                 chars = ', '.join(room.characters.keys())
                 print(f"   Personnages disponibles : {chars}\n")
@@ -561,15 +643,11 @@ class Actions:
 
         # Récupérer le personnage et afficher son message
         character = room.characters[found_key]
-        msg = character.get_msg()
+        # Le dialogue du PNJ dépend du joueur (quêtes, objets, drapeaux) et peut
+        # modifier ses drapeaux (question de fin de Jacob : voir Game._setup_island)
+        msg = character.get_msg(game.player)
         print(f"\n{msg}\n")
 
-        # Activer la réponse oui/non si Jacob pose la question de fin
-        if (character.name == "Jacob" and game.player.current_room.name == "Beach"
-                and "Êtes-vous prêt à repartir" in msg):
-            game.player.endgame_awaiting_response = True
-
-
         # Vérifier les objectifs de quête
         try:
             if hasattr(game, 'quest_manager'):
@@ -586,16 +664,19 @@ class Actions:
         
         Paramètres:
             game (Game): L'instance du jeu
-            list_of_words (list): ["give", nom_item]
+            list_of_words (list): ["give", nom_item] ou ["give", nom_item, quantité]
             number_of_parameters (int): 1
         """
         # Validation du nombre de paramètres
         if len(list_of_words) < 2:
             print("\n❌ Erreur: Donner quoi ?")
-            print("   Utilisation: give <nom_item>\n")
+            print("   Utilisation: give <nom_item> [quantité]\n")
             return False
 
         item_name = list_of_words[1].strip().lower()
+        count = _parse_quantity(list_of_words, "give <nom_item> [quantité]")
+        if count is None:
+            return False
 
         # Vérifier si l'item existe dans l'inventaire
         found_item = None
@@ -605,7 +686,13 @@ class Actions:
                 break
 
         if not found_item:
-            print(f"\n❌ Vous n'avez pas de '{item_name}' dans votre inventaire.\n")
+            print(f"\n❌ Vous n'avez pas de '{item_name}' dans votre inventaire.")
+            _print_suggestion(game, "inventory", item_name)
+            print()
+            return False
+        available = game.player.inventory.quantity(found_item)
+        if count > available:
+            print(f"\n❌ Vous n'avez que {available} '{found_item}'.\n")
             return False
 
         # Vérifier s'il y a un personnage dans la pièce
@@ -618,15 +705,15 @@ class Actions:
         target_char = list(room.characters.values())[0]
 
         # Retirer l'item de l'inventaire
-        game.player.inventory.pop(found_item)
+        undo.remove_items(game.player.inventory, found_item, count)
+        events.emit(events.ItemGiven, game.player.name, target_char.name, found_item, count)
 
-        print(f"\n✅ Vous donnez '{found_item}' à {target_char.name}.\n")
+        print(f"\n✅ Vous donnez {_quantity_label(found_item, count)} à {target_char.name}.\n")
 
         # Interaction spécifique : Bananes -> Singes
         if found_item == "bananes" and target_char.name == "Singes":
             print(f"{target_char.name} disent : "
                   "'Merci, tu peux désormais continuer ton aventure.'\n")
-            target_char.msgs = ["Merci, tu peux désormais continuer ton aventure."]
 
         # Vérifier les objectifs de quête
         try:
@@ -647,42 +734,17 @@ class Actions:
             print(MSG0.format(command_word=command_word))
             return False
 
-        # Toggle global DEBUG in the game module
-        try:
-            # game module stores DEBUG at top-level
-            current = getattr(game, 'DEBUG', None)
-            # pylint: disable=import-outside-toplevel
-            import game as game_mod
-            if current is None:
-                current = getattr(game_mod, 'DEBUG', False)
-
-            new = not current
-            # Set both the instance attribute (if present) and module-level flag
-            try:
-                setattr(game, 'DEBUG', new)
-            except Exception: # pylint: disable=broad-exception-caught
-                pass
-            setattr(game_mod, 'DEBUG', new)
+        enabled = debuglog.toggle()
+        print(f"\nDEBUG : {'ON' if enabled else 'OFF'}\n")
 
-            print(f"\nDEBUG : {'ON' if new else 'OFF'}\n")
-
-            # If we just turned DEBUG ON, print the buffered messages
-            if new:
-                try:
-                    buf = getattr(game_mod, 'DEBUG_LOG', [])
-                    if buf:
-                        print("--- Messages DEBUG enregistrés ---")
-                        for m in buf:
-                            print(m)
-                        # Clear buffer after showing
-                        game_mod.DEBUG_LOG = []
-                except Exception: # pylint: disable=broad-exception-caught
-                    pass
-
-            return False
-        except Exception as e: # pylint: disable=broad-exception-caught
-            print(f"\nImpossible de basculer DEBUG : {e}\n")
-            return False
+        # Afficher les messages enregistrés pendant que le mode était désactivé
+        if enabled:
+            messages = debuglog.drain()
+            if messages:
+                print("--- Messages DEBUG enregistrés ---")
+                for message in messages:
+                    print(message)
+        return False
 
     @staticmethod
     def back(game, list_of_words, number_of_parameters):
@@ -713,21 +775,30 @@ class Actions:
             print(MSG0.format(command_word=command_word))
             return False
 
+        left_room = game.player.current_room
         success = game.player.back()
+        if success:
+            game.announce_move(left_room, "fait demi-tour")
         return success
 
     @staticmethod
     def show_quests(game, list_of_words, number_of_parameters):
-        """Afficher la liste des quêtes (commande `quests`)."""
+        """Afficher une page de la liste des quêtes (commande `quests [page]`)."""
         length = len(list_of_words)
-        if length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+        if length > number_of_parameters + 1:
+            print(f"\n❌ Utilisation: {list_of_words[0]} [page]\n")
             return False
 
+        page = 1
+        if length > 1:
+            if not list_of_words[1].isdigit():
+                print(f"\nNuméro de page invalide : '{list_of_words[1]}'.\n")
+                return False
+            page = int(list_of_words[1])
+
         try:
             if hasattr(game, 'quest_manager'):
-                game.quest_manager.show_quests()
+                game.quest_manager.show_quests(page)
             else:
                 print("\nAucun gestionnaire de quêtes disponible.\n")
             return False
@@ -777,6 +848,111 @@ class Actions:
             print(f"\nErreur lors de l'affichage des récompenses: {e}\n")
             return False
 
+    @staticmethod
+    def save(game, list_of_words, _number_of_parameters):
+        """
+        Sauvegarder la partie (commande `save [nom]`).
+
+        Paramètres:
+            game (Game): L'instance du jeu
+            list_of_words (list): ["save"] ou ["save", nom]
+            number_of_parameters (int): 1 (optionnel)
+
+        Exemples:
+            >>> save(game, ["save", "partie1"], 1)  # Écrit saves/partie1.sav
+        """
+        if len(list_of_words) > 2:
+            print("\n❌ Erreur: Utilisation: save [nom]\n")
+            return False
+
+        name = list_of_words[1].strip() if len(list_of_words) == 2 else game.player.name
+        try:
+            # Sauvegarder la session journalisée la vide aussi de son journal
+            if game.journal and name == game.journal.session:
+                journal.checkpoint(game)
+                path = savegame.save_path(name)
+            else:
+                path = savegame.save_game(game, name)
+        except (OSError, savegame.SaveError) as e:
+            print(f"\n❌ Impossible de sauvegarder la partie : {e}\n")
+            return False
+
+        print(f"\n💾 Partie sauvegardée dans '{path.name}'.\n")
+        return False
+
+    @staticmethod
+    def load(game, list_of_words, _number_of_parameters):
+        """
+        Charger une partie sauvegardée (commande `load [nom]`).
+
+        Paramètres:
+            game (Game): L'instance du jeu
+            list_of_words (list): ["load"] ou ["load", nom]
+            number_of_parameters (int): 1 (optionnel)
+
+        Exemples:
+            >>> load(game, ["load", "partie1"], 1)  # Relit saves/partie1.sav
+        """
+        if len(list_of_words) > 2:
+            print("\n❌ Erreur: Utilisation: load [nom]\n")
+            return False
+
+        name = list_of_words[1].strip() if len(list_of_words) == 2 else game.player.name
+        try:
+            savegame.load_game(game, name)
+        except FileNotFoundError:
+            print(f"\n❌ Aucune sauvegarde nommée '{name}'.\n")
+            return False
+        except (OSError, savegame.SaveError) as e:
+            print(f"\n❌ Impossible de charger la partie : {e}\n")
+            return False
+
+        # La session journalisée repart de la partie chargée
+        if game.journal:
+            journal.checkpoint(game)
+        game.mark_dirty()
+
+        print(f"\n📂 Partie '{name}' chargée.\n")
+        game.player.print_state()
+        return False
+
+    @staticmethod
+    def undo(game, list_of_words, _number_of_parameters):
+        """
+        Annuler les derniers tours (commande `undo [nombre]`).
+
+        Les tours sans effet (look, help...) ne comptent pas. L'annulation
+        ne remonte pas avant le dernier chargement ou la dernière sauvegarde
+        de la session, et n'est possible que seul dans le monde.
+
+        Paramètres:
+            game (Game): L'instance du jeu
+            list_of_words (list): ["undo"] ou ["undo", nombre]
+            number_of_parameters (int): 1 (optionnel)
+
+        Exemples:
+            >>> undo(game, ["undo", "3"], 1)  # Annule les 3 derniers tours
+        """
+        if len(list_of_words) > 2 or (len(list_of_words) == 2
+                                      and not list_of_words[1].isdigit()):
+            print("\n❌ Erreur: Utilisation: undo [nombre de tours]\n")
+            return False
+
+        if len(game.players) > 1:
+            print("\n❌ Impossible d'annuler quand plusieurs joueurs partagent le monde.\n")
+            return False
+
+        count = int(list_of_words[1]) if len(list_of_words) == 2 else 1
+        undone = game.undo_log.undo(count)
+        if not undone:
+            print("\n❌ Il n'y a rien à annuler.\n")
+            return False
+
+        game.mark_dirty()
+        print(f"\n↩️  {undone} tour(s) annulé(s).\n")
+        game.player.print_state()
+        return False
+
     @staticmethod
     def yes(game, _list_of_words, _number_of_parameters):
         """Répondre 'oui' à une question."""
@@ -787,8 +963,11 @@ class Actions:
                 and player.current_room.name == "Beach"):
             print("\nJacob hoche la tête. Vous levez l'ancre et naviguez "
                   "vers de nouvelles aventures !")
+            undo.record_attribute(game, "victory")
+            undo.record_attribute(game, "finished")
             game.victory = True
             game.finished = True
+            events.emit(events.GameEnded, player.name, True)
             return True
         print("\nIl n'y a rien à confirmer ici.\n")
         return False
@@ -803,6 +982,7 @@ class Actions:
                 and player.current_room.name == "Beach"):
             print("\nJacob dit : 'Très bien, vous n'avez qu'à revenir me voir "
                   "quand vous voudrez partir.'\n")
+            undo.record_attribute(player, "endgame_awaiting_response")
             player.endgame_awaiting_response = False
             return True
         print("\nIl n'y a rien à refuser ici.\n")
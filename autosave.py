@@ -0,0 +1,124 @@
+"""
+Module Autosave - Sauvegarde automatique en arrière-plan.
+
+Chaque tour qui modifie la partie la marque comme modifiée (Game.mark_dirty).
+Un thread d'arrière-plan écrit alors, au plus une fois par intervalle, une
+sauvegarde dans l'emplacement `<joueur>-auto` (rechargeable avec `load`) :
+
+    - l'instantané est pris entre deux tours, toutes les salles verrouillées
+      (Game.lock_world) ; seul le delta est encodé, l'attente est brève ;
+    - l'écriture sur le disque (fichier temporaire, fsync, renommage atomique)
+      se fait hors de ce verrou : ni la boucle de saisie ni celle de Tk
+      n'attendent le disque ;
+    - une partie inactive ne coûte rien : le thread dort jusqu'à la prochaine
+      modification.
+
+Exemples:
+
+>>> import contextlib, io
+>>> from game import Game
+>>> game = Game("Anne", seed=0)
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     game.setup()
+>>> saver = Autosaver(game)
+>>> saver.save_now()
+False
+>>> game.mark_dirty()
+>>> saver.dirty
+True
+"""
+
+import threading
+
+import savegame
+
+# Délai minimal (secondes) entre deux sauvegardes automatiques
+AUTOSAVE_INTERVAL = 30.0
+# Suffixe du nom de l'emplacement de sauvegarde automatique
+AUTOSAVE_SUFFIX = "-auto"
+
+
+class Autosaver:
+    """
+    Thread de sauvegarde automatique d'une partie.
+
+    Attributs:
+        game (Game): La partie sauvegardée
+        name (str): Emplacement de sauvegarde (défaut: `<joueur>-auto`)
+        interval (float): Délai minimal en secondes entre deux sauvegardes
+        saves (int): Nombre de sauvegardes écrites
+        last_error (Exception): Dernière erreur de sauvegarde (OSError, ou SaveError :
+                                nom invalide, partie à plusieurs ; None si aucune)
+    """
+
+    def __init__(self, game, name=None, interval=AUTOSAVE_INTERVAL):
+        self.game = game
+        self.name = name
+        self.interval = interval
+        self.saves = 0
+        self.last_error = None
+        self._saved_changes = game.changes
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def dirty(self):
+        """bool: True si la partie a changé depuis la dernière sauvegarde."""
+        return self.game.changes != self._saved_changes
+
+    def start(self):
+        """Démarrer le thread et le brancher sur la partie."""
+        self.game.autosaver = self
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Signaler une modification (appelé par Game.mark_dirty)."""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Regrouper les modifications d'un intervalle en une seule écriture
+            if self._stopping.wait(self.interval):
+                return
+            self._wake.clear()
+            self.save_now()
+
+    def save_now(self):
+        """
+        Sauvegarder la partie si elle a changé.
+
+        Returns:
+            bool: True si une sauvegarde a été écrite
+        """
+        game = self.game
+        with game.lock_world():
+            changes = game.changes
+            if changes == self._saved_changes or game.player is None:
+                return False
+            try:
+                data = savegame.snapshot(game)
+            except savegame.SaveError as e:  # Partie à plusieurs
+                self.last_error = e
+                return False
+            name = self.name or f"{game.player.name}{AUTOSAVE_SUFFIX}"
+        try:
+            savegame.write_save(name, data)
+        except (OSError, savegame.SaveError) as e:
+            self.last_error = e
+            return False
+        self._saved_changes = changes
+        self.saves += 1
+        return True
+
+    def stop(self):
+        """Arrêter le thread puis écrire les dernières modifications."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.game.autosaver is self:
+            self.game.autosaver = None
+        self.save_now()
@@ -0,0 +1,99 @@
+"""
+Module Beamer - Téléportation : beamer à emplacements et déclencheurs d'arrivée.
+
+Un beamer garde plusieurs destinations nommées (emplacements) : `charge [nom]`
+enregistre la salle actuelle dans un emplacement, `fire [nom]` y téléporte le
+joueur. Les destinations sont des références directes aux salles : se
+téléporter ne parcourt jamais le monde, quelle que soit sa taille. Un
+emplacement verrouillé (le beamer de la récompense, programmé pour le point
+de départ) ne peut pas être rechargé.
+
+Ce qui se passe à l'arrivée est déclaré par le monde (Game.arrival_triggers,
+nom de salle -> ArrivalTrigger) et résolu par l'index des personnages
+(Game.characters) : faire venir un PNJ ne demande pas de le chercher salle par
+salle.
+
+Exemples:
+
+>>> from room import Room
+>>> beach, cave = Room("Beach", "une plage."), Room("Cave", "une grotte.")
+>>> beamer = Beamer({DEFAULT_SLOT: beach}, locked=(DEFAULT_SLOT,))
+>>> beamer.charge(DEFAULT_SLOT, cave), beamer.charge("grotte", cave)
+(False, True)
+>>> beamer.target().name, beamer.target("grotte").name, beamer.target("lune")
+('Beach', 'Cave', None)
+"""
+
+import undo
+from item import Item
+
+# Emplacement utilisé par `charge` et `fire` sans paramètre
+DEFAULT_SLOT = "base"
+
+
+class Beamer(Item):
+    """
+    Appareil de téléportation à plusieurs emplacements nommés.
+
+    Attributs:
+        slots (dict): nom de l'emplacement -> Room
+        locked (set): Emplacements programmés, qui ne peuvent pas être rechargés
+    """
+
+    def __init__(self, slots=None, locked=()):
+        super().__init__("beamer", "un appareil de téléportation mystérieux.", 0)
+        self.is_beamer = True
+        self.slots = dict(slots or {})
+        self.locked = set(locked)
+
+    def charge(self, slot, room):
+        """
+        Enregistrer `room` dans l'emplacement `slot`.
+
+        Returns:
+            bool: False si l'emplacement est verrouillé
+        """
+        if slot in self.locked:
+            return False
+        undo.set_entry(self.slots, slot, room)
+        return True
+
+    def target(self, slot=DEFAULT_SLOT):
+        """Salle enregistrée dans l'emplacement `slot` (None s'il est vide)."""
+        return self.slots.get(slot)
+
+
+class ArrivalTrigger:
+    """
+    Effet déclaratif de l'arrivée par téléportation dans une salle.
+
+    Attributs:
+        message (str): Texte affiché à l'arrivée
+        summon (str): Nom du PNJ qui rejoint le joueur (None si aucun)
+        player_flags (dict): Attributs du joueur modifiés si le PNJ est trouvé
+                             (son dialogue peut en dépendre, voir dialogue)
+    """
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, message, summon=None, player_flags=None):
+        self.message = message
+        self.summon = summon
+        self.player_flags = dict(player_flags or {})
+
+    def apply(self, game, room):
+        """
+        Appliquer l'effet pour le joueur courant, qui vient d'arriver dans `room`.
+
+        Args:
+            game (Game): Le jeu (son index des personnages)
+            room (Room): La salle d'arrivée
+        """
+        print(self.message)
+        character = game.characters.get(self.summon) if self.summon else None
+        if character is None:
+            return
+        character.relocate(room)
+        player = game.player
+        for name, value in self.player_flags.items():
+            undo.record_attribute(player, name)
+            setattr(player, name, value)
@@ -0,0 +1,112 @@
+"""
+Module Bench - Mesures de performance du moteur sur des mondes générés.
+
+Pour chaque taille de monde (voir worldgen.WorldGenerator), mesure :
+    - la génération et la configuration du jeu (setup)
+    - `fire` (téléportation par le beamer)
+    - le déplacement des PNJ après une commande (_move_characters)
+    - la distribution des événements aux quêtes (toutes les quêtes actives)
+    - le rendu de la description d'un lieu, avec et sans cache
+
+Utilisation:
+    python bench.py [taille ...]      (défaut: 1000 10000 100000)
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+from actions import Actions
+from beamer import DEFAULT_SLOT, Beamer
+from game import Game
+from worldgen import WorldGenerator
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def measure(func, min_time=0.2):
+    """
+    Mesurer la durée moyenne d'un appel à `func`.
+
+    L'appel est répété jusqu'à durer au moins `min_time` secondes.
+
+    Args:
+        func (callable): La fonction à mesurer (sans argument)
+        min_time (float): Durée minimale de la mesure en secondes
+
+    Returns:
+        float: Durée moyenne d'un appel en microsecondes
+    """
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / calls * 1e6
+
+
+def bench_world(n_rooms, seed=0):
+    """
+    Mesurer les opérations du moteur sur un monde généré de `n_rooms` salles.
+
+    Args:
+        n_rooms (int): Nombre de salles du monde
+        seed (int): Graine du monde et du jeu
+
+    Returns:
+        dict: nom de la mesure -> durée en microsecondes
+    """
+    results = {}
+    start = time.perf_counter()
+    game = Game("Bench", seed=seed, world_builder=WorldGenerator(n_rooms, seed))
+    game.setup()
+    results["setup"] = (time.perf_counter() - start) * 1e6
+
+    player = game.player
+    player.inventory["beamer"] = Beamer({DEFAULT_SLOT: game.rooms[-1]})
+    results["fire"] = measure(lambda: Actions.fire(game, ["fire"], 0))
+
+    results["move_characters"] = measure(game._move_characters)  # pylint: disable=protected-access
+
+    manager = game.quest_manager
+    for quest in manager.quests:
+        if not quest.is_active:
+            quest.activate()
+            manager.active_quests.append(quest)
+    room_name = game.rooms[-1].name
+
+    def dispatch():
+        manager.check_action_objectives("prendre", "rien")
+        manager.check_room_objectives(room_name)
+    results["quest_dispatch"] = measure(dispatch)
+
+    room = game.rooms[0]
+    results["render_cached"] = measure(room.get_long_description)
+
+    def render_cold():
+        room.characters.changed()
+        room.get_long_description()
+    results["render_cold"] = measure(render_cold)
+    return results
+
+
+def main():
+    """Point d'entrée : mesurer chaque taille de monde et afficher un tableau."""
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    rows = []
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for size in sizes:
+            rows.append((size, bench_world(size)))
+
+    names = list(rows[0][1])
+    print(f"{'salles':>10} " + " ".join(f"{name:>16}" for name in names))
+    for size, results in rows:
+        print(f"{size:>10} " + " ".join(f"{results[name]:>14.1f}µs" for name in names))
+
+
+if __name__ == "__main__":
+    main()
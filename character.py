@@ -4,6 +4,16 @@ Module Character - Gère les personnages non-joueurs (PNJ).
 
 import random
 
+import debuglog
+import events
+import undo
+
+from dialogue import Dialogue, from_lines
+from texts import shared
+
+# Nombre maximal de tours rejoués par un rattrapage (voir Character.sample_position)
+CATCH_UP_ROUNDS = 256
+
 class Character:
     """
     Représente un personnage non-joueur (PNJ) dans le jeu.
@@ -18,14 +28,22 @@ class Character:
             name (str): Le nom du personnage
             description (str): La description du personnage
             current_room (Room): La pièce où se trouve le personnage
-            msgs (list): Liste des messages que le personnage peut dire
+            msgs (list | dict | Dialogue): Répliques que le personnage dit à tour de
+                                           rôle (liste, ou dict nom de salle -> liste),
+                                           ou son dialogue compilé (voir dialogue)
             can_move (bool): Si le personnage peut se déplacer (défaut: True)
         """
         self.name = name
-        self.description = description
+        self.description = shared(description)
         self.current_room = current_room
-        self.msgs = msgs if msgs is not None else []
+        self.dialogue = msgs if isinstance(msgs, Dialogue) else from_lines(msgs or ())
+        # État du dialogue : nœud courant et position de la prochaine réplique
+        self.node = 0
+        self.cursor = 0
         self.can_move = can_move
+        # Dernier tour de déplacement des PNJ (Game.npc_rounds) où il a été simulé
+        # (None : pas encore simulé, rien à rattraper ; voir worldstore)
+        self.last_round = 0
 
     def __str__(self):
         """
@@ -41,34 +59,162 @@ class Character:
 
         return f"{self.name} : {description}"
 
-    def get_msg(self):
+    def get_msg(self, player=None):
         """
         Retourne le message du personnage.
-        Affiche cycliquement les messages.
+        Suit son dialogue (voir dialogue.Dialogue) : les répliques d'un nœud
+        sont dites à tour de rôle.
+
+        Args:
+            player (Player): Le joueur qui lui parle (conditions du dialogue)
         
         Returns:
             str: Le message du personnage
-        """
-        msgs_list = self.msgs
 
-        # Si msgs est un dictionnaire, récupérer la liste pour la salle actuelle
-        if isinstance(msgs_list, dict):
-            msgs_list = msgs_list.get(self.current_room.name, [])
+        Exemples:
+            >>> jacob = Character("Jacob", "un perroquet", None, ["Coco !", "Arrr !"])
+            >>> jacob.get_msg(), jacob.get_msg(), jacob.get_msg()
+            ("Jacob dit : 'Coco !'", "Jacob dit : 'Arrr !'", "Jacob dit : 'Coco !'")
+        """
+        node, cursor, msg = self.dialogue.say(self.node, self.cursor, player, self.current_room)
+        if node != self.node:
+            undo.record_attribute(self, "node")
+            self.node = node
+        if cursor != self.cursor:
+            undo.record_attribute(self, "cursor")
+            self.cursor = cursor
 
         # Si plus de messages, le personnage n'a rien à dire
-        if not msgs_list:
+        if msg is None:
             return f"{self.name} n'a rien d'autre à dire."
-
-        # Retirer le premier message et le remettre à la fin (rotation)
-        msg = msgs_list.pop(0)
-        msgs_list.append(msg)
         return f"{self.name} dit : '{msg}'"
 
-    def move(self, player=None):
+    def dialogue_state(self):
+        """Tuple (nœud, position de la prochaine réplique) : l'état du dialogue."""
+        return self.node, self.cursor
+
+    def catch_up(self, rounds, rng=None, limit=None):
+        """
+        Rattraper en une fois `rounds` tours passés endormi, loin du joueur.
+
+        La position est tirée selon la loi de la marche aléatoire de move()
+        après `rounds` tours (voir sample_position).
+
+        Args:
+            rounds (int): Nombre de tours manqués
+            rng (random.Random): Générateur aléatoire du jeu (défaut: module random)
+            limit (int): Temps de mélange de la marche en tours (None : inconnu)
+
+        Returns:
+            bool: True si le personnage a changé de salle, False sinon
+
+        Exemples:
+            >>> from room import Room
+            >>> a, b = Room("A", "une salle"), Room("B", "une autre salle")
+            >>> a.exits, b.exits = {"E": b}, {"O": a}
+            >>> singe = Character("Singe", "un singe", a)
+            >>> a.characters["Singe"] = singe
+            >>> singe.catch_up(0)
+            False
+            >>> _ = singe.catch_up(1001, random.Random(1))
+            >>> ("Singe" in a.characters) != ("Singe" in b.characters)
+            True
+            >>> singe.current_room.characters["Singe"] is singe
+            True
+            >>> singe.sample_position(10**12, random.Random(1), limit=1000) in (a, b)
+            True
+
+            Un réveil ne rejoue jamais plus de CATCH_UP_ROUNDS tours :
+
+            >>> couloir = [Room(str(i), "un couloir") for i in range(1000)]
+            >>> for left, right in zip(couloir, couloir[1:]):
+            ...     left.exits["E"], right.exits["O"] = right, left
+            >>> lent = Character("Lent", "un paresseux", couloir[0])
+            >>> int(lent.sample_position(10**12, random.Random(2)).name) <= CATCH_UP_ROUNDS
+            True
+        """
+        return self.relocate(self.sample_position(rounds, rng, limit))
+
+    def sample_position(self, rounds, rng=None, limit=None):
+        """
+        Tirer la salle où serait le personnage après `rounds` tours (voir catch_up).
+
+        Les tours où le personnage reste sur place ne sont pas rejoués : le
+        nombre de déplacements suit une loi binomiale B(rounds, 1/2), tirée
+        d'un coup, puis le personnage emprunte une sortie au hasard par
+        déplacement. Le coût est donc proportionnel au nombre de déplacements
+        (rounds / 2 en moyenne), pas au nombre de tours. Un tirage unique
+        demanderait les puissances de la matrice de transition du monde, hors
+        de portée à des millions de salles.
+
+        Les tours manqués sont ramenés au temps de mélange de la marche
+        (`limit`, déclaré par le monde : au-delà, la position ne dépend plus du
+        point de départ) et dans tous les cas à CATCH_UP_ROUNDS. Un réveil coûte
+        ainsi au plus CATCH_UP_ROUNDS / 2 déplacements en moyenne, quelle que
+        soit la taille du monde ; sur un grand monde, un PNJ endormi longtemps
+        reste en contrepartie plus près de son point de départ que ne le
+        voudrait la marche exacte. La borne porte sur les tours et non sur les
+        déplacements, pour garder la parité aléatoire (une grille est bipartite).
+
+        Le personnage n'est pas déplacé : l'appelant peut d'abord verrouiller
+        la salle tirée (voir Game._move_characters), puis appeler relocate().
+
+        Args:
+            rounds (int): Nombre de tours manqués
+            rng (random.Random): Générateur aléatoire du jeu (défaut: module random)
+            limit (int): Temps de mélange de la marche en tours (None : inconnu)
+
+        Returns:
+            Room: La salle tirée (la salle actuelle si le personnage ne bouge pas)
+        """
+        room = self.current_room
+        if not self.can_move or rounds <= 0:
+            return room
+        rng = rng or random
+        rounds = min(rounds, CATCH_UP_ROUNDS, limit or CATCH_UP_ROUNDS)
+        moves = bin(rng.getrandbits(rounds)).count("1")
+        walk = getattr(room.exits, "walk", None)
+        if walk is not None:
+            # Monde chargé à la demande : les salles traversées ne sont pas chargées
+            return walk(moves, rng) or room
+        for _ in range(moves):
+            exits = [r for r in room.exits.values() if r is not None]
+            if not exits:
+                break
+            room = rng.choice(exits)
+        return room
+
+    def relocate(self, room):
+        """
+        Placer le personnage dans `room`, en le retirant de sa salle actuelle.
+
+        Args:
+            room (Room): La nouvelle salle
+
+        Returns:
+            bool: True si le personnage a changé de salle, False sinon
+        """
+        old_room = self.current_room
+        if room is old_room:
+            return False
+        if old_room is not None and self.name in old_room.characters:
+            undo.pop_entry(old_room.characters, self.name)
+        undo.record_attribute(self, "current_room")
+        self.current_room = room
+        undo.set_entry(room.characters, self.name, self)
+        events.emit(events.NpcMoved, self.name, getattr(old_room, "name", None), room.name)
+        return True
+
+    def move(self, player=None, rng=None):
         """
         Déplace le personnage de manière aléatoire.
         Le personnage a une chance sur deux de se déplacer.
         S'il se déplace, il va dans une pièce adjacente au hasard.
+
+        Args:
+            player (Player): Le joueur (le personnage ne bouge pas s'il est avec lui,
+                             ni avec aucun autre joueur présent dans la salle)
+            rng (random.Random): Générateur aléatoire du jeu (défaut: module random)
         
         Returns:
             bool: True si le personnage s'est déplacé, False sinon
@@ -77,23 +223,17 @@ class Character:
         if not self.can_move:
             return False
 
-        # Si le joueur est dans la même pièce, le personnage ne bouge pas
+        # Si un joueur est dans la même pièce, le personnage ne bouge pas
         # (pour permettre l'interaction)
-        if player and player.current_room == self.current_room:
+        if self.current_room.players or (player and player.current_room == self.current_room):
             return False
 
-        import game # pylint: disable=import-outside-toplevel
+        rng = rng or random
         # Une chance sur deux de se déplacer
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Construire le message DEBUG et le stocker
             msg = f"DEBUG: {self.name} décide de rester sur place."
-            try:
-                game.DEBUG_LOG.append(msg)
-            except Exception: # pylint: disable=broad-exception-caught
-                pass
-            # Afficher immédiatement si le mode DEBUG est activé
-            if getattr(game, "DEBUG", False):
-                print(msg)
+            debuglog.log(msg)
             return False
 
         # Récupérer les sorties disponibles (non-None)
@@ -102,32 +242,17 @@ class Character:
         # Si aucune sortie disponible, rester sur place
         if not available_exits:
             msg = f"DEBUG: {self.name} ne peut pas bouger (aucune sortie)."
-            try:
-                game.DEBUG_LOG.append(msg)
-            except Exception: # pylint: disable=broad-exception-caught
-                pass
-            if getattr(game, "DEBUG", False):
-                print(msg)
+            debuglog.log(msg)
             return False
 
         # Choisir une pièce au hasard
         old_room = self.current_room
-        new_room = random.choice(available_exits)
-
-        # Retirer le personnage de l'ancienne pièce
-        if self.name in old_room.characters:
-            del old_room.characters[self.name]
+        new_room = rng.choice(available_exits)
 
-        # Déplacer le personnage
-        self.current_room = new_room
-        new_room.characters[self.name] = self
+        # Déplacer le personnage de l'ancienne pièce vers la nouvelle
+        self.relocate(new_room)
 
         msg = f"DEBUG: {self.name} se déplace de '{old_room.name}' vers '{new_room.name}'."
-        try:
-            game.DEBUG_LOG.append(msg)
-        except Exception: # pylint: disable=broad-exception-caught
-            pass
-        if getattr(game, "DEBUG", False):
-            print(msg)
+        debuglog.log(msg)
 
         return True
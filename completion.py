@@ -0,0 +1,394 @@
+"""
+Module Completion - Complétion (touche Tab) et correction des commandes mal tapées.
+
+La complétion dépend du contexte : le premier mot se complète parmi les
+commandes du jeu, le second selon la commande (directions ouvertes pour `go`,
+objets de la salle pour `take`, de l'inventaire pour `drop` et `give`,
+personnages pour `talk`, emplacements du beamer pour `charge` et `fire`).
+
+Les mêmes sources servent à corriger une saisie mal orthographiée
+(`tkae bannes` -> "Vouliez-vous dire 'take bananes' ?") : chaque source est
+aussi un BKTree, interrogé à distance d'édition bornée (MAX_DISTANCE).
+
+Chaque source de noms est un Trie et un BKTree tenus à jour incrémentalement :
+quand la partie change (Game.changes) ou que le joueur change de salle, seuls
+les noms apparus ou disparus sont ajoutés ou retirés. Les noms proposés sont
+ceux sur lesquels la commande peut agir (salle actuelle, inventaire) : le coût
+d'une complétion ou d'une correction ne dépend pas de la taille du monde.
+
+Exemples:
+
+>>> trie = Trie()
+>>> for word in ("take", "talk", "trésor", "Jacob"):
+...     trie.add(word)
+>>> trie.complete("ta")
+['take', 'talk']
+>>> trie.complete("j")
+['Jacob']
+>>> trie.discard("take")
+>>> trie.complete("t")
+['talk', 'trésor']
+
+>>> edit_distance("tkae", "take"), edit_distance("bannes", "bananes")
+(1, 1)
+>>> tree = BKTree()
+>>> for word in ("take", "talk", "back", "bananes", "barils"):
+...     tree.add(word)
+>>> tree.search("tkae", 1), tree.search("bannes", 2)
+([(1, 'take')], [(1, 'bananes')])
+
+>>> from game import DIRECTION_ALIASES, Game
+>>> game = Game("Anne", seed=0)
+>>> game.setup()
+>>> completer = Completer(game, DIRECTION_ALIASES)
+>>> completer.complete("ta")
+['take', 'talk']
+>>> completer.complete("take p"), completer.complete("talk j"), completer.complete("go o")
+(['take parchemin'], ['talk Jacob'], ['go O', 'go ouest'])
+>>> completer.suggest_command(["tkae", "parchmin"])
+'take parchemin'
+"""
+
+# Distance d'édition maximale d'une correction (1 pour les mots courts)
+MAX_DISTANCE = 2
+
+# Source des noms proposés pour le second mot de chaque commande
+COMMAND_SOURCES = {
+    "go": "directions",
+    "take": "room_items",
+    "drop": "inventory",
+    "give": "inventory",
+    "talk": "characters",
+    "charge": "slots",
+    "fire": "slots",
+}
+
+
+class Trie:
+    """
+    Arbre préfixe de mots, insensible à la casse.
+
+    Chaque nœud est une liste [enfants (lettre -> nœud), mot terminé ici ou None].
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self):
+        self._root = [{}, None]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, word):
+        """Ajouter un mot (sans effet s'il est déjà présent)."""
+        node = self._root
+        for letter in word.lower():
+            node = node[0].setdefault(letter, [{}, None])
+        if node[1] is None:
+            self._size += 1
+        node[1] = word
+
+    def discard(self, word):
+        """Retirer un mot et élaguer les nœuds devenus vides."""
+        path = [self._root]
+        key = word.lower()
+        for letter in key:
+            node = path[-1][0].get(letter)
+            if node is None:
+                return
+            path.append(node)
+        if path[-1][1] is None:
+            return
+        path[-1][1] = None
+        self._size -= 1
+        for depth in range(len(key), 0, -1):
+            if path[depth][0] or path[depth][1] is not None:
+                break
+            del path[depth - 1][0][key[depth - 1]]
+
+    def complete(self, prefix):
+        """
+        Lister les mots qui commencent par `prefix`.
+
+        Args:
+            prefix (str): Le début du mot (casse ignorée)
+
+        Returns:
+            list: Les mots, triés
+        """
+        node = self._root
+        for letter in prefix.lower():
+            node = node[0].get(letter)
+            if node is None:
+                return []
+        words = []
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if node[1] is not None:
+                words.append(node[1])
+            pending.extend(node[0].values())
+        return sorted(words)
+
+
+def edit_distance(first, second, limit=None):
+    """
+    Distance d'édition (insertions, suppressions, substitutions et inversions
+    de deux lettres voisines), casse ignorée.
+
+    Args:
+        first (str): Premier mot
+        second (str): Second mot
+        limit (int, optional): Au-delà de cette distance, le calcul s'arrête
+                               et retourne limit + 1
+
+    Returns:
+        int: La distance
+    """
+    first, second = first.lower(), second.lower()
+    if first == second:
+        return 0
+    if limit is not None and abs(len(first) - len(second)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(second) + 1))
+    for i, letter in enumerate(first, 1):
+        current = [i]
+        for j, other in enumerate(second, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (letter != other))
+            if i > 1 and j > 1 and letter == second[j - 2] and first[i - 2] == other:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    Arbre BK (Burkhard-Keller) : recherche des mots proches d'un mot donné.
+
+    Chaque nœud est une liste [mot, présent, enfants (distance -> nœud)].
+    Un mot retiré reste dans l'arbre comme nœud absent ; l'arbre est
+    reconstruit quand les absents deviennent majoritaires. Avec les inversions
+    de lettres, la distance n'est pas tout à fait une métrique : un mot proche
+    peut, rarement, échapper à la recherche.
+    """
+
+    __slots__ = ("_root", "_nodes", "_removed")
+
+    def __init__(self):
+        self._root = None
+        self._nodes = {}    # mot -> nœud
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._nodes) - self._removed
+
+    def add(self, word):
+        """Ajouter un mot (ou le rendre de nouveau présent)."""
+        node = self._nodes.get(word)
+        if node is not None:
+            if not node[1]:
+                node[1] = True
+                self._removed -= 1
+            return
+        node = self._nodes[word] = [word, True, {}]
+        if self._root is None:
+            self._root = node
+            return
+        parent = self._root
+        while True:
+            distance = edit_distance(word, parent[0])
+            child = parent[2].get(distance)
+            if child is None:
+                parent[2][distance] = node
+                return
+            parent = child
+
+    def discard(self, word):
+        """Retirer un mot (sans effet s'il est absent)."""
+        node = self._nodes.get(word)
+        if node is None or not node[1]:
+            return
+        node[1] = False
+        self._removed += 1
+        if self._removed * 2 > len(self._nodes):
+            words = [word for word, node in self._nodes.items() if node[1]]
+            self._root = None
+            self._nodes = {}
+            self._removed = 0
+            for word in words:
+                self.add(word)
+
+    def search(self, word, max_distance):
+        """
+        Lister les mots à au plus `max_distance` de `word`.
+
+        Returns:
+            list: Paires (distance, mot), des plus proches aux plus lointaines
+        """
+        found = []
+        pending = [self._root] if self._root is not None else []
+        while pending:
+            node = pending.pop()
+            distance = edit_distance(word, node[0])
+            if distance <= max_distance and node[1]:
+                found.append((distance, node[0]))
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    pending.append(child)
+        return sorted(found)
+
+
+def _max_distance(word):
+    """Distance tolérée pour un mot : une seule faute dans un mot court."""
+    return 1 if len(word) <= 3 else MAX_DISTANCE
+
+
+class Completer:
+    """
+    Complétion et correction contextuelles des commandes du joueur courant.
+
+    Attributs:
+        game (Game): Le jeu
+        direction_aliases (dict): Noms acceptés pour chaque direction (ex: "nord" -> "N")
+    """
+
+    def __init__(self, game, direction_aliases=None):
+        self.game = game
+        self.direction_aliases = direction_aliases or {}
+        self._tries = {}    # source -> Trie
+        self._trees = {}    # source -> BKTree
+        self._words = {}    # source -> mots présents dans le Trie
+        self._state = None  # (joueur, salle, changements) au dernier alignement
+        self._matches = []
+
+    def _sources(self):
+        """Noms actuellement proposés, par source."""
+        game = self.game
+        player = game.player
+        room = player.current_room
+        exits = {direction for direction, target in room.exits.items() if target is not None}
+        beamer = player.inventory.get("beamer")
+        return {
+            "commands": game.commands,
+            # Lettres des sorties ouvertes et leurs noms en toutes lettres (nord, sud...)
+            "directions": [alias for alias, direction in self.direction_aliases.items()
+                           if direction in exits and (alias == direction or
+                                                      len(alias) > 1 and alias.islower())],
+            "room_items": room.inventory,
+            "inventory": player.inventory,
+            "characters": room.characters,
+            "slots": getattr(beamer, "slots", ()),
+        }
+
+    def _sync(self):
+        """Aligner les Tries sur la partie, seulement si elle a changé depuis la dernière fois."""
+        game = self.game
+        player = game.player
+        state = (id(player), id(player.current_room), game.changes, len(game.commands))
+        if state == self._state:
+            return
+        for source, names in self._sources().items():
+            names = set(names)
+            trie = self._tries.setdefault(source, Trie())
+            tree = self._trees.setdefault(source, BKTree())
+            old = self._words.get(source, set())
+            for name in old - names:
+                trie.discard(name)
+                tree.discard(name)
+            for name in names - old:
+                trie.add(name)
+                tree.add(name)
+            self._words[source] = names
+        self._state = state
+
+    def complete(self, line):
+        """
+        Compléter le dernier mot d'une ligne de commande.
+
+        Args:
+            line (str): La ligne saisie jusqu'au curseur
+
+        Returns:
+            list: Les lignes complétées possibles, triées
+        """
+        if self.game.player is None:
+            return []
+        self._sync()
+        words = line.lstrip().split(" ")
+        if len(words) == 1:
+            return self._tries["commands"].complete(words[0])
+        source = COMMAND_SOURCES.get(words[0].lower())
+        if source is None or len(words) > 2:
+            return []
+        return [f"{words[0]} {name}" for name in self._tries[source].complete(words[1])]
+
+    def suggest(self, source, word):
+        """
+        Trouver les noms d'une source les plus proches d'un mot mal tapé.
+
+        Args:
+            source (str): La source ("commands", "room_items", "inventory"...)
+            word (str): Le mot saisi
+
+        Returns:
+            list: Les noms à la plus petite distance trouvée (vide si aucun)
+        """
+        if self.game.player is None or not word:
+            return []
+        self._sync()
+        found = self._trees[source].search(word, _max_distance(word))
+        return [name for distance, name in found if distance == found[0][0]]
+
+    def suggest_command(self, words):
+        """
+        Corriger une commande non reconnue (verbe, puis nom selon le verbe).
+
+        Args:
+            words (list): Les mots saisis
+
+        Returns:
+            str: La commande corrigée la plus probable (None si aucune)
+        """
+        verbs = self.suggest("commands", words[0])
+        if not verbs:
+            return None
+        corrected = [verbs[0]]
+        source = COMMAND_SOURCES.get(verbs[0])
+        for word in words[1:2]:
+            names = self.suggest(source, word) if source else []
+            corrected.append(word if word in names or not names else names[0])
+        return " ".join(corrected + words[2:])
+
+    def readline_complete(self, text, state):
+        """Fonction de complétion pour readline (appelée avec state = 0, 1, 2...)."""
+        if state == 0:
+            import readline  # pylint: disable=import-outside-toplevel
+            line = readline.get_line_buffer()[:readline.get_endidx()]
+            self._matches = [match.rsplit(" ", 1)[-1] + " " for match in self.complete(line)]
+        return self._matches[state] if state < len(self._matches) else None
+
+
+def install_readline(completer):
+    """
+    Brancher `completer` sur la touche Tab de la console (module readline).
+
+    Returns:
+        bool: False si readline n'est pas disponible (ex: Windows)
+    """
+    try:
+        # Importé ici : readline charge la bibliothèque du terminal, inutile hors console
+        import readline  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return False
+    readline.set_completer(completer.readline_complete)
+    readline.set_completer_delims(" ")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    return True
@@ -0,0 +1,77 @@
+"""
+Module Debuglog - Messages de débogage (déplacements des PNJ...).
+
+Le mode DEBUG peut être activé de trois façons (ordre de priorité):
+    1) Flag en ligne de commande `--debug`
+    2) Variable d'environnement `GAME_DEBUG=1` ou `GAME_DEBUG=true`
+    3) Valeur par défaut False
+
+Les messages sont toujours gardés (les DEBUG_LOG_LIMIT derniers) et affichés
+immédiatement si le mode est actif ; la commande `debug` bascule le mode et
+affiche ceux enregistrés entre-temps. Ce module ne dépend d'aucun autre : les
+personnages y écrivent sans importer le moteur du jeu.
+
+Exemples:
+
+>>> log("DEBUG: Jacob décide de rester sur place.")
+>>> drain()
+['DEBUG: Jacob décide de rester sur place.']
+>>> drain()
+[]
+"""
+
+import os
+import sys
+from collections import deque
+
+# Nombre de messages gardés en attendant d'être affichés
+DEBUG_LOG_LIMIT = 1000
+
+
+def _detect():
+    """
+    Détecte si le mode DEBUG est activé.
+
+    Returns:
+        bool: True si le mode DEBUG est activé
+    """
+    if "--debug" in sys.argv[1:]:
+        return True
+    return os.getenv("GAME_DEBUG", "0").lower() in ("1", "true", "yes", "on")
+
+
+# True si les messages sont affichés dès qu'ils sont enregistrés
+enabled = _detect()
+# Messages DEBUG enregistrés, affichés à la prochaine activation
+messages = deque(maxlen=DEBUG_LOG_LIMIT)
+
+
+def log(message):
+    """Enregistrer un message DEBUG (et l'afficher si le mode est actif)."""
+    messages.append(message)
+    if enabled:
+        print(message)
+
+
+def toggle():
+    """
+    Basculer le mode DEBUG.
+
+    Returns:
+        bool: Le nouvel état
+    """
+    global enabled  # pylint: disable=global-statement
+    enabled = not enabled
+    return enabled
+
+
+def drain():
+    """
+    Retirer les messages enregistrés.
+
+    Returns:
+        list: Les messages, du plus ancien au plus récent
+    """
+    drained = list(messages)
+    messages.clear()
+    return drained
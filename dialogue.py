@@ -0,0 +1,244 @@
+"""
+Module Dialogue - Dialogues des PNJ écrits comme des graphes, compilés en automates.
+
+Un dialogue est un graphe de nœuds, déclaré par le monde :
+
+    {
+        "début": {
+            "lines": ["Des bananes ! Des Bananes !"],
+            "next": [({"objective": ("Marchander", "donner bananes")}, "nourris")],
+        },
+        "nourris": {"lines": ["Merci, tu peux désormais continuer ton aventure."]},
+    }
+
+    - "lines" : répliques dites à tour de rôle (ou dict nom de salle -> répliques)
+    - "next" : transitions (conditions, nœud suivant), essayées dans l'ordre
+      avant chaque réplique ; toutes les conditions doivent être vraies
+    - "set" : attributs du joueur modifiés quand le nœud parle
+
+Conditions (voir CONDITIONS) : "flag" (attribut vrai du joueur), "item"
+(objet dans son inventaire), "quest" (quête terminée), "objective" ((quête,
+objectif) accompli), "room" (salle du PNJ). Le premier nœud déclaré est le
+nœud de départ.
+
+La compilation (compile_dialogue) numérote les nœuds et remplace chaque nœud
+par des tuples : répliques, table de transitions (conditions résolues en
+fonctions, nœud cible en indice) et attributs à modifier. Un dialogue compilé
+est immuable et partagé : deux PNJ (ou deux parties du même processus) qui
+déclarent le même graphe reçoivent le même objet. Chaque PNJ ne garde que son
+état : le nœud courant et la position de sa prochaine réplique dans ce nœud ;
+choisir une réplique ne parcourt ni ne modifie aucune liste.
+
+Exemples:
+
+>>> from player import Player
+>>> graph = {"début": {"lines": ["Bonjour !", "Belle journée."],
+...                    "next": [({"flag": "endgame_ready"}, "fin")]},
+...          "fin": {"lines": ["On repart ?"], "set": {"endgame_awaiting_response": True}}}
+>>> dialogue = compile_dialogue(graph)
+>>> dialogue is compile_dialogue(graph), dialogue.names
+(True, ('début', 'fin'))
+>>> player = Player("Anne")
+>>> [dialogue.say(0, cursor, player, None) for cursor in range(2)]
+[(0, 1, 'Bonjour !'), (0, 0, 'Belle journée.')]
+>>> player.endgame_ready = True
+>>> dialogue.say(0, 1, player, None), player.endgame_awaiting_response
+((1, 0, 'On repart ?'), True)
+>>> compile_dialogue({"début": {"next": [({"humeur": "bonne"}, "début")]}})
+Traceback (most recent call last):
+    ...
+ValueError: Condition de dialogue inconnue : 'humeur'
+"""
+
+import undo
+from texts import shared
+
+# Sorte de condition -> fonction(paramètre, joueur, salle du PNJ) -> bool
+CONDITIONS = {}
+
+# Dialogues déjà compilés, partagés par tout le processus (clé canonique -> Dialogue)
+_compiled = {}
+
+
+def condition(kind):
+    """Enregistrer une fonction comme condition de la sorte `kind`."""
+    def register(check):
+        CONDITIONS[kind] = check
+        return check
+    return register
+
+
+def _quest(player, title):
+    manager = getattr(player, "quest_manager", None)
+    return None if manager is None else manager.get_quest_by_title(title)
+
+
+@condition("flag")
+def _flag(name, player, _room):
+    return bool(getattr(player, name, False))
+
+
+@condition("item")
+def _item(name, player, _room):
+    return player is not None and name in player.inventory
+
+
+@condition("quest")
+def _quest_completed(title, player, _room):
+    quest = _quest(player, title)
+    return quest is not None and quest.is_completed
+
+
+@condition("objective")
+def _objective_completed(arg, player, _room):
+    title, objective = arg
+    quest = _quest(player, title)
+    return quest is not None and objective in quest.completed_objectives
+
+
+@condition("room")
+def _in_room(name, _player, room):
+    return room is not None and room.name == name
+
+
+class Dialogue:
+    """
+    Dialogue compilé (immuable) : les nœuds sont des indices.
+
+    Attributs:
+        names (tuple): Nom de chaque nœud
+        lines (tuple): Répliques de chaque nœud (tuple, ou dict salle -> tuple)
+        transitions (tuple): Pour chaque nœud, paires (conditions, nœud cible) ;
+                             une condition est une paire (fonction, paramètre)
+        sets (tuple): Pour chaque nœud, paires (attribut du joueur, valeur)
+    """
+
+    __slots__ = ("names", "lines", "transitions", "sets")
+
+    def __init__(self, names, lines, transitions, sets):
+        self.names = names
+        self.lines = lines
+        self.transitions = transitions
+        self.sets = sets
+
+    def follow(self, node, player, room):
+        """
+        Suivre les transitions dont les conditions sont vraies.
+
+        Args:
+            node (int): Le nœud courant
+            player (Player): Le joueur qui parle au PNJ (None si aucun)
+            room (Room): La salle du PNJ
+
+        Returns:
+            int: Le nœud atteint (chaque nœud est visité au plus une fois)
+        """
+        visited = {node}
+        moved = True
+        while moved:
+            moved = False
+            for conditions, target in self.transitions[node]:
+                if target not in visited and all(check(arg, player, room)
+                                                 for check, arg in conditions):
+                    node = target
+                    visited.add(node)
+                    moved = True
+                    break
+        return node
+
+    def say(self, node, cursor, player, room):
+        """
+        Choisir la prochaine réplique.
+
+        Args:
+            node (int): Le nœud courant
+            cursor (int): Position de la prochaine réplique dans ce nœud
+            player (Player): Le joueur qui parle au PNJ (None si aucun)
+            room (Room): La salle du PNJ
+
+        Returns:
+            tuple: (nœud, position suivante, réplique ou None si rien à dire)
+        """
+        target = self.follow(node, player, room)
+        if target != node:
+            node, cursor = target, 0
+        lines = self.lines[node]
+        if isinstance(lines, dict):
+            lines = lines.get(room.name, ()) if room is not None else ()
+        if not lines:
+            return node, cursor, None
+        for name, value in self.sets[node]:
+            if player is not None:
+                undo.record_attribute(player, name)
+                setattr(player, name, value)
+        cursor %= len(lines)
+        return node, (cursor + 1) % len(lines), lines[cursor]
+
+
+def _freeze(value):
+    """Clé canonique (hashable) d'un graphe déclaré."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _lines(lines):
+    if isinstance(lines, dict):
+        return {room: tuple(shared(line) for line in room_lines)
+                for room, room_lines in lines.items()}
+    return tuple(shared(line) for line in lines)
+
+
+def compile_dialogue(graph):
+    """
+    Compiler un graphe de dialogue (voir l'exemple du module).
+
+    Args:
+        graph (dict): Nom du nœud -> {"lines", "next", "set"}
+
+    Returns:
+        Dialogue: Le dialogue compilé, partagé avec les graphes identiques
+
+    Raises:
+        ValueError: Si une condition ou un nœud cible est inconnu
+    """
+    key = _freeze(graph)
+    dialogue = _compiled.get(key)
+    if dialogue is not None:
+        return dialogue
+
+    names = tuple(graph)
+    indices = {name: index for index, name in enumerate(names)}
+    lines, transitions, sets = [], [], []
+    for name in names:
+        node = graph[name]
+        lines.append(_lines(node.get("lines", ())))
+        table = []
+        for conditions, target in node.get("next", ()):
+            if target not in indices:
+                raise ValueError(f"Nœud de dialogue inconnu : '{target}' (depuis '{name}')")
+            checks = []
+            for kind, arg in conditions.items():
+                if kind not in CONDITIONS:
+                    raise ValueError(f"Condition de dialogue inconnue : '{kind}'")
+                checks.append((CONDITIONS[kind], arg))
+            table.append((tuple(checks), indices[target]))
+        transitions.append(tuple(table))
+        sets.append(tuple(node.get("set", {}).items()))
+    dialogue = Dialogue(names, tuple(lines), tuple(transitions), tuple(sets))
+    return _compiled.setdefault(key, dialogue)
+
+
+def from_lines(msgs):
+    """
+    Dialogue d'un seul nœud qui répète des répliques à tour de rôle.
+
+    Args:
+        msgs (list | dict): Répliques, ou dict nom de salle -> répliques
+
+    Returns:
+        Dialogue: Le dialogue compilé (partagé)
+    """
+    return compile_dialogue({"début": {"lines": msgs}})
@@ -0,0 +1,312 @@
+"""
+Module Events - Flux des événements de la partie et instantanés périodiques.
+
+Chaque tour joué est enregistré dans le flux de la partie (Game.events) : un
+événement TurnPlayed (la commande) suivi des événements du domaine émis
+pendant le tour, dans l'ordre où ils se produisent :
+
+    - PlayerMoved : le joueur change de salle (go, back, beamer)
+    - ItemTaken, ItemDropped, ItemGiven : objets pris, déposés ou donnés
+    - QuestObjectiveCompleted, QuestCompleted : progression des quêtes
+    - NpcMoved : un PNJ change de salle
+    - GameEnded : victoire ou défaite
+    - TurnUndone : un tour annulé par `undo`, avec ses événements ; un
+      lecteur qui replie le flux les défait, du dernier au premier
+
+Les événements ne désignent salles, objets et personnages que par leur nom :
+l'analyse, le rejeu et les spectateurs les lisent (EventStream.since,
+to_dict) sans passer par les affichages du jeu.
+
+Toutes les SNAPSHOT_INTERVAL événements, le flux garde un instantané de la
+partie (sauvegarde binaire et état du générateur aléatoire), pris entre deux
+tours. N'importe quel tour encore couvert par le flux peut alors être
+reconstruit (rebuild) : l'instantané le plus proche est rechargé et les tours
+suivants y sont rejoués. Un tour qu'on ne peut pas rejouer (save, load,
+undo... voir Game.process_command), un rechargement de la partie ou un
+changement de graine (Game.reseed) force un instantané au tour suivant : le
+rejeu ne passe jamais par eux. Les tours joués à plusieurs ne sont pas
+reconstructibles (une sauvegarde ne contient qu'un joueur).
+
+Les événements sont émis comme les opérations d'annulation (undo) : dans le
+tour en cours sur le thread courant ; hors d'un tour, emit() ne fait rien.
+
+Exemples:
+
+>>> import contextlib, io
+>>> from game import Game
+>>> game = Game("Anne", seed=0)
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     game.setup()
+...     game.process_command("go O")
+...     game.process_command("go N")
+>>> recorded, position = game.events.since(0)
+>>> [type(event).__name__ for event in recorded[:4]]
+['TurnPlayed', 'PlayerMoved', 'NpcMoved', 'QuestObjectiveCompleted']
+>>> to_dict(recorded[1])
+{'type': 'PlayerMoved', 'turn': 1, 'player': 'Anne', 'origin': 'Beach', 'destination': 'Cove'}
+>>> game.events.since(position)
+([], 7)
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     past = rebuild(game, 1)
+>>> past.player.current_room.name, game.player.current_room.name
+('Cove', 'Lagoon')
+
+Une sauvegarde entre deux tours (savegame.snapshot, ex: sauvegarde
+automatique) change la graine : les tours suivants restent reconstructibles.
+
+>>> from worldgen import WorldGenerator
+>>> game = Game("Anne", seed=3, world_builder=WorldGenerator(60, 1, character_rate=0.5))
+>>> states = {}
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     game.setup()
+...     for _ in range(40):
+...         game.process_command("go " + min(game.player.current_room.exits))
+...         states[game.events.turns] = savegame.dumps(game)
+...         if game.events.turns == 20:
+...             _ = savegame.snapshot(game)
+...     past = [rebuild(game, turn) for turn in (10, 30, 40)]
+>>> [savegame.dumps(p) == states[t] for p, t in zip(past, (10, 30, 40))]
+[True, True, True]
+
+`undo` émet un TurnUndone par tour annulé, avec les événements à défaire :
+
+>>> game = Game("Anne", seed=0)
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     game.setup()
+...     game.process_command("go O")
+...     game.process_command("undo")
+>>> recorded, position = game.events.since(0)
+>>> undone = recorded[-1]
+>>> undone.undone, [type(event).__name__ for event in undone.reverted]
+(1, ['PlayerMoved', 'NpcMoved', 'QuestObjectiveCompleted'])
+"""
+
+import contextlib
+import io
+import threading
+from array import array
+from collections import deque, namedtuple
+
+import savegame
+import undo
+
+# Nombre d'événements gardés (les plus anciens sont oubliés)
+EVENT_LIMIT = 10000
+# Nombre d'événements entre deux instantanés
+SNAPSHOT_INTERVAL = 200
+# Nombre d'instantanés gardés
+SNAPSHOT_LIMIT = 50
+
+TurnPlayed = namedtuple("TurnPlayed", "turn player command")
+PlayerMoved = namedtuple("PlayerMoved", "turn player origin destination")
+ItemTaken = namedtuple("ItemTaken", "turn player room item quantity")
+ItemDropped = namedtuple("ItemDropped", "turn player room item quantity")
+ItemGiven = namedtuple("ItemGiven", "turn player character item quantity")
+QuestObjectiveCompleted = namedtuple("QuestObjectiveCompleted", "turn player quest objective")
+QuestCompleted = namedtuple("QuestCompleted", "turn player quest reward")
+NpcMoved = namedtuple("NpcMoved", "turn character origin destination")
+GameEnded = namedtuple("GameEnded", "turn player victory")
+TurnUndone = namedtuple("TurnUndone", "turn player undone reverted")
+
+# Instantané de la partie à la fin du tour `turn` (data None : tour joué à plusieurs)
+Snapshot = namedtuple("Snapshot", "turn position data rng")
+
+_active = threading.local()
+
+
+def emit(event_type, *fields):
+    """
+    Émettre un événement dans le tour en cours.
+
+    Args:
+        event_type (type): La sorte d'événement (ex: PlayerMoved)
+        *fields: Ses champs, sauf le numéro du tour (ajouté ici)
+    """
+    events = getattr(_active, "events", None)
+    if events is not None:
+        events.append(event_type(_active.turn, *fields))
+
+
+def record_undo(stream, player):
+    """
+    Si le tour en cours est annulable, noter dans ses opérations inverses
+    d'annoncer son annulation (TurnUndone) dans le flux `stream`.
+
+    Args:
+        stream (EventStream): Le flux de la partie
+        player (str): Le joueur du tour
+    """
+    turn = getattr(_active, "turn", None)
+    if turn is not None and undo.pending():
+        undo.record(stream.undone, player, turn)
+
+
+def to_dict(event):
+    """Représentation JSON d'un événement : {"type": sorte, champs...}."""
+    fields = event._asdict()
+    if type(event) is TurnUndone:
+        fields["reverted"] = [to_dict(reverted) for reverted in event.reverted]
+    return {"type": type(event).__name__, **fields}
+
+
+def _rng_state(rng):
+    """État du générateur aléatoire, compacté (625 entiers de 32 bits)."""
+    version, internal, gauss = rng.getstate()
+    return version, array("I", internal), gauss
+
+
+class EventStream:
+    """
+    Flux borné des événements d'une partie, avec ses instantanés.
+
+    Attributs:
+        events (deque): Derniers événements (EVENT_LIMIT au plus)
+        snapshots (deque): Derniers instantanés (SNAPSHOT_LIMIT au plus)
+        turns (int): Nombre de tours enregistrés (numéro du dernier tour)
+        position (int): Nombre d'événements enregistrés depuis le début
+        interval (int): Nombre d'événements entre deux instantanés
+    """
+
+    def __init__(self, limit=EVENT_LIMIT, interval=SNAPSHOT_INTERVAL,
+                 snapshot_limit=SNAPSHOT_LIMIT):
+        self.events = deque(maxlen=limit)
+        self.snapshots = deque(maxlen=snapshot_limit)
+        self.turns = 0
+        self.position = 0
+        self.interval = interval
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.events)
+
+    def rebase(self):
+        """Noter que la partie a changé hors du rejeu (chargée, recommencée...)."""
+        self._stale = True
+
+    def _snapshot(self, game):
+        """Garder un instantané de la partie si le tour suivant ne peut pas s'en passer."""
+        last = self.snapshots[-1] if self.snapshots else None
+        if len(game.players) > 1:
+            if last is None or last.data is not None:
+                self.snapshots.append(Snapshot(self.turns, self.position, None, None))
+            return
+        if (self._stale or last is None or last.data is None
+                or self.position - last.position >= self.interval):
+            self.snapshots.append(Snapshot(self.turns, self.position,
+                                           savegame.dumps(game), _rng_state(game.rng)))
+            self._stale = False
+
+    @contextlib.contextmanager
+    def turn(self, game, command, replayable=True):
+        """
+        Enregistrer un tour : la commande puis les événements émis sur ce
+        thread pendant le bloc `with`.
+
+        Args:
+            game (Game): La partie (pour l'instantané pris avant le tour)
+            command (str): La commande jouée par le joueur courant
+            replayable (bool): False si le tour ne peut pas être rejoué
+                               (un instantané sera pris après lui)
+        """
+        with self._lock:
+            self._snapshot(game)
+            self.turns += 1
+            turn = self.turns
+        events = [TurnPlayed(turn, game.player.name, command)]
+        previous = getattr(_active, "events", None), getattr(_active, "turn", None)
+        _active.events, _active.turn = events, turn
+        try:
+            yield
+        finally:
+            _active.events, _active.turn = previous
+            with self._lock:
+                self.events.extend(events)
+                self.position += len(events)
+                if not replayable:
+                    self._stale = True
+
+    def undone(self, player, turn):
+        """
+        Émettre TurnUndone pour le tour `turn`, que `undo` est en train d'annuler.
+
+        Args:
+            player (str): Le joueur du tour annulé
+            turn (int): Le numéro du tour annulé
+        """
+        if getattr(_active, "events", None) is None:
+            return  # Annulation hors d'un tour (ex: solver) : rien à émettre
+        reverted = []
+        with self._lock:
+            for event in reversed(self.events):
+                if event.turn < turn:
+                    break
+                if event.turn == turn and type(event) is not TurnPlayed:
+                    reverted.append(event)
+        # Événements gardés dans l'ordre du tour (vide s'il n'est plus dans le flux)
+        emit(TurnUndone, player, turn, tuple(reversed(reverted)))
+
+    def since(self, position):
+        """
+        Événements enregistrés depuis `position` (pour les lecteurs du flux).
+
+        Args:
+            position (int): Position retournée par l'appel précédent (0 au début)
+
+        Returns:
+            tuple: (liste des événements encore gardés, nouvelle position)
+        """
+        with self._lock:
+            first = self.position - len(self.events)
+            start = max(position - first, 0)
+            return [self.events[i] for i in range(start, len(self.events))], self.position
+
+
+def rebuild(game, turn):
+    """
+    Reconstruire la partie telle qu'elle était à la fin d'un tour.
+
+    L'instantané le plus proche est rechargé dans un nouveau jeu, puis les
+    tours suivants y sont rejoués (affichages masqués). `game` n'est pas
+    modifié ; l'appel doit se faire entre deux tours.
+
+    Args:
+        game (Game): La partie dont le flux est rejoué
+        turn (int): Le numéro du tour (voir EventStream.turns)
+
+    Returns:
+        Game: Un nouveau jeu dans l'état de la fin du tour `turn`
+
+    Raises:
+        ValueError: Si le tour n'est plus (ou pas) couvert par le flux, ou
+                    s'il a été joué à plusieurs
+    """
+    # pylint: disable=import-outside-toplevel, cyclic-import
+    from game import Game
+
+    stream = game.events
+    if not 0 <= turn <= stream.turns:
+        raise ValueError(f"Le tour {turn} n'a pas été joué.")
+    with stream._lock:  # pylint: disable=protected-access
+        if turn == stream.turns:
+            # La fin du dernier tour n'est pas toujours couverte par un instantané
+            stream._snapshot(game)  # pylint: disable=protected-access
+        snapshot = next((s for s in reversed(stream.snapshots) if s.turn <= turn), None)
+        first = stream.position - len(stream.events)
+        if snapshot is None or snapshot.position < first:
+            raise ValueError(f"Le tour {turn} n'est plus couvert par le flux d'événements.")
+        if snapshot.data is None:
+            raise ValueError(f"Le tour {turn} a été joué à plusieurs : "
+                             "il ne peut pas être reconstruit.")
+        commands = [event.command
+                    for event in list(stream.events)[snapshot.position - first:]
+                    if type(event) is TurnPlayed and event.turn <= turn]
+
+    rebuilt = Game(seed=0, world_builder=game.world_builder)
+    with contextlib.redirect_stdout(io.StringIO()):
+        savegame.loads(rebuilt, snapshot.data)
+        version, internal, gauss = snapshot.rng
+        rebuilt.rng.setstate((version, tuple(internal), gauss))
+        for command in commands:
+            rebuilt.process_command(command)
+    return rebuilt
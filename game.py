@@ -7,29 +7,25 @@ Ce module gère:
 - L'initialisation et la boucle de jeu
 - Le chargement des salles et des commandes
 - Le traitement des entrées utilisateur
-- L'interface en ligne de commande ou graphique (Tkinter)
+- L'interface en ligne de commande (l'interface graphique Tkinter est dans gui.py)
 
 Utilisation:
     Mode CLI: python game.py --cli
     Mode GUI (défaut): python game.py
     Mode DEBUG: python game.py --debug
 
-Variables globales:
-    DEBUG: Booléen pour activer les messages de débogage
-    DEBUG_LOG: Buffer pour stocker les messages de débogage
+Les modules lourds ou optionnels (tkinter, readline) ne sont importés qu'au
+moment où ils servent : `import game` et le premier prompt de la console ne
+les chargent pas (voir startup.py). Les messages de débogage sont gérés par
+debuglog.
 """
 
 # Import modules
 
-import os
+import contextlib
+import random
 import sys
-from pathlib import Path
-try:
-    import tkinter as tk # pylint: disable=invalid-name
-    from tkinter import ttk # pylint: disable=invalid-name
-except ImportError:
-    tk = None
-    ttk = None
+import threading
 
 from room import Room
 from player import Player
@@ -38,33 +34,31 @@ from actions import Actions
 from quest import Quest, QuestManager
 from item import Item
 from character import Character
-
-# DEBUG peut être activé de trois façons (ordre de priorité):
-# 1) Flag en ligne de commande `--debug`
-# 2) Variable d'environnement `GAME_DEBUG=1` ou `GAME_DEBUG=true`
-# 3) Valeur par défaut False
-def _detect_debug():
-    """
-    Détecte si le mode DEBUG est activé.
-    
-    Ordre de priorité:
-    1. Flag --debug en ligne de commande
-    2. Variable d'environnement GAME_DEBUG
-    3. Valeur par défaut (False)
-    
-    Returns:
-        bool: True si le mode DEBUG est activé
-    """
-    if any(arg == "--debug" for arg in sys.argv[1:]):
-        return True
-    env = os.getenv("GAME_DEBUG", "0").lower()
-    if env in ("1", "true", "yes", "on"):
-        return True
-    return False
-
-DEBUG = _detect_debug()
-# Buffer pour stocker les messages DEBUG afin de les afficher ultérieurement
-DEBUG_LOG = []
+from beamer import ArrivalTrigger
+from dialogue import compile_dialogue
+import savegame
+import journal
+import undo
+import events
+import autosave
+import completion
+import rewards
+
+# Commandes qui ne modifient pas la partie et ne sont pas rejouées depuis le journal
+UNJOURNALED_COMMANDS = {"save", "load", "debug", "quit", "stop"}
+# Distance (en passages) au-delà de laquelle les PNJ ne sont plus simulés
+INTEREST_RADIUS = 2
+# Nombre de verrous de salles (une salle utilise le verrou index % ROOM_LOCK_STRIPES)
+ROOM_LOCK_STRIPES = 256
+# Noms acceptés pour chaque direction de la commande `go`
+DIRECTION_ALIASES = {
+    "N": "N", "NORD": "N", "nord": "N", "n": "N",
+    "S": "S", "SUD": "S", "sud": "S", "s": "S",
+    "E": "E", "EST": "E", "est": "E", "e": "E",
+    "O": "O", "OUEST": "O", "ouest": "O", "o": "O",
+    "U": "U", "UP": "U", "up": "U", "u": "U",
+    "D": "D", "DOWN": "D", "down": "D", "d": "D"
+}
 
 class Game:
     """
@@ -80,48 +74,425 @@ class Game:
         finished (bool): Si le jeu est terminé
         rooms (list): Liste des salles du jeu
         commands (dict): Dictionnaire des commandes disponibles
-        player (Player): L'instance du joueur
+        player (Player): Le joueur dont la commande est en cours de traitement
+                         (propre à chaque thread)
+        players (dict): Tous les joueurs du monde partagé (nom -> Player)
         player_name (str): Nom optionnel du joueur
         valid_directions (set): Ensemble des directions valides utilisées
-        quest_manager (QuestManager): Gestionnaire des quêtes
+        quest_manager (QuestManager): Gestionnaire des quêtes du joueur courant
+        seed (int): Graine du générateur aléatoire en vigueur
+        rng (random.Random): Générateur aléatoire du jeu (déplacements des PNJ)
+        turn (int): Numéro du dernier tour joué (une commande journalisable par tour)
+        npc_rounds (int): Nombre de tours de déplacement des PNJ déjà joués
+        interest_radius (int): Distance (en passages) au-delà de laquelle les PNJ
+                               s'endorment (voir _move_characters)
+        npc_mixing_rounds (int): Temps de mélange de la marche des PNJ, en tours,
+                                 déclaré par le monde (borne des rattrapages,
+                                 voir Character.sample_position ; None si inconnu)
+        journal (Journal): Journal des commandes de la session (optionnel)
+        undo_log (UndoLog): Opérations inverses des derniers tours (commande `undo`)
+        events (EventStream): Événements des tours joués et instantanés (voir events)
+        changes (int): Nombre de tours qui ont modifié la partie (voir mark_dirty)
+        touched_rooms (set): Indices des salles modifiées depuis setup() et des salles
+                             des PNJ (savegame ne parcourt qu'elles)
+        characters (dict): Index des PNJ du monde (nom -> Character), construit par setup()
+        arrival_triggers (dict): Effets de l'arrivée par téléportation (nom de salle ->
+                                 ArrivalTrigger), déclarés par le monde
+        reward_effects (dict): Effets des récompenses de quêtes (identifiant -> effets,
+                               voir rewards), déclarés par le monde
+        autosaver (Autosaver): Sauvegarde automatique en arrière-plan (optionnelle)
+        completer (Completer): Complétion (Tab) et correction des commandes mal tapées
+        world_builder (callable): Constructeur du monde (None pour l'île)
     """
 
     # pylint: disable=too-many-instance-attributes
-    def __init__(self, player_name=None):
+    def __init__(self, player_name=None, seed=None, world_builder=None):
         """
         Initialiser une nouvelle instance de jeu.
         
         Args:
             player_name (str, optional): Nom du joueur. Si None, sera demandé
                                         lors de setup() en mode CLI
+            seed (int, optional): Graine du générateur aléatoire (tirée au hasard si None)
+            world_builder (callable, optional): Fonction world_builder(game) qui remplit
+                                        game.rooms et les quêtes, et retourne la salle
+                                        de départ. Si None, l'île est créée.
         """
         self.finished = False
         self.rooms = []
         self.commands = {}
+        # Verrous des salles, du déplacement des PNJ et du compteur de tours
+        self._room_locks = [threading.RLock() for _ in range(ROOM_LOCK_STRIPES)]
+        self._npc_lock = threading.Lock()
+        self._turn_lock = threading.Lock()
         self.player = None
+        self.players = {}
         self.player_name = player_name  # Nom optionnel du joueur
         self.valid_directions = set()
         self.victory = False
         self.quest_manager = None
         self.auto_activate_map = {}
+        self.arrival_triggers = {}
+        self.reward_effects = {}
+        self.npc_mixing_rounds = None
+        self.characters = {}
+        self.baseline = None
+        self._quest_template = None
+        self.world_builder = world_builder
+        self.seed = None
+        self.rng = random.Random()
+        self.reseed(random.getrandbits(32) if seed is None else seed)
+        self.turn = 0
+        self.npc_rounds = 0
+        self.interest_radius = INTEREST_RADIUS
+        self.journal = None
+        self.undo_log = undo.UndoLog()
+        self.events = events.EventStream()
+        self.changes = 0
+        self.autosaver = None
+        self.touched_rooms = None
+        self.completer = completion.Completer(self, DIRECTION_ALIASES)
+
+    @property
+    def player(self):
+        """Player: Le joueur dont la commande est en cours de traitement dans ce thread."""
+        acting = getattr(self._acting, "player", None)
+        return self._player if acting is None else acting
+
+    @player.setter
+    def player(self, player):
+        # Joueur principal (celui de setup), pour tous les threads
+        self._player = player
+        self._acting = threading.local()
+
+    @property
+    def quest_manager(self):
+        """QuestManager: Les quêtes du joueur courant (chaque joueur a les siennes)."""
+        player = self.player
+        return None if player is None else player.quest_manager
+
+    @quest_manager.setter
+    def quest_manager(self, manager):
+        if self.player is not None:
+            self.player.quest_manager = manager
+
+    def reseed(self, seed):
+        """
+        Réinitialiser le générateur aléatoire du jeu avec une nouvelle graine.
+
+        La graine est journalisée pour que la session puisse être rejouée, et
+        le flux d'événements prendra un instantané avant le tour suivant
+        (l'appel peut se faire entre deux tours, ex: sauvegarde automatique).
+
+        Args:
+            seed (int): La graine (entier positif)
+        """
+        self.seed = seed
+        self.rng.seed(seed)
+        if getattr(self, "journal", None):
+            self.journal.append_seed(self.turn, seed)
+        if getattr(self, "events", None) is not None:
+            self.events.rebase()
+
+    def reset(self):
+        """
+        Réinitialiser l'état du jeu avant un nouvel appel à setup().
+
+        Utilisé par les commandes `restart` et `load`.
+        """
+        self.rooms = []
+        self.commands = {}
+        self.valid_directions = set()
+        self.player = None
+        self.players = {}
+        self.quest_manager = None
+        self.finished = False
+        self.victory = False
+        self.auto_activate_map = {}
+        self.arrival_triggers = {}
+        self.reward_effects = {}
+        self.npc_mixing_rounds = None
+        self.characters = {}
+        self.baseline = None
+        self._quest_template = None
+        self.turn = 0
+        self.npc_rounds = 0
+        self.undo_log.clear()
+        self.events.rebase()
 
-    # pylint: disable=too-many-locals, too-many-statements
     def setup(self):
         """
         Initialiser et configurer le jeu.
         
         Cette méthode:
-        - Crée toutes les salles et leurs connexions
-        - Ajoute les items et personnages
         - Enregistre les commandes disponibles
         - Crée le joueur
         - Initialise le gestionnaire de quêtes
+        - Crée le monde (l'île par défaut, ou celui de world_builder) :
+          salles, connexions, items, personnages et quêtes
         
         Note: Ne doit être appelée qu'une seule fois au démarrage du jeu
         """
+        self._setup_commands()
+
+        # Setup player
+
+        # Use provided name or ask interactively if not provided
+        if self.player_name:
+            player_name = self.player_name
+        else:
+            player_name = input("\nEntrez votre nom: ")
+
+        self.player = Player(player_name)
+
+        # Initialise le gestionnaire de quêtes pour ce joueur
+        self.quest_manager = QuestManager(self.player)
+        self.players = {self.player.name: self.player}
+
+        # Setup world
+        if self.world_builder:
+            starting_room = self.world_builder(self)
+        else:
+            starting_room = self._setup_island()
+
+        # Salles modifiées depuis la création du monde (et salles des PNJ) :
+        # une sauvegarde ne parcourt qu'elles. Un monde chargé à la demande
+        # suit lui-même ses salles modifiées (LazyWorld.modified_rooms).
+        lazy = hasattr(self.rooms, "modified_rooms")
+        self.touched_rooms = None if lazy else set()
+
+        # Un monde chargé à la demande (worldstore) indexe lui-même ses salles ;
+        # seuls les PNJ de ses salles déjà chargées sont indexés
+        for index, room in enumerate(self.rooms):
+            if room.index is None:
+                room.index = index
+            if room.characters:
+                self.characters.update(room.characters)
+            if not lazy:
+                room.track_changes(self.touched_rooms)
+                if room.characters:
+                    self.touched_rooms.add(index)
+            self.valid_directions.update([d for d in room.exits.keys()
+                                          if room.exits[d] is not None])
+
+        self.player.current_room = starting_room
+        self.player.starting_room = starting_room
+        self.player.rooms = self.rooms
+
+        # Effets des récompenses, résolus une fois au chargement des quêtes
+        for quest in self.quest_manager.quests:
+            quest.effects = rewards.resolve(self.reward_effects, quest.reward)
+
+        # Quêtes d'origine, copiées pour chaque joueur qui rejoint la partie
+        self._quest_template = self.quest_manager.copy_for(None)
+
+        # Vérifier les objectifs de la salle de départ (pour valider "Visiter Beach" immédiatement)
+        self.quest_manager.check_room_objectives(self.player.current_room.name)
+
+        # Référence du monde d'origine pour les sauvegardes (seul le delta est écrit)
+        self.baseline = savegame.baseline(self)
+
+    def add_player(self, name):
+        """
+        Faire rejoindre un nouveau joueur au monde partagé (après setup()).
+
+        Le joueur apparaît dans la salle de départ avec ses propres quêtes,
+        dans l'état d'origine. Le journal de la session est suspendu tant que
+        la partie compte plusieurs joueurs (voir journal).
+
+        Args:
+            name (str): Le nom du joueur (unique dans la partie)
+
+        Returns:
+            Player: Le nouveau joueur
+
+        Raises:
+            ValueError: Si un joueur porte déjà ce nom
+
+        Exemples:
+            >>> game = Game("Anne", seed=0)
+            >>> game.setup()
+            >>> mary = game.add_player("Mary")
+            >>> sorted(game.player.current_room.players)
+            ['Anne', 'Mary']
+            >>> game.player.read_messages()
+            ['👤 Mary arrive.']
+        """
+        player = Player(name)
+        if player.name in self.players:
+            raise ValueError(f"Le joueur {player.name} est déjà dans la partie.")
+        starting_room = self.player.starting_room
+        player.rooms = self.rooms
+        player.starting_room = starting_room
+        player.quest_manager = self._quest_template.copy_for(player)
+        self.players[player.name] = player
+        # Annuler n'a de sens que seul dans le monde
+        self.undo_log.clear()
+        with self.lock_rooms(starting_room):
+            self.broadcast(starting_room, f"👤 {player.name} arrive.")
+            player.current_room = starting_room
+        player.quest_manager.check_room_objectives(starting_room.name)
+        return player
+
+    def remove_player(self, name):
+        """
+        Retirer un joueur du monde partagé.
+
+        S'il ne reste qu'un joueur, une session journalisée est sauvegardée et
+        son journal reprend (voir journal.checkpoint).
+
+        Args:
+            name (str): Le nom du joueur
+
+        Raises:
+            KeyError: Si aucun joueur ne porte ce nom
+        """
+        player = self.players.pop(name)
+        room = player.current_room
+        with self.lock_rooms(room):
+            player.current_room = None
+            if room is not None:
+                self.broadcast(room, f"👤 {player.name} quitte la partie.")
+        if player is self.player and self.players:
+            self.switch_player(next(iter(self.players.values())))
+        if self.journal and len(self.players) == 1:
+            # De nouveau seul : le journal reprend depuis une sauvegarde complète
+            journal.checkpoint(self)
+
+    def switch_player(self, player):
+        """
+        Faire de `player` le joueur dont les commandes sont traitées dans ce thread.
+
+        Args:
+            player (Player): Un joueur de la partie
+        """
+        self._acting.player = player
 
-        # Setup commands
+    @contextlib.contextmanager
+    def lock_rooms(self, *rooms):
+        """
+        Verrouiller des salles pour la durée d'un bloc `with`.
+
+        Les verrous sont toujours pris dans le même ordre (numéro de verrou
+        croissant) : deux commandes qui se disputent les mêmes salles ne peuvent
+        pas s'interbloquer. Les verrous sont réentrants pour un même thread.
+
+        Args:
+            *rooms (Room): Les salles (None est ignoré)
+
+        Exemples:
+            >>> game = Game("Anne", seed=0)
+            >>> game.setup()
+            >>> with game.lock_rooms(game.rooms[0], game.rooms[1]):
+            ...     game.process_command("look")  # doctest: +ELLIPSIS
+            <BLANKLINE>
+            Vous êtes dans ...
+        """
+        locks = self._room_lock_list(rooms)
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @contextlib.contextmanager
+    def lock_world(self):
+        """
+        Verrouiller toutes les salles : aucune commande n'est en cours pendant le bloc.
+
+        Exemples:
+            >>> game = Game("Anne", seed=0)
+            >>> with game.lock_world():
+            ...     pass
+        """
+        for lock in self._room_locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._room_locks):
+                lock.release()
+
+    def mark_dirty(self):
+        """Noter que la partie a changé (la sauvegarde automatique la réécrira)."""
+        self.changes += 1
+        if self.autosaver:
+            self.autosaver.wake()
+
+    def _room_lock_list(self, rooms):
+        """Verrous des salles `rooms`, dans l'ordre d'acquisition."""
+        stripes = sorted({room.index % ROOM_LOCK_STRIPES for room in rooms if room is not None})
+        return [self._room_locks[stripe] for stripe in stripes]
+
+    def _try_lock_rooms(self, rooms):
+        """
+        Verrouiller des salles sans attendre.
+
+        Returns:
+            list: Les verrous pris (à relâcher), ou None si une salle est occupée
+        """
+        acquired = []
+        for lock in self._room_lock_list(rooms):
+            if not lock.acquire(blocking=False):
+                for held in reversed(acquired):
+                    held.release()
+                return None
+            acquired.append(lock)
+        return acquired
+
+    def _command_rooms(self, command_word):
+        """Salles qu'une commande du joueur courant peut modifier."""
+        player = self.player
+        room = player.current_room
+        if room is None:
+            return []
+        rooms = [room]
+        if command_word in ("go", "back"):
+            rooms.extend(room.exits.values())
+        elif command_word == "fire" and "beamer" in player.inventory:
+            # Toutes les destinations du beamer, et la salle des PNJ qu'elles font venir
+            for destination in player.inventory["beamer"].slots.values():
+                rooms.append(destination)
+                trigger = self.arrival_triggers.get(destination.name)
+                summoned = self.characters.get(trigger.summon) if trigger else None
+                if summoned is not None:
+                    rooms.append(summoned.current_room)
+        return rooms
+
+    @staticmethod
+    def broadcast(room, message, exclude=None):
+        """
+        Envoyer un message aux joueurs présents dans une salle.
 
+        Le coût ne dépend que du nombre de joueurs dans la salle.
+
+        Args:
+            room (Room): La salle concernée
+            message (str): Le message
+            exclude (Player, optional): Joueur à ne pas prévenir (l'auteur de l'action)
+        """
+        for player in room.players.values():
+            if player is not exclude:
+                player.notify(message)
+
+    def announce_move(self, left_room, departure):
+        """
+        Prévenir les autres joueurs du départ et de l'arrivée du joueur courant.
+
+        Args:
+            left_room (Room): La salle quittée
+            departure (str): Ce que voient les joueurs de la salle quittée
+                             (ex: "part vers N")
+        """
+        self.broadcast(left_room, f"👤 {self.player.name} {departure}.", exclude=self.player)
+        self.broadcast(self.player.current_room, f"👤 {self.player.name} arrive.",
+                       exclude=self.player)
+
+    # pylint: disable=too-many-locals, too-many-statements
+    def _setup_commands(self):
+        """Enregistrer les commandes disponibles."""
         help_cmd = Command("help", " : afficher cette aide", Actions.help, 0)
         self.commands["help"] = help_cmd
         quit_cmd = Command("quit", " : quitter le jeu", Actions.quit, 0)
@@ -140,6 +511,77 @@ class Game:
         back = Command("back", " : revenir à la salle précédente", Actions.back, 0)
         self.commands["back"] = back
 
+        # Wrapper pour la commande take afin d'activer la quête via le parchemin
+        def take_wrapper(game, list_of_words, number_of_parameters):
+            result = Actions.take(game, list_of_words, number_of_parameters)
+            if result and len(list_of_words) > 1:
+                item_name = list_of_words[1].strip().lower()
+                if item_name in ["parchemin", "trésor", "barils"]:
+                    if game.quest_manager.activate_quest("Chasse aux trésors"):
+                        # Si la quête vient d'être activée,
+                        # on valide l'objectif rétroactivement pour l'objet pris
+                        for key in game.player.inventory:
+                            if key.lower() == item_name:
+                                game.quest_manager.check_action_objectives("prendre", key)
+                                break
+            return result
+
+        take = Command("take", " <item> [quantité] : prendre un objet", take_wrapper, 1)
+        self.commands["take"] = take
+
+        drop = Command("drop", " <item> [quantité] : déposer un objet", Actions.drop, 1)
+        self.commands["drop"] = drop
+
+        check = Command("check", " : vérifier l'inventaire", Actions.check, 0)
+        self.commands["check"] = check
+
+        charge = Command("charge", " [emplacement] : mémoriser la salle actuelle dans le beamer",
+                         Actions.charge, 1)
+        self.commands["charge"] = charge
+
+        fire = Command("fire", " [emplacement] : utiliser le beamer", Actions.fire, 1)
+        self.commands["fire"] = fire
+
+        oui = Command("oui", " : répondre oui", Actions.yes, 0)
+        self.commands["oui"] = oui
+        non = Command("non", " : répondre non", Actions.no, 0)
+        self.commands["non"] = non
+
+        talk = Command("talk", " <nom> : parler avec un personnage", Actions.talk, 1)
+        self.commands["talk"] = talk
+        give = Command("give", " <item> [quantité] : donner un objet à un personnage", Actions.give, 1)
+        self.commands["give"] = give
+        # Commande debug pour basculer le mode debug à l'exécution
+        debug_cmd = Command("debug", " : basculer le mode debug (affiche les messages DEBUG)",
+                            Actions.debug, 0)
+        self.commands["debug"] = debug_cmd
+        # Commandes liées aux quêtes
+        quests_cmd = Command("quests", " [page] : lister les quêtes disponibles",
+                             Actions.show_quests, 1)
+        self.commands["quests"] = quests_cmd
+        quest_cmd = Command("quest", " <titre> : afficher les détails d'une quête",
+                            Actions.show_quest, 1)
+        self.commands["quest"] = quest_cmd
+        # Commande pour afficher les récompenses obtenues
+        rewards_cmd = Command("rewards", " : afficher les récompenses obtenues",
+                              Actions.show_rewards, 0)
+        self.commands["rewards"] = rewards_cmd
+        # Sauvegarde et chargement de la partie
+        save_cmd = Command("save", " [nom] : sauvegarder la partie", Actions.save, 1)
+        self.commands["save"] = save_cmd
+        load_cmd = Command("load", " [nom] : charger une partie sauvegardée", Actions.load, 1)
+        self.commands["load"] = load_cmd
+        undo_cmd = Command("undo", " [n] : annuler les n derniers tours", Actions.undo, 1)
+        self.commands["undo"] = undo_cmd
+
+    # pylint: disable=too-many-locals, too-many-statements
+    def _setup_island(self):
+        """
+        Créer l'île : salles, connexions, items, personnages et quêtes.
+
+        Returns:
+            Room: La salle de départ
+        """
         # Setup rooms
         beach = Room("Beach", "une plage de sable blanc bordée de palmiers, "
                      "avec des eaux cristallines.")
@@ -173,25 +615,6 @@ class Game:
         volcano.exits = {"N": None, "E" : None, "S": None, "O" : cave, "U" : waterfall, "D" : None}
         waterfall.exits = {"N" : None, "E" : None, "S" : None, "O" : cliff, "U": None, "D": None}
 
-        for room in self.rooms :
-            self.valid_directions.update([d for d in room.exits.keys()
-                                          if room.exits[d] is not None])
-
-        # Setup player and starting room
-
-        # Use provided name or ask interactively if not provided
-        if self.player_name:
-            player_name = self.player_name
-        else:
-            player_name = input("\nEntrez votre nom: ")
-
-        self.player = Player(player_name)
-        self.player.current_room = beach
-        self.player.starting_room = beach
-
-        # Initialise le gestionnaire de quêtes pour ce joueur
-        self.quest_manager = QuestManager(self.player)
-
         #quêtes
         q_explore = Quest(
             "Vivre un rêve",
@@ -236,13 +659,22 @@ class Game:
             "Volcano": "Marchander"
         }
 
-        # Dans setup(), après les autres commandes :
-        look = Command("look", " : regarder autour de soi", Actions.look, 0)
-        self.commands["look"] = look
+        # Ce que font les récompenses des quêtes (voir rewards.EFFECTS)
+        self.reward_effects = {
+            "Sac à dos moyen (+5kg)": [("capacity", 5)],
+            "Trésor, Vin et Beamer": [("beamer",)],
+            "Grand sac à dos (+10kg)": [("capacity", 10)],
+        }
 
-        # Après la section "Create exits for rooms", ajoutez :
+        # Retour à la plage par le beamer : Jacob rejoint le joueur pour la fin du jeu
+        self.arrival_triggers = {
+            "Beach": ArrivalTrigger(
+                "\nVous voilà de retour à la plage, Jacob semble vouloir parler.\n",
+                summon="Jacob",
+                player_flags={"endgame_ready": True, "endgame_awaiting_response": False})
+        }
 
-        # Add items to rooms (dans la méthode setup())
+        # Add items to rooms
         parchemin = Item("parchemin", "Vous apercevez un morceau de parchemin à côté d'un "
                          "squelette. Vous pouvez y lire \"Le trésor se trouve à l'extrémité "
                          "de l'île.\"", 0)
@@ -257,61 +689,42 @@ class Game:
         tresor = Item("trésor", "Vous avez retrouvé le trésor.", 10)
         cliff.inventory["trésor"] = tresor
 
-        # Wrapper pour la commande take afin d'activer la quête via le parchemin
-        def take_wrapper(game, list_of_words, number_of_parameters):
-            result = Actions.take(game, list_of_words, number_of_parameters)
-            if result and len(list_of_words) > 1:
-                item_name = list_of_words[1].strip().lower()
-                if item_name in ["parchemin", "trésor", "barils"]:
-                    if game.quest_manager.activate_quest("Chasse aux trésors"):
-                        # Si la quête vient d'être activée,
-                        # on valide l'objectif rétroactivement pour l'objet pris
-                        for key in game.player.inventory:
-                            if key.lower() == item_name:
-                                game.quest_manager.check_action_objectives("prendre", key)
-                                break
-            return result
-
-        take = Command("take", " <item> : prendre un objet", take_wrapper, 1)
-        self.commands["take"] = take
-
-        drop = Command("drop", " <item> : déposer un objet", Actions.drop, 1)
-        self.commands["drop"] = drop
-
-        check = Command("check", " : vérifier l'inventaire", Actions.check, 0)
-        self.commands["check"] = check
-
-        fire = Command("fire", " : utiliser le beamer", Actions.fire, 0)
-        self.commands["fire"] = fire
-
-        oui = Command("oui", " : répondre oui", Actions.yes, 0)
-        self.commands["oui"] = oui
-        non = Command("non", " : répondre non", Actions.no, 0)
-        self.commands["non"] = non
-
-
-        # Après la section "Create exits for rooms"
-        for room in self.rooms:
-            self.valid_directions.update([d for d in room.exits.keys()
-                                          if room.exits[d] is not None])
-
         # Créer des personnages
         jacob_desc = {
             "default": "un perroquet coloré perché sur une branche près de vous.",
             "Cove": "il semble vouloir dire quelque chose."
         }
-        jacob_msgs = {
-            "Beach": ["Arrr ! Bienvenue sur mon île ! Je suis Jacob ! Les singes vous ont volé "
-                      "mais ils ne représentent pas le réel danger de cette île, "
-                      "vous devez vous méfier du crocodile !!"],
-            "Cove": ["Attention ! Le crocodile aime tromper les aventuriers !"]
-        }
+        # Dialogues (voir dialogue) : Jacob pose la question du départ une fois le
+        # joueur revenu à la plage par le beamer (drapeau endgame_ready)
+        jacob_dialogue = compile_dialogue({
+            "accueil": {
+                "lines": {
+                    "Beach": ["Arrr ! Bienvenue sur mon île ! Je suis Jacob ! Les singes vous "
+                              "ont volé mais ils ne représentent pas le réel danger de cette "
+                              "île, vous devez vous méfier du crocodile !!"],
+                    "Cove": ["Attention ! Le crocodile aime tromper les aventuriers !"]
+                },
+                "next": [({"flag": "endgame_ready"}, "départ")],
+            },
+            "départ": {
+                "lines": ["Capitaine, vous et votre équipage avez réussi ! "
+                          "Êtes-vous prêt à repartir ? (oui/non)"],
+                "set": {"endgame_awaiting_response": True},
+            },
+        })
+        singes_dialogue = compile_dialogue({
+            "affamés": {
+                "lines": ["Des bananes ! Des Bananes !"],
+                "next": [({"objective": ("Marchander", "donner bananes")}, "rassasiés")],
+            },
+            "rassasiés": {"lines": ["Merci, tu peux désormais continuer ton aventure."]},
+        })
 
         perroquet = Character(
             "Jacob",
             jacob_desc,
             beach,
-            jacob_msgs,
+            jacob_dialogue,
             can_move=False
         )
 
@@ -328,7 +741,7 @@ class Game:
             "Singes",
             "un groupe de singes malicieux qui semblent affamés.",
             volcano,
-            ["Des bananes ! Des Bananes !"],
+            singes_dialogue,
             can_move=False
         )
 
@@ -337,43 +750,36 @@ class Game:
         lagoon.characters["Crocodile"] = crocodile
         volcano.characters["Singes"] = singe
 
-        # Dans setup(), avec les autres commandes
-        talk = Command("talk", " <nom> : parler avec un personnage", Actions.talk, 1)
-        self.commands["talk"] = talk
-        give = Command("give", " <item> : donner un objet à un personnage", Actions.give, 1)
-        self.commands["give"] = give
-        # Commande debug pour basculer le mode debug à l'exécution
-        debug_cmd = Command("debug", " : basculer le mode debug (affiche les messages DEBUG)",
-                            Actions.debug, 0)
-        self.commands["debug"] = debug_cmd
-        # Commandes liées aux quêtes
-        quests_cmd = Command("quests", " : lister les quêtes disponibles", Actions.show_quests, 0)
-        self.commands["quests"] = quests_cmd
-        quest_cmd = Command("quest", " <titre> : afficher les détails d'une quête",
-                            Actions.show_quest, 1)
-        self.commands["quest"] = quest_cmd
-        # Commande pour afficher les récompenses obtenues
-        rewards_cmd = Command("rewards", " : afficher les récompenses obtenues",
-                              Actions.show_rewards, 0)
-        self.commands["rewards"] = rewards_cmd
-
-        # Vérifier les objectifs de la salle de départ (pour valider "Visiter Beach" immédiatement)
-        self.quest_manager.check_room_objectives(self.player.current_room.name)
+        return beach
 
-    def play(self):
+    def play(self, session=None, autosave_interval=None):
         """
         Lancer la boucle principale du jeu (mode CLI).
         
         Cette méthode:
-        1. Initialise le jeu via setup()
+        1. Initialise le jeu via setup() (ou reprend la session journalisée)
         2. Affiche le message de bienvenue
         3. Entre dans la boucle de jeu
         4. Continue jusqu'à ce que le jeu soit terminé
+
+        Args:
+            session (str, optional): Nom de la session à journaliser et reprendre
+            autosave_interval (float, optional): Délai en secondes entre deux
+                                                 sauvegardes automatiques
         
         Returns:
             None: Le jeu se termine quand finished est True
         """
-        self.setup()
+        if session:
+            replayed = journal.open_session(self, session)
+            if replayed:
+                print(f"\n🔁 Session '{session}' reprise ({replayed} commandes rejouées).")
+        else:
+            self.setup()
+        if autosave_interval is not None:
+            autosave.Autosaver(self, interval=autosave_interval).start()
+        # Complétion des commandes et des noms avec la touche Tab
+        completion.install_readline(self.completer)
         self.print_welcome()
 
         # Collecter tous les personnages du jeu
@@ -382,22 +788,98 @@ class Game:
             all_characters.extend(room.characters.values())
 
         # Loop until the game is finished
-        while not self.finished:
-            # Get the command from the player
-            self.process_command(input("> "))
+        try:
+            while not self.finished:
+                # Get the command from the player
+                self.process_command(input("> "))
+        finally:
+            if self.autosaver:
+                self.autosaver.stop()
+            if self.journal:
+                self.journal.close()
 
     def _move_characters(self):
-        """Déplace les personnages non-joueurs (PNJ) à chaque tour."""
-        # Collecter tous les personnages pour éviter les problèmes d'itération
-        all_characters = []
-        for room in self.rooms:
-            all_characters.extend(list(room.characters.values()))
+        """
+        Déplace les personnages non-joueurs (PNJ) à chaque tour.
 
-        for character in all_characters:
-            character.move(self.player)
+        Seuls les PNJ à moins de `interest_radius` passages d'un joueur sont
+        simulés ; les autres dorment et ne coûtent rien. Un PNJ qui revient
+        à portée rattrape d'un coup les tours manqués (Character.catch_up).
+        """
+        # Un seul tour de PNJ à la fois ; les salles ne sont prises que si elles
+        # sont libres, un PNJ dont la salle est occupée attend le tour suivant
+        with self._npc_lock:
+            player_rooms = [player.current_room for player in self.players.values()]
+            # Monde chargé à la demande : ne garder en mémoire que les environs des joueurs
+            refresh = getattr(self.rooms, "refresh", None)
+            if refresh:
+                refresh(player_rooms)
+
+            undo.record_attribute(self, "npc_rounds")
+            self.npc_rounds += 1
+            # Collecter les personnages proches pour éviter les problèmes d'itération
+            nearby_rooms = {}
+            for player_room in player_rooms:
+                for room in self._rooms_near(player_room, self.interest_radius):
+                    nearby_rooms[id(room)] = room
+            nearby_characters = []
+            for room in nearby_rooms.values():
+                nearby_characters.extend(list(room.characters.values()))
+
+            for character in nearby_characters:
+                if character.can_move:
+                    self._move_character(character)
+
+    def _move_character(self, character):
+        """Rattraper les tours manqués d'un PNJ puis jouer son tour, salles verrouillées."""
+        if character.last_round is None:
+            missed = 0  # Jamais simulé (chargé à la demande) : rien à rattraper
+        else:
+            missed = self.npc_rounds - character.last_round - 1
+        room = character.current_room
+        destination = (character.sample_position(missed, self.rng, self.npc_mixing_rounds)
+                       if missed > 0 else room)
+        locks = self._try_lock_rooms([room, destination, *destination.exits.values()])
+        if locks is None:
+            return
+        try:
+            character.relocate(destination)
+            character.move(self.player, self.rng)
+            undo.record_attribute(character, "last_round")
+            character.last_round = self.npc_rounds
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @staticmethod
+    def _rooms_near(room, radius):
+        """
+        Lister les salles à au plus `radius` passages de `room` (room comprise).
 
-    # pylint: disable=too-many-branches, too-many-statements
-    def process_command(self, command_string) -> None:
+        Args:
+            room (Room): La salle de départ
+            radius (int): Nombre maximal de passages
+
+        Returns:
+            list: Les salles, de la plus proche à la plus lointaine
+        """
+        if room is None:
+            return []
+        seen = {room}
+        near = [room]
+        ring = [room]
+        for _ in range(radius):
+            next_ring = []
+            for current in ring:
+                for neighbour in current.exits.values():
+                    if neighbour is not None and neighbour not in seen:
+                        seen.add(neighbour)
+                        next_ring.append(neighbour)
+            near.extend(next_ring)
+            ring = next_ring
+        return near
+
+    def process_command(self, command_string, player=None) -> None:
         """
         Traiter une commande saisie par le joueur.
         
@@ -410,13 +892,24 @@ class Game:
         
         Args:
             command_string (str): La chaîne saisie par l'utilisateur
+            player (Player, optional): Le joueur qui joue la commande
+                                       (défaut: le joueur courant)
             
         Affiche des messages d'erreur si:
         - La commande n'existe pas
         - Les paramètres sont incorrects
         - L'action échoue
+
+        Plusieurs threads peuvent traiter en parallèle les commandes de joueurs
+        différents : la salle du joueur (et sa destination) est verrouillée
+        pendant la commande. Les commandes d'un même joueur doivent être
+        envoyées l'une après l'autre ; restart, save et load concernent toute la
+        partie et ne doivent pas être lancées pendant celles des autres joueurs.
         """
 
+        if player is not None and player is not self.player:
+            self.switch_player(player)
+
         # Supprimer les espaces
         command_string = command_string.strip()
 
@@ -429,9 +922,42 @@ class Game:
 
         command_word = list_of_words[0].lower()
 
+        journaled = command_word in self.commands and command_word not in UNJOURNALED_COMMANDS
+        # Les modifications d'un tour joué seul sont annulables (commande `undo`)
+        recording = journaled and command_word != "undo" and len(self.players) == 1
+        # Chaque commande reconnue est un tour du flux d'événements ; le rejeu
+        # (events.rebuild) ne repasse que par les tours journalisés
+        streamed = command_word in self.commands
+        replayable = journaled and command_word != "undo"
+
+        # Les salles touchées par la commande sont verrouillées pendant tout le
+        # tour : un instantané pris sous lock_world() tombe entre deux tours
+        with self.lock_rooms(*self._command_rooms(command_word)), \
+                self.events.turn(self, command_string, replayable) if streamed \
+                else contextlib.nullcontext():
+            # Journaliser la commande acceptée avant de l'exécuter
+            if journaled:
+                with self._turn_lock:
+                    self.turn += 1
+                    # Le journal ne rejoue qu'un joueur : il est suspendu à plusieurs
+                    if self.journal and len(self.players) == 1:
+                        self.journal.append_command(self.turn, command_string)
+
+            with self.undo_log.turn() if recording else contextlib.nullcontext():
+                self._execute(command_word, list_of_words)
+                if recording:
+                    # `undo` annoncera l'annulation de ce tour dans le flux
+                    events.record_undo(self.events, self.player.name)
+
+    # pylint: disable=too-many-branches, too-many-statements
+    def _execute(self, command_word, list_of_words):
+        """Exécuter une commande déjà découpée en mots (voir process_command)."""
         # If the command is not recognized, print an error message
         if command_word not in self.commands:
             print(f"\n❌ Commande '{command_word}' non reconnue.")
+            suggestion = self.completer.suggest_command(list_of_words)
+            if suggestion:
+                print(f"   💡 Vouliez-vous dire '{suggestion}' ?")
             print("   Utilisez 'help' pour voir la liste des commandes disponibles.\n")
 
         # If the command is recognized, execute it
@@ -444,16 +970,7 @@ class Game:
             direction = list_of_words[1].upper()
 
             # Normaliser la direction
-            direction_map = {
-                "N": "N", "NORD": "N", "nord": "N", "n": "N",
-                "S": "S", "SUD": "S", "sud": "S", "s": "S",
-                "E": "E", "EST": "E", "est": "E", "e": "E",
-                "O": "O", "OUEST": "O", "ouest": "O", "o": "O",
-                "U": "U", "UP": "U", "up": "U", "u": "U",
-                "D": "D", "DOWN": "D", "down": "D", "d": "D"
-            }
-
-            normalized_direction = direction_map.get(direction)
+            normalized_direction = DIRECTION_ALIASES.get(direction)
 
             # Vérifier si la direction est valide dans le jeu
             if normalized_direction not in self.valid_directions:
@@ -464,16 +981,16 @@ class Game:
             # Effectuer le déplacement
             moved = self.player.move(normalized_direction)
             if moved:
+                self.mark_dirty()
+                self.announce_move(self.player.history[-1], f"part vers {normalized_direction}")
                 # Déplacer Jacob de la Plage vers la Crique si le joueur quitte la Plage
                 # et que ce n'est pas la phase de fin de jeu
                 if self.player.history and not getattr(self.player, "endgame_ready", False):
                     previous_room = self.player.history[-1]
                     if previous_room.name == "Beach" and "Jacob" in previous_room.characters:
-                        jacob = previous_room.characters.pop("Jacob")
                         cove = next((r for r in self.rooms if r.name == "Cove"), None)
                         if cove:
-                            cove.characters["Jacob"] = jacob
-                            jacob.current_room = cove
+                            previous_room.characters["Jacob"].relocate(cove)
 
                 self._move_characters()
                 self.player.print_state()
@@ -486,7 +1003,9 @@ class Game:
                     print("    Soudain, des yeux jaunes brillent dans l'ombre...")
                     print("    Vous êtes violemment dévoré par des crocodiles affamés.")
                     print("    FIN.\n")
+                    undo.record_attribute(self, "finished")
                     self.finished = True
+                    events.emit(events.GameEnded, self.player.name, False)
                     return
             except Exception: # pylint: disable=broad-exception-caught
                 pass
@@ -509,6 +1028,7 @@ class Game:
         else:
             command = self.commands[command_word]
             if command.action(self, list_of_words, command.number_of_parameters):
+                self.mark_dirty()
                 self._move_characters()
 
     def print_welcome(self):
@@ -532,341 +1052,27 @@ class Game:
               "et découvrir des trésors !")
         print(self.player.current_room.get_long_description())
 
-# pylint: disable=too-many-instance-attributes
-class GameGUI(tk.Tk if tk else object):
-    """Interface graphique principale du jeu."""
-    IMAGE_WIDTH = 700
-    IMAGE_HEIGHT = 450
-
-    def __init__(self, game_instance):
-        if tk is None:
-            raise ImportError("Tkinter not available")
-        super().__init__()
-        self.game = game_instance
-        self.title("TBA - Jeu d'aventure")
-        self.protocol("WM_DELETE_WINDOW", self._on_close)
-        self._game_over_shown = False
-        self._image_ref = None
-
-        # Sauvegarde de la sortie standard actuelle (le terminal)
-        self.old_stdout = sys.stdout
-
-        # Configure style
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        # Layout
-        self._build_layout()
-
-        # Redirection de tous les print() vers l'interface graphique
-        sys.stdout = self
-
-        # Initialisation du jeu (après redirection pour éviter les erreurs d'encodage console)
-        self.game.setup()
-
-        # Print welcome in text output
-        self._print_welcome()
-
-    def write(self, text):
-        """Méthode appelée par print() pour écrire du texte."""
-        self.text_output.configure(state="normal")
-        self.text_output.insert("end", text)
-        self.text_output.see("end")
-        self.text_output.configure(state="disabled")
-        self.update_idletasks() # Met à jour l'affichage immédiatement
-
-    def flush(self):
-        """Méthode requise pour la compatibilité avec sys.stdout."""
-        # pass # pylint: disable=unnecessary-pass
-
-    # pylint: disable=too-many-locals, too-many-statements
-    def _build_layout(self):
-        # Configure root grid - 2 columns, 2 rows (plus entry row at bottom)
-        self.grid_rowconfigure(0, weight=1)  # Image / Deplacements
-        self.grid_rowconfigure(1, weight=1)  # Console / Commands
-        self.grid_rowconfigure(2, weight=0)  # Entry bar
-        self.grid_columnconfigure(0, weight=1)  # Left column (image + console)
-        self.grid_columnconfigure(1, weight=0)  # Right column (buttons)
-
-        # TOP LEFT: Image area
-        image_frame = ttk.Frame(self)
-        image_frame.grid(row=0, column=0, sticky="nsew", padx=6, pady=6)
-        image_frame.grid_propagate(False)
-        image_frame.config(width=self.IMAGE_WIDTH, height=self.IMAGE_HEIGHT)
-        self.canvas = tk.Canvas(image_frame, width=self.IMAGE_WIDTH,
-                                height=self.IMAGE_HEIGHT, bg="#1a1a2e", highlightthickness=0)
-        self.canvas.pack(fill="both", expand=True)
-
-        # TOP RIGHT: Movement buttons
-        move_frame = ttk.LabelFrame(self, text="Déplacements", padding=10)
-        move_frame.grid(row=0, column=1, sticky="nsew", padx=6, pady=6)
-        move_frame.grid_columnconfigure(0, weight=1)
-        move_frame.grid_columnconfigure(1, weight=1)
-        move_frame.grid_rowconfigure(0, weight=1)
-        move_frame.grid_rowconfigure(1, weight=1)
-        move_frame.grid_rowconfigure(2, weight=1)
-        move_frame.grid_rowconfigure(3, weight=1)
-
-        btn_style = {'font': ('Arial', 10, 'bold'), 'bg': '#2196F3',
-                     'fg': 'white', 'activebackground': '#0b7dda'}
-        tk.Button(move_frame, text="N", command=lambda: self._send_command("go N"),
-                  **btn_style).grid(row=0, column=0, columnspan=2, sticky="nsew", padx=1, pady=1)
-        tk.Button(move_frame, text="O", command=lambda: self._send_command("go O"),
-                  **btn_style).grid(row=1, column=0, sticky="nsew", padx=1, pady=1)
-        tk.Button(move_frame, text="E", command=lambda: self._send_command("go E"),
-                  **btn_style).grid(row=1, column=1, sticky="nsew", padx=1, pady=1)
-        tk.Button(move_frame, text="S", command=lambda: self._send_command("go S"),
-                  **btn_style).grid(row=2, column=0, columnspan=2, sticky="nsew", padx=1, pady=1)
-        tk.Button(move_frame, text="U", command=lambda: self._send_command("go U"),
-                  **btn_style).grid(row=3, column=0, sticky="nsew", padx=1, pady=1)
-        tk.Button(move_frame, text="D", command=lambda: self._send_command("go D"),
-                  **btn_style).grid(row=3, column=1, sticky="nsew", padx=1, pady=1)
-
-        # BOTTOM LEFT: Terminal output area
-        output_frame = ttk.Frame(self)
-        output_frame.grid(row=1, column=0, sticky="nsew", padx=6, pady=(0,6))
-        output_frame.grid_rowconfigure(0, weight=1)
-        output_frame.grid_columnconfigure(0, weight=1)
-        scrollbar = ttk.Scrollbar(output_frame, orient="vertical")
-        self.text_output = tk.Text(output_frame, wrap="word", yscrollcommand=scrollbar.set,
-                                   state="disabled", bg="#111", fg="#eee", font=('Arial', 10))
-        scrollbar.config(command=self.text_output.yview)
-        self.text_output.grid(row=0, column=0, sticky="nsew")
-        scrollbar.grid(row=0, column=1, sticky="ns")
-
-        # BOTTOM RIGHT: Command buttons
-        cmds_frame = ttk.LabelFrame(self, text="Actions rapides", padding=10)
-        cmds_frame.grid(row=1, column=1, sticky="nsew", padx=6, pady=(0,6))
-        cmds_frame.grid_columnconfigure(0, weight=1)
-        cmds_frame.grid_rowconfigure(0, weight=1)
-
-        # Create scrollable frame for commands with 2 columns
-        canvas_cmds = tk.Canvas(cmds_frame, bg="#f0f0f0", highlightthickness=0)
-        scrollable_frame = ttk.Frame(canvas_cmds)
-        win_id = canvas_cmds.create_window((0, 0), window=scrollable_frame, anchor="nw")
-
-        def _update_dims(event):
-            c_w = event.width if event.widget == canvas_cmds else canvas_cmds.winfo_width()
-            c_h = event.height if event.widget == canvas_cmds else canvas_cmds.winfo_height()
-            f_req_h = scrollable_frame.winfo_reqheight()
-            canvas_cmds.itemconfig(win_id, width=c_w, height=max(c_h, f_req_h))
-            canvas_cmds.configure(scrollregion=canvas_cmds.bbox("all"))
-
-        scrollable_frame.bind("<Configure>", _update_dims)
-        canvas_cmds.bind("<Configure>", _update_dims)
-
-        quick_cmds = [
-            ("help", "Aide"), ("look", "Regarder"), ("take ", "Prendre"), ("drop ", "Déposer"),
-            ("check", "Inventaire"), ("back", "Retour"), ("talk ", "Parler"),
-            ("quests", "Quêtes"), ("quest ", "Détails quête"),
-            ("rewards", "Récompenses"),
-            ("fire", "Utiliser beamer"), ("debug", "DEBUG")
-        ]
-
-        action_btn_style = {'font': ('Arial', 9, 'bold'), 'bg': '#4CAF50',
-                            'fg': 'white', 'activebackground': '#45a049'}
-
-        # Create grid for buttons (3 columns)
-        scrollable_frame.grid_columnconfigure(0, weight=1)
-        scrollable_frame.grid_columnconfigure(1, weight=1)
-        scrollable_frame.grid_columnconfigure(2, weight=1)
-
-        row = 0
-        for idx, (cmd, label) in enumerate(quick_cmds):
-            def make_cmd(c):
-                if c.endswith(" "):
-                    return lambda: self._fill_entry(c)
-                return lambda: self._send_command(c.strip())
-            row = idx // 3
-            col = idx % 3
-            scrollable_frame.grid_rowconfigure(row, weight=1)
-            tk.Button(scrollable_frame, text=label, command=make_cmd(cmd),
-                      **action_btn_style).grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
-
-        # Bouton Recommencer sur toute la largeur
-        tk.Button(scrollable_frame, text="Recommencer",
-                  command=lambda: self._send_command("restart"),
-                  **action_btn_style).grid(row=row+1, column=0, columnspan=3,
-                                           sticky="nsew", padx=1, pady=1)
-
-        canvas_cmds.grid(row=0, column=0, sticky="nsew")
-
-        # BOTTOM: Entry area (spans both columns)
-        entry_frame = ttk.Frame(self)
-        entry_frame.grid(row=2, column=0, columnspan=2, sticky="ew", padx=6, pady=(3,6))
-        entry_frame.grid_columnconfigure(0, weight=1)
-        self.entry_var = tk.StringVar()
-        self.entry = ttk.Entry(entry_frame, textvariable=self.entry_var)
-        self.entry.grid(row=0, column=0, sticky="ew")
-        self.entry.bind("<Return>", self._on_enter)
-        self.entry.focus_set()
-
-    def _print_welcome(self):
-        self._write_output(f"\n🎮 Bienvenue {self.game.player.name} dans ce jeu d'aventure !\n")
-        self._write_output("💡 Entrez 'help' si vous avez besoin d'aide.\n")
-        self._write_output("Capitaine, votre bateau a fait naufrage, fort heureusement, "
-                           "votre équipage a survécu. "
-                           "Cependant, toutes vos ressources ont été volées par des singes.\n"
-                           "Il vous faura explorer cette île pour retrouver vos ressources "
-                           "et découvrir des trésors !")
-        self._write_output(self.game.player.current_room.get_long_description())
-        self._update_room_image()
-
-    def _write_output(self, text):
-        self.text_output.configure(state="normal")
-        self.text_output.insert("end", text + "\n")
-        self.text_output.see("end")
-        self.text_output.configure(state="disabled")
-
-    def _on_enter(self, _event=None):
-        value = self.entry_var.get().strip()
-        if value:
-            self._send_command(value)
-            self.entry_var.set("")
-
-    def _fill_entry(self, text):
-        self.entry.delete(0, "end")
-        self.entry.insert(0, text)
-        self.entry.focus_set()
-        self.entry.icursor("end")
-
-    def _send_command(self, command):
-        # Si le jeu est fini, seule la commande 'restart' est autorisée
-        if self.game.finished and command.strip().lower() != "restart":
-            return
-        # Echo the command in output area
-        self._write_output(f"> {command}")
-        # Process command
-        self.game.process_command(command)
-
-        # Si on vient de redémarrer, on réactive l'interface
-        if command.strip().lower() == "restart":
-            self.entry.configure(state="normal")
-            self._game_over_shown = False
-            self._update_room_image()
-            return
-
-        # Update room image and output
-        self._update_room_image()
-        if self.game.finished:
-            self.entry.configure(state="disabled")
-            # Show a final animation or image instead of immediate close
-            self.after(200, self._show_game_over)
-
-    def _update_room_image(self):
-        # Update the canvas based on current room.
-        # If room.image exists and file exists, try to load it.
-        room = self.game.player.current_room
-        assets_dir = Path(__file__).parent / 'assets'
-        self.canvas.delete("all")
-        image_path = None
-
-        # 1. Vérifier si une image est explicitement définie
-        if getattr(room, 'image', None):
-            p = assets_dir / room.image
-            if p.exists():
-                image_path = str(p)
-
-        # 2. Sinon, chercher une image portant le nom de la salle (ex: Beach.png)
-        if not image_path:
-            for ext in [".png", ".gif"]:
-                p = assets_dir / f"{room.name}{ext}"
-                if p.exists():
-                    image_path = str(p)
-                    break
-
-        if image_path:
-            try:
-                img = tk.PhotoImage(file=image_path)
-
-                # Redimensionner l'image si elle est trop grande (méthode native sans PIL)
-                w, h = img.width(), img.height()
-                factor = int(max(w / self.IMAGE_WIDTH, h / self.IMAGE_HEIGHT))
-
-                if factor > 1:
-                    img = img.subsample(factor)
-
-                # Keep reference
-                self._image_ref = img
-                self.canvas.create_image(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2,
-                                         image=self._image_ref)
-                return
-            except Exception: # pylint: disable=broad-exception-caught
-                # fallthrough to drawn representation
-                pass
-        # Draw a simple representation
-        self.canvas.create_rectangle(0, 0, self.IMAGE_WIDTH, self.IMAGE_HEIGHT, fill="#334")
-        self.canvas.create_text(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2, text=room.name,
-                                fill="white", font=("Helvetica", 20))
-
-    def _show_game_over(self):
-        """Display final image or simple animation when the game ends."""
-        if getattr(self, '_game_over_shown', False):
-            return
-        self._game_over_shown = True
-
-        # Try to load an explicit gameover image from assets
-        assets_dir = Path(__file__).parent / 'assets'
-        # Accept PNG or PPM placeholders
-        gameover_path_png = assets_dir / 'gameover.png'
-        gameover_path_ppm = assets_dir / 'gameover.ppm'
-        self.canvas.delete("all")
-        chosen = None
-        if gameover_path_png.exists():
-            chosen = gameover_path_png
-        elif gameover_path_ppm.exists():
-            chosen = gameover_path_ppm
-        if chosen is not None:
-            try:
-                img = tk.PhotoImage(file=str(chosen))
-                self._image_ref = img
-                self.canvas.create_image(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2,
-                                         image=self._image_ref)
-                return
-            except Exception: # pylint: disable=broad-exception-caught
-                chosen = None
-        if chosen is None:
-            # Simple flashing red animation with final text
-            steps = 6
-            def flash(step=0):
-                if getattr(self.game, 'victory', False):
-                    color = "#2E7D32" if step % 2 == 0 else "#1B5E20" # Vert pour la victoire
-                    text_main = "VOUS AVEZ GAGNÉ !"
-                else:
-                    color = "#600" if step % 2 == 0 else "#300" # Rouge pour la défaite
-                    text_main = "VOUS AVEZ ÉTÉ DÉVORÉ"
-
-                self.canvas.delete("all")
-                self.canvas.create_rectangle(0, 0, self.IMAGE_WIDTH, self.IMAGE_HEIGHT, fill=color)
-                self.canvas.create_text(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2 - 10,
-                                        text=text_main, fill="white",
-                                        font=("Helvetica", 16, "bold"))
-                self.canvas.create_text(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2 + 30,
-                                        text="FIN", fill="white", font=("Helvetica", 14))
-                if step < steps:
-                    self.after(300, lambda: flash(step+1))
-                else:
-                    # keep final frame and write to output console
-                    self._write_output(f"\n--- {text_main}. PARTIE TERMINÉE ---\n")
-            flash()
-
-    def _on_close(self):
-        sys.stdout = self.old_stdout # Restaure la sortie vers le terminal
-        try:
-            self.destroy()
-        except Exception: # pylint: disable=broad-exception-caught
-            pass
-
 def main():
     """Point d'entrée principal du programme."""
     # If '--cli' is passed, start the classic console version. Otherwise launch the Tkinter GUI.
     args = sys.argv[1:]
+    # '--session <nom>' journalise la partie et la reprend après un arrêt brutal
+    session = None
+    if '--session' in args and args.index('--session') + 1 < len(args):
+        session = args[args.index('--session') + 1]
+    # '--autosave [secondes]' sauvegarde la partie en arrière-plan dans saves/<nom>-auto.sav
+    autosave_interval = None
+    if '--autosave' in args:
+        autosave_interval = autosave.AUTOSAVE_INTERVAL
+        position = args.index('--autosave') + 1
+        if position < len(args) and args[position].replace('.', '', 1).isdigit():
+            autosave_interval = float(args[position])
     if '--cli' in args:
-        Game().play()
+        Game().play(session, autosave_interval)
         return
     # Try to launch GUI, fallback to CLI if unavailable
     try:
-        if tk is None:
-            raise ImportError("Tkinter not available")
+        from gui import GameGUI # pylint: disable=import-outside-toplevel
         # Ask for player name before opening GUI
         player_name = input("Entrez votre nom : ").strip()
         if not player_name:
@@ -874,11 +1080,11 @@ def main():
         # Create game and GUI with player name
         game = Game(player_name=player_name)
 
-        app = GameGUI(game)
+        app = GameGUI(game, session, autosave_interval)
         app.mainloop()
     except Exception as e: # pylint: disable=broad-exception-caught
         print(f"GUI indisponible ({e}). Passage en mode console.")
-        Game().play()
+        Game().play(session, autosave_interval)
 
 
 
@@ -0,0 +1,492 @@
+"""
+Module GUI - Interface graphique (Tkinter) du jeu.
+
+Importé seulement au lancement en mode graphique : le mode console et les
+outils sans interface (solveur, simulations, tests de charge) ne chargent
+pas Tkinter.
+
+Utilisation:
+    python game.py
+"""
+
+import os
+import sys
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+
+import autosave
+import journal
+import minimap
+
+
+# pylint: disable=too-many-instance-attributes
+class GameGUI(tk.Tk):
+    """Interface graphique principale du jeu."""
+    IMAGE_WIDTH = 700
+    IMAGE_HEIGHT = 450
+    MAP_SIZE = 220  # Côté de la minicarte (pixels)
+    MAP_CELL = 28   # Côté d'une case de la grille (pixels)
+
+    def __init__(self, game_instance, session=None, autosave_interval=None):
+        super().__init__()
+        self.game = game_instance
+        self.title("TBA - Jeu d'aventure")
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._game_over_shown = False
+        self._image_ref = None
+        self._map_rooms = None     # Monde affiché sur la minicarte
+        self._map_cells = []       # Case de chaque salle (voir minimap.layout)
+        self._map_index = {}       # id(salle) -> indice dans game.rooms
+        self._map_links = []       # Salles reliées à chaque salle (indices)
+        self._map_drawn = set()    # Indices des salles déjà dessinées
+        self._map_marker = None
+        self._map_region = (0, 0, 1, 1)  # Zone de défilement de la minicarte (pixels)
+        self._quest_manager = None  # Quêtes affichées dans le journal
+        self._quest_revisions = []  # Révision affichée de chaque quête
+
+        # Sauvegarde de la sortie standard actuelle (le terminal)
+        self.old_stdout = sys.stdout
+
+        # Configure style
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        # Layout
+        self._build_layout()
+
+        # Redirection de tous les print() vers l'interface graphique
+        sys.stdout = self
+
+        # Initialisation du jeu (après redirection pour éviter les erreurs d'encodage console)
+        if session:
+            journal.open_session(self.game, session)
+        else:
+            self.game.setup()
+        if autosave_interval is not None:
+            autosave.Autosaver(self.game, interval=autosave_interval).start()
+
+        # Print welcome in text output
+        self._print_welcome()
+
+    def write(self, text):
+        """Méthode appelée par print() pour écrire du texte."""
+        self.text_output.configure(state="normal")
+        self.text_output.insert("end", text)
+        self.text_output.see("end")
+        self.text_output.configure(state="disabled")
+        self.update_idletasks() # Met à jour l'affichage immédiatement
+
+    def flush(self):
+        """Méthode requise pour la compatibilité avec sys.stdout."""
+        # pass # pylint: disable=unnecessary-pass
+
+    # pylint: disable=too-many-locals, too-many-statements
+    def _build_layout(self):
+        # Configure root grid - 2 columns, 2 rows (plus entry row at bottom)
+        self.grid_rowconfigure(0, weight=1)  # Image / Deplacements
+        self.grid_rowconfigure(1, weight=1)  # Console / Commands
+        self.grid_rowconfigure(2, weight=0)  # Entry bar
+        self.grid_columnconfigure(0, weight=1)  # Left column (image + console)
+        self.grid_columnconfigure(1, weight=0)  # Right column (buttons)
+        self.grid_columnconfigure(2, weight=0)  # Minicarte
+
+        # TOP LEFT: Image area
+        image_frame = ttk.Frame(self)
+        image_frame.grid(row=0, column=0, sticky="nsew", padx=6, pady=6)
+        image_frame.grid_propagate(False)
+        image_frame.config(width=self.IMAGE_WIDTH, height=self.IMAGE_HEIGHT)
+        self.canvas = tk.Canvas(image_frame, width=self.IMAGE_WIDTH,
+                                height=self.IMAGE_HEIGHT, bg="#1a1a2e", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+
+        # TOP RIGHT: Movement buttons
+        move_frame = ttk.LabelFrame(self, text="Déplacements", padding=10)
+        move_frame.grid(row=0, column=1, sticky="nsew", padx=6, pady=6)
+        move_frame.grid_columnconfigure(0, weight=1)
+        move_frame.grid_columnconfigure(1, weight=1)
+        move_frame.grid_rowconfigure(0, weight=1)
+        move_frame.grid_rowconfigure(1, weight=1)
+        move_frame.grid_rowconfigure(2, weight=1)
+        move_frame.grid_rowconfigure(3, weight=1)
+
+        btn_style = {'font': ('Arial', 10, 'bold'), 'bg': '#2196F3',
+                     'fg': 'white', 'activebackground': '#0b7dda'}
+        tk.Button(move_frame, text="N", command=lambda: self._send_command("go N"),
+                  **btn_style).grid(row=0, column=0, columnspan=2, sticky="nsew", padx=1, pady=1)
+        tk.Button(move_frame, text="O", command=lambda: self._send_command("go O"),
+                  **btn_style).grid(row=1, column=0, sticky="nsew", padx=1, pady=1)
+        tk.Button(move_frame, text="E", command=lambda: self._send_command("go E"),
+                  **btn_style).grid(row=1, column=1, sticky="nsew", padx=1, pady=1)
+        tk.Button(move_frame, text="S", command=lambda: self._send_command("go S"),
+                  **btn_style).grid(row=2, column=0, columnspan=2, sticky="nsew", padx=1, pady=1)
+        tk.Button(move_frame, text="U", command=lambda: self._send_command("go U"),
+                  **btn_style).grid(row=3, column=0, sticky="nsew", padx=1, pady=1)
+        tk.Button(move_frame, text="D", command=lambda: self._send_command("go D"),
+                  **btn_style).grid(row=3, column=1, sticky="nsew", padx=1, pady=1)
+
+        # FAR RIGHT: Minicarte des salles découvertes
+        self.map_frame = ttk.LabelFrame(self, text="Carte", padding=6)
+        self.map_frame.grid(row=0, column=2, sticky="nsew", padx=6, pady=6)
+        self.map_canvas = tk.Canvas(self.map_frame, width=self.MAP_SIZE, height=self.MAP_SIZE,
+                                    bg="#1a1a2e", highlightthickness=0)
+        self.map_canvas.pack(fill="both", expand=True)
+
+        # FAR RIGHT (bas): Journal des quêtes, une ligne par quête
+        quest_frame = ttk.LabelFrame(self, text="Quêtes", padding=6)
+        quest_frame.grid(row=1, column=2, sticky="nsew", padx=6, pady=(0,6))
+        quest_frame.grid_rowconfigure(0, weight=1)
+        quest_frame.grid_columnconfigure(0, weight=1)
+        quest_scrollbar = ttk.Scrollbar(quest_frame, orient="vertical")
+        self.quest_tree = ttk.Treeview(quest_frame, show="tree", selectmode="browse",
+                                       yscrollcommand=quest_scrollbar.set)
+        self.quest_tree.column("#0", width=self.MAP_SIZE)
+        quest_scrollbar.config(command=self.quest_tree.yview)
+        self.quest_tree.grid(row=0, column=0, sticky="nsew")
+        quest_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.quest_tree.bind("<Double-1>", self._on_quest_selected)
+
+        # BOTTOM LEFT: Terminal output area
+        output_frame = ttk.Frame(self)
+        output_frame.grid(row=1, column=0, sticky="nsew", padx=6, pady=(0,6))
+        output_frame.grid_rowconfigure(0, weight=1)
+        output_frame.grid_columnconfigure(0, weight=1)
+        scrollbar = ttk.Scrollbar(output_frame, orient="vertical")
+        self.text_output = tk.Text(output_frame, wrap="word", yscrollcommand=scrollbar.set,
+                                   state="disabled", bg="#111", fg="#eee", font=('Arial', 10))
+        scrollbar.config(command=self.text_output.yview)
+        self.text_output.grid(row=0, column=0, sticky="nsew")
+        scrollbar.grid(row=0, column=1, sticky="ns")
+
+        # BOTTOM RIGHT: Command buttons
+        cmds_frame = ttk.LabelFrame(self, text="Actions rapides", padding=10)
+        cmds_frame.grid(row=1, column=1, sticky="nsew", padx=6, pady=(0,6))
+        cmds_frame.grid_columnconfigure(0, weight=1)
+        cmds_frame.grid_rowconfigure(0, weight=1)
+
+        # Create scrollable frame for commands with 2 columns
+        canvas_cmds = tk.Canvas(cmds_frame, bg="#f0f0f0", highlightthickness=0)
+        scrollable_frame = ttk.Frame(canvas_cmds)
+        win_id = canvas_cmds.create_window((0, 0), window=scrollable_frame, anchor="nw")
+
+        def _update_dims(event):
+            c_w = event.width if event.widget == canvas_cmds else canvas_cmds.winfo_width()
+            c_h = event.height if event.widget == canvas_cmds else canvas_cmds.winfo_height()
+            f_req_h = scrollable_frame.winfo_reqheight()
+            canvas_cmds.itemconfig(win_id, width=c_w, height=max(c_h, f_req_h))
+            canvas_cmds.configure(scrollregion=canvas_cmds.bbox("all"))
+
+        scrollable_frame.bind("<Configure>", _update_dims)
+        canvas_cmds.bind("<Configure>", _update_dims)
+
+        quick_cmds = [
+            ("help", "Aide"), ("look", "Regarder"), ("take ", "Prendre"), ("drop ", "Déposer"),
+            ("check", "Inventaire"), ("back", "Retour"), ("talk ", "Parler"),
+            ("quests", "Quêtes"), ("quest ", "Détails quête"),
+            ("rewards", "Récompenses"),
+            ("fire", "Utiliser beamer"), ("undo", "Annuler"), ("debug", "DEBUG")
+        ]
+
+        action_btn_style = {'font': ('Arial', 9, 'bold'), 'bg': '#4CAF50',
+                            'fg': 'white', 'activebackground': '#45a049'}
+
+        # Create grid for buttons (3 columns)
+        scrollable_frame.grid_columnconfigure(0, weight=1)
+        scrollable_frame.grid_columnconfigure(1, weight=1)
+        scrollable_frame.grid_columnconfigure(2, weight=1)
+
+        row = 0
+        for idx, (cmd, label) in enumerate(quick_cmds):
+            def make_cmd(c):
+                if c.endswith(" "):
+                    return lambda: self._fill_entry(c)
+                return lambda: self._send_command(c.strip())
+            row = idx // 3
+            col = idx % 3
+            scrollable_frame.grid_rowconfigure(row, weight=1)
+            tk.Button(scrollable_frame, text=label, command=make_cmd(cmd),
+                      **action_btn_style).grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
+
+        # Bouton Recommencer sur toute la largeur
+        tk.Button(scrollable_frame, text="Recommencer",
+                  command=lambda: self._send_command("restart"),
+                  **action_btn_style).grid(row=row+1, column=0, columnspan=3,
+                                           sticky="nsew", padx=1, pady=1)
+
+        canvas_cmds.grid(row=0, column=0, sticky="nsew")
+
+        # BOTTOM: Entry area (spans all columns)
+        entry_frame = ttk.Frame(self)
+        entry_frame.grid(row=2, column=0, columnspan=3, sticky="ew", padx=6, pady=(3,6))
+        entry_frame.grid_columnconfigure(0, weight=1)
+        self.entry_var = tk.StringVar()
+        self.entry = ttk.Entry(entry_frame, textvariable=self.entry_var)
+        self.entry.grid(row=0, column=0, sticky="ew")
+        self.entry.bind("<Return>", self._on_enter)
+        self.entry.bind("<Tab>", self._on_tab)
+        self.entry.focus_set()
+
+    def _print_welcome(self):
+        self._write_output(f"\n🎮 Bienvenue {self.game.player.name} dans ce jeu d'aventure !\n")
+        self._write_output("💡 Entrez 'help' si vous avez besoin d'aide.\n")
+        self._write_output("Capitaine, votre bateau a fait naufrage, fort heureusement, "
+                           "votre équipage a survécu. "
+                           "Cependant, toutes vos ressources ont été volées par des singes.\n"
+                           "Il vous faura explorer cette île pour retrouver vos ressources "
+                           "et découvrir des trésors !")
+        self._write_output(self.game.player.current_room.get_long_description())
+        self._update_room_image()
+        self._update_minimap()
+        self._update_quest_panel()
+
+    def _write_output(self, text):
+        self.text_output.configure(state="normal")
+        self.text_output.insert("end", text + "\n")
+        self.text_output.see("end")
+        self.text_output.configure(state="disabled")
+
+    def _on_enter(self, _event=None):
+        value = self.entry_var.get().strip()
+        if value:
+            self._send_command(value)
+            self.entry_var.set("")
+
+    def _on_tab(self, _event=None):
+        # Compléter jusqu'au curseur ; plusieurs réponses : préfixe commun et liste
+        line = self.entry.get()[:self.entry.index("insert")]
+        matches = self.game.completer.complete(line)
+        if len(matches) == 1:
+            self._fill_entry(matches[0] + " ")
+        elif matches:
+            prefix = os.path.commonprefix(matches)
+            if len(prefix) > len(line):
+                self._fill_entry(prefix)
+            self._write_output("   " + "  ".join(match.rsplit(" ", 1)[-1] for match in matches))
+        return "break"  # Ne pas passer le focus au widget suivant
+
+    def _fill_entry(self, text):
+        self.entry.delete(0, "end")
+        self.entry.insert(0, text)
+        self.entry.focus_set()
+        self.entry.icursor("end")
+
+    def _send_command(self, command):
+        # Si le jeu est fini, seule la commande 'restart' est autorisée
+        if self.game.finished and command.strip().lower() != "restart":
+            return
+        # Echo the command in output area
+        self._write_output(f"> {command}")
+        # Process command
+        self.game.process_command(command)
+
+        # Si on vient de redémarrer, on réactive l'interface
+        if command.strip().lower() == "restart":
+            self.entry.configure(state="normal")
+            self._game_over_shown = False
+            self._update_room_image()
+            self._update_minimap()
+            self._update_quest_panel()
+            return
+
+        # Update room image and output
+        self._update_room_image()
+        self._update_minimap()
+        self._update_quest_panel()
+        if self.game.finished:
+            self.entry.configure(state="disabled")
+            # Show a final animation or image instead of immediate close
+            self.after(200, self._show_game_over)
+
+    def _update_room_image(self):
+        # Update the canvas based on current room.
+        # If room.image exists and file exists, try to load it.
+        room = self.game.player.current_room
+        assets_dir = Path(__file__).parent / 'assets'
+        self.canvas.delete("all")
+        image_path = None
+
+        # 1. Vérifier si une image est explicitement définie
+        if getattr(room, 'image', None):
+            p = assets_dir / room.image
+            if p.exists():
+                image_path = str(p)
+
+        # 2. Sinon, chercher une image portant le nom de la salle (ex: Beach.png)
+        if not image_path:
+            for ext in [".png", ".gif"]:
+                p = assets_dir / f"{room.name}{ext}"
+                if p.exists():
+                    image_path = str(p)
+                    break
+
+        if image_path:
+            try:
+                img = tk.PhotoImage(file=image_path)
+
+                # Redimensionner l'image si elle est trop grande (méthode native sans PIL)
+                w, h = img.width(), img.height()
+                factor = int(max(w / self.IMAGE_WIDTH, h / self.IMAGE_HEIGHT))
+
+                if factor > 1:
+                    img = img.subsample(factor)
+
+                # Keep reference
+                self._image_ref = img
+                self.canvas.create_image(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2,
+                                         image=self._image_ref)
+                return
+            except Exception: # pylint: disable=broad-exception-caught
+                # fallthrough to drawn representation
+                pass
+        # Draw a simple representation
+        self.canvas.create_rectangle(0, 0, self.IMAGE_WIDTH, self.IMAGE_HEIGHT, fill="#334")
+        self.canvas.create_text(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2, text=room.name,
+                                fill="white", font=("Helvetica", 20))
+
+    def _update_minimap(self):
+        # Le monde est disposé une fois (minimap.cached_layout) ; à chaque tour,
+        # seuls la salle découverte et le marqueur du joueur sont redessinés
+        rooms = self.game.rooms
+        if rooms is not self._map_rooms:
+            self._reset_minimap(rooms)
+        room = self.game.player.current_room
+        index = self._map_index.get(id(room))
+        if index is None:
+            return
+        if index not in self._map_drawn:
+            self._draw_map_room(index)
+        x, y = self._map_center(index)
+        radius = self.MAP_CELL // 5
+        self.map_canvas.coords(self._map_marker, x - radius, y - radius, x + radius, y + radius)
+        self.map_canvas.tag_raise(self._map_marker)
+        self.map_frame.configure(text=f"Carte - {room.name}")
+        # Centrer la vue sur le joueur
+        x0, y0, x1, y1 = self._map_region
+        half_width = max(self.map_canvas.winfo_width(), self.MAP_SIZE) / 2
+        half_height = max(self.map_canvas.winfo_height(), self.MAP_SIZE) / 2
+        self.map_canvas.xview_moveto((x - half_width - x0) / (x1 - x0))
+        self.map_canvas.yview_moveto((y - half_height - y0) / (y1 - y0))
+
+    def _reset_minimap(self, rooms):
+        # Nouveau monde (début de partie, restart) : repartir d'une carte vide
+        self._map_rooms = rooms
+        self._map_cells = minimap.cached_layout(rooms)
+        self._map_index = {id(room): index for index, room in enumerate(rooms)}
+        # Passages dans les deux sens : une sortie à sens unique relie aussi les deux salles
+        self._map_links = [set() for _ in rooms]
+        for index, room in enumerate(rooms):
+            for target in room.exits.values():
+                other = self._map_index.get(id(target)) if target is not None else None
+                if other is not None and other != index:
+                    self._map_links[index].add(other)
+                    self._map_links[other].add(index)
+        self._map_drawn = set()
+        self.map_canvas.delete("all")
+        xs = [x for x, _ in self._map_cells] or [0]
+        ys = [y for _, y in self._map_cells] or [0]
+        margin = self.MAP_SIZE
+        self._map_region = (min(xs) * self.MAP_CELL - margin, min(ys) * self.MAP_CELL - margin,
+                            max(xs) * self.MAP_CELL + margin, max(ys) * self.MAP_CELL + margin)
+        self.map_canvas.configure(scrollregion=self._map_region)
+        self._map_marker = self.map_canvas.create_oval(0, 0, 0, 0, fill="#FFC107", outline="")
+
+    def _map_center(self, index):
+        x, y = self._map_cells[index]
+        return x * self.MAP_CELL, y * self.MAP_CELL
+
+    def _draw_map_room(self, index):
+        # Dessiner une salle découverte et ses passages vers les salles déjà découvertes
+        self._map_drawn.add(index)
+        x, y = self._map_center(index)
+        half = self.MAP_CELL * 0.35
+        self.map_canvas.create_rectangle(x - half, y - half, x + half, y + half,
+                                         fill="#2196F3", outline="#BBDEFB", tags="room")
+        for other in self._map_links[index]:
+            if other in self._map_drawn:
+                line = self.map_canvas.create_line(x, y, *self._map_center(other),
+                                                   fill="#78909C", width=2)
+                self.map_canvas.tag_lower(line, "room")
+
+    def _update_quest_panel(self):
+        # Seules les lignes des quêtes dont la révision a changé sont réécrites
+        manager = self.game.quest_manager
+        if manager is None:
+            return
+        if manager is not self._quest_manager or len(manager.quests) != len(self._quest_revisions):
+            self._quest_manager = manager
+            self.quest_tree.delete(*self.quest_tree.get_children())
+            self._quest_revisions = [None] * len(manager.quests)
+            for index in range(len(manager.quests)):
+                self.quest_tree.insert("", "end", iid=str(index))
+        for index, quest in enumerate(manager.quests):
+            if self._quest_revisions[index] != quest.revision:
+                self._quest_revisions[index] = quest.revision
+                self.quest_tree.item(str(index), text=quest.get_status())
+
+    def _on_quest_selected(self, _event=None):
+        # Double-clic : afficher les détails de la quête dans la console
+        selection = self.quest_tree.selection()
+        if selection and self._quest_manager is not None:
+            quest = self._quest_manager.quests[int(selection[0])]
+            self._send_command(f"quest {quest.title}")
+
+    def _show_game_over(self):
+        """Display final image or simple animation when the game ends."""
+        if getattr(self, '_game_over_shown', False):
+            return
+        self._game_over_shown = True
+
+        # Try to load an explicit gameover image from assets
+        assets_dir = Path(__file__).parent / 'assets'
+        # Accept PNG or PPM placeholders
+        gameover_path_png = assets_dir / 'gameover.png'
+        gameover_path_ppm = assets_dir / 'gameover.ppm'
+        self.canvas.delete("all")
+        chosen = None
+        if gameover_path_png.exists():
+            chosen = gameover_path_png
+        elif gameover_path_ppm.exists():
+            chosen = gameover_path_ppm
+        if chosen is not None:
+            try:
+                img = tk.PhotoImage(file=str(chosen))
+                self._image_ref = img
+                self.canvas.create_image(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2,
+                                         image=self._image_ref)
+                return
+            except Exception: # pylint: disable=broad-exception-caught
+                chosen = None
+        if chosen is None:
+            # Simple flashing red animation with final text
+            steps = 6
+            def flash(step=0):
+                if getattr(self.game, 'victory', False):
+                    color = "#2E7D32" if step % 2 == 0 else "#1B5E20" # Vert pour la victoire
+                    text_main = "VOUS AVEZ GAGNÉ !"
+                else:
+                    color = "#600" if step % 2 == 0 else "#300" # Rouge pour la défaite
+                    text_main = "VOUS AVEZ ÉTÉ DÉVORÉ"
+
+                self.canvas.delete("all")
+                self.canvas.create_rectangle(0, 0, self.IMAGE_WIDTH, self.IMAGE_HEIGHT, fill=color)
+                self.canvas.create_text(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2 - 10,
+                                        text=text_main, fill="white",
+                                        font=("Helvetica", 16, "bold"))
+                self.canvas.create_text(self.IMAGE_WIDTH/2, self.IMAGE_HEIGHT/2 + 30,
+                                        text="FIN", fill="white", font=("Helvetica", 14))
+                if step < steps:
+                    self.after(300, lambda: flash(step+1))
+                else:
+                    # keep final frame and write to output console
+                    self._write_output(f"\n--- {text_main}. PARTIE TERMINÉE ---\n")
+            flash()
+
+    def _on_close(self):
+        sys.stdout = self.old_stdout # Restaure la sortie vers le terminal
+        if self.game.autosaver:
+            self.game.autosaver.stop()
+        if self.game.journal:
+            self.game.journal.close()
+        try:
+            self.destroy()
+        except Exception: # pylint: disable=broad-exception-caught
+            pass
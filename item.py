@@ -1,9 +1,24 @@
 """
 Module Item - Gère les objets du jeu.
+
+Un Item est la définition d'un objet (nom, description, poids), partagée par
+toutes ses piles : les inventaires (room.Inventory) associent à chaque nom
+cette définition et un nombre d'exemplaires.
 """
 
+from texts import shared
+
 class Item:
-    """Représente un objet dans le jeu."""
+    """
+    Représente un objet dans le jeu (définition partagée par ses exemplaires).
+
+    Exemples:
+        >>> noix = Item("noix", "une noix de coco.", 1)
+        >>> noix.describe(1)
+        'noix : une noix de coco. (1 kg)'
+        >>> noix.describe(3)
+        'noix ×3 : une noix de coco. (1 kg chacun)'
+    """
     # pylint: disable=too-few-public-methods
     def __init__(self, name, description, weight):
         """
@@ -15,7 +30,7 @@ class Item:
             weight (int): Le poids de l'objet en kg
         """
         self.name = name
-        self.description = description
+        self.description = shared(description)
         self.weight = weight
         self.is_beamer = False
         self.charged_room = None
@@ -28,3 +43,17 @@ class Item:
         Returns: Une chaîne formatée avec le nom, la description et le poids
         """
         return f"{self.name} : {self.description} ({self.weight} kg)"
+
+    def describe(self, quantity=1):
+        """
+        Retourne la représentation textuelle d'une pile de `quantity` exemplaires.
+
+        Args:
+            quantity (int): Nombre d'exemplaires
+
+        Returns:
+            str: Comme str(item), avec la quantité s'il y a plusieurs exemplaires
+        """
+        if quantity == 1:
+            return str(self)
+        return f"{self.name} ×{quantity} : {self.description} ({self.weight} kg chacun)"
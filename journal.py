@@ -0,0 +1,220 @@
+"""
+Module Journal - Journal de commandes en ajout seul et reprise après crash.
+
+Chaque commande acceptée est ajoutée au journal de la session avec un numéro
+de tour et un horodatage monotone. Le journal complète les sauvegardes
+(savegame) : au redémarrage, la dernière sauvegarde est chargée puis la fin
+du journal est rejouée par-dessus pour reconstruire exactement la session.
+
+Les écritures sont tamponnées et synchronisées sur le disque (fsync) par
+groupes, pour ne pas payer un fsync à chaque commande.
+
+Le journal ne rejoue que les commandes d'un seul joueur, comme une sauvegarde
+n'en contient qu'un : il est suspendu tant que plusieurs joueurs partagent la
+partie (Game.add_player), puis repart d'une sauvegarde complète quand il n'en
+reste qu'un (Game.remove_player). Un crash pendant la partie à plusieurs
+reprend donc au départ du deuxième joueur.
+
+Format d'un enregistrement (little-endian) :
+    crc32 (4 octets) | taille (4) | type (1) | tour (8) | horodatage ns (8) | données
+
+Un enregistrement tronqué ou corrompu en fin de fichier (crash pendant une
+écriture) marque la fin du journal.
+"""
+
+import contextlib
+import io
+import os
+import struct
+import time
+import zlib
+
+import savegame
+
+JOURNAL_SUFFIX = ".journal"
+
+# Types d'enregistrement
+RECORD_SEED = 1      # Graine du générateur aléatoire à partir de ce tour
+RECORD_COMMAND = 2   # Commande acceptée
+
+_HEADER = struct.Struct("<IIBQQ")
+_CRC = struct.Struct("<I")
+
+
+class Journal:
+    """
+    Journal en ajout seul d'une session.
+
+    Attributs:
+        session (str): Nom de la session (nom de la sauvegarde associée)
+        path (Path): Fichier du journal
+        group_size (int): Nombre d'enregistrements avant un fsync
+        group_interval (float): Délai maximal (s) entre deux fsync
+    """
+
+    def __init__(self, session, group_size=16, group_interval=1.0):
+        """
+        Ouvrir (ou créer) le journal d'une session en ajout.
+
+        Args:
+            session (str): Nom de la session
+            group_size (int): Nombre d'enregistrements avant un fsync
+            group_interval (float): Délai maximal en secondes entre deux fsync
+        """
+        self.session = session
+        self.path = journal_path(session)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self._file = open(self.path, "ab")  # pylint: disable=consider-using-with
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _append(self, kind, turn, payload):
+        body = _HEADER.pack(0, len(payload), kind, turn, time.monotonic_ns())[4:] + payload
+        self._file.write(_CRC.pack(zlib.crc32(body)) + body)
+        self._pending += 1
+        if (self._pending >= self.group_size
+                or time.monotonic() - self._last_sync >= self.group_interval):
+            self.sync()
+
+    def append_seed(self, turn, seed):
+        """Enregistrer la graine du générateur aléatoire en vigueur après `turn`."""
+        self._append(RECORD_SEED, turn, seed.to_bytes(8, "little"))
+
+    def append_command(self, turn, command):
+        """Enregistrer la commande acceptée au tour `turn`."""
+        self._append(RECORD_COMMAND, turn, command.encode("utf-8"))
+
+    def sync(self):
+        """Vider le tampon et forcer l'écriture sur le disque (fsync)."""
+        if self._file.closed:
+            return
+        self._file.flush()
+        if self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def truncate(self):
+        """Vider le journal (après une sauvegarde complète)."""
+        self._file.seek(0)
+        self._file.truncate()
+        self._pending = 1  # Forcer le fsync de la troncature
+        self.sync()
+
+    def close(self):
+        """Synchroniser puis fermer le journal."""
+        self.sync()
+        self._file.close()
+
+
+def journal_path(session):
+    """Chemin du journal de la session `session` (à côté de sa sauvegarde)."""
+    return savegame.save_path(session).with_suffix(JOURNAL_SUFFIX)
+
+
+def read_journal(path):
+    """
+    Lire les enregistrements valides d'un journal.
+
+    S'arrête silencieusement au premier enregistrement tronqué ou corrompu.
+
+    Args:
+        path (Path): Le fichier du journal
+
+    Yields:
+        tuple: (type, tour, horodatage_ns, données)
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return
+    pos = 0
+    while pos + _HEADER.size <= len(data):
+        crc, size, kind, turn, timestamp = _HEADER.unpack_from(data, pos)
+        end = pos + _HEADER.size + size
+        if end > len(data) or zlib.crc32(data[pos + 4:end]) != crc:
+            return
+        payload = data[pos + _HEADER.size:end]
+        if kind == RECORD_SEED:
+            payload = int.from_bytes(payload, "little")
+        else:
+            payload = payload.decode("utf-8")
+        yield kind, turn, timestamp, payload
+        pos = end
+
+
+def replay(game, path):
+    """
+    Rejouer sur `game` les commandes du journal postérieures à son tour courant.
+
+    Les affichages des commandes rejouées sont masqués.
+
+    Args:
+        game (Game): Le jeu restauré depuis la dernière sauvegarde
+        path (Path): Le fichier du journal
+
+    Returns:
+        int: Le nombre de commandes rejouées
+    """
+    journal, game.journal = game.journal, None
+    replayed = 0
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for kind, turn, _timestamp, payload in read_journal(path):
+                if kind == RECORD_SEED and turn >= game.turn:
+                    game.reseed(payload)
+                elif kind == RECORD_COMMAND and turn > game.turn:
+                    game.process_command(payload)
+                    replayed += 1
+    finally:
+        game.journal = journal
+    return replayed
+
+
+def checkpoint(game):
+    """
+    Écrire une sauvegarde complète de la session puis repartir d'un journal vide.
+
+    Args:
+        game (Game): Le jeu dont la session est journalisée
+    """
+    journal = game.journal
+    savegame.save_game(game, journal.session)
+    # La reprise repart de cette sauvegarde : `undo` ne doit pas remonter plus loin
+    game.undo_log.clear()
+    journal.truncate()
+    journal.append_seed(game.turn, game.seed)
+    journal.sync()
+
+
+def open_session(game, session):
+    """
+    Démarrer ou reprendre une session journalisée.
+
+    Si la session existe, sa dernière sauvegarde est chargée et la fin du
+    journal rejouée. Sinon (ou si la partie reprise était terminée) le jeu est
+    configuré normalement. Une sauvegarde complète est ensuite écrite.
+
+    Args:
+        game (Game): Le jeu (setup() pas encore appelé)
+        session (str): Nom de la session
+
+    Returns:
+        int: Le nombre de commandes rejouées (0 pour une nouvelle session)
+    """
+    replayed = 0
+    if savegame.save_path(session).exists():
+        savegame.load_game(game, session)
+        replayed = replay(game, journal_path(session))
+        if game.finished:
+            # La partie enregistrée est terminée : on en recommence une
+            game.reset()
+            game.setup()
+            replayed = 0
+    else:
+        game.setup()
+    game.journal = Journal(session)
+    checkpoint(game)
+    return replayed
@@ -0,0 +1,165 @@
+"""
+Module Loadtest - Test de charge local de l'API HTTP/JSON (server.py).
+
+Le serveur est lancé dans un processus à part (un seul cœur : sa boucle
+asyncio tourne sur un thread). Des clients asyncio ouvrent chacun une
+connexion gardée ouverte (keep-alive), créent une partie, puis enchaînent
+les requêtes pendant la durée demandée : trois commandes pour une lecture de
+l'état. Chaque commande est choisie au hasard d'après l'état JSON renvoyé par
+la précédente (sorties, objets de la salle et de l'inventaire, personnages),
+sans jamais entrer dans la Forêt.
+
+Résultats : requêtes par seconde, requêtes par seconde de CPU du serveur
+(le débit d'un cœur), latences médiane et p99, réponses en erreur. Le code
+de sortie vaut 1 si une réponse n'est pas un succès.
+
+Utilisation:
+    python loadtest.py [--connections C] [--seconds S] [--port P] [--seed S]
+"""
+
+import asyncio
+import json
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+from server import DEFAULT_HOST
+
+DEFAULT_CONNECTIONS = 32
+DEFAULT_SECONDS = 5
+DEFAULT_PORT = 8766
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Salles où le client n'entre pas (défaite immédiate)
+AVOIDED_ROOMS = {"Forêt"}
+
+
+async def request(reader, writer, method, path, payload=None):
+    """
+    Envoyer une requête sur une connexion ouverte et lire la réponse.
+
+    Returns:
+        tuple: (code HTTP, réponse JSON)
+    """
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {DEFAULT_HOST}\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = next(int(line.split(":", 1)[1]) for line in lines
+                  if line.lower().startswith("content-length:"))
+    return status, json.loads(await reader.readexactly(length))
+
+
+def next_command(state, rng):
+    """Choisir une commande légale d'après l'état JSON de la partie."""
+    room = state["room"]
+    commands = ["look", "check", "quests"]
+    commands.extend(f"go {direction}" for direction, target in room["exits"].items()
+                    if target not in AVOIDED_ROOMS)
+    commands.extend(f"take {item['name']}" for item in room["items"])
+    commands.extend(f"drop {item['name']}" for item in state["inventory"])
+    commands.extend(f"talk {name}" for name in room["characters"])
+    return rng.choice(commands)
+
+
+async def client(port, deadline, seed, latencies, errors):
+    """Jouer une partie sur une connexion jusqu'à `deadline`."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(DEFAULT_HOST, port)
+    try:
+        status, reply = await request(reader, writer, "POST", "/sessions",
+                                      {"player": f"Client-{seed}", "seed": seed})
+        if status != 201:
+            errors.append(status)
+            return
+        session, state = reply["session"], reply["state"]
+        count = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if count % 4 == 3:
+                status, reply = await request(reader, writer, "GET", f"/sessions/{session}")
+                state = reply if status == 200 else state
+            else:
+                status, reply = await request(reader, writer, "POST",
+                                              f"/sessions/{session}/commands",
+                                              {"command": next_command(state, rng)})
+                state = reply["state"] if status == 200 else state
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            count += 1
+    finally:
+        writer.close()
+
+
+async def run_clients(port, connections, seconds, seed):
+    """Lancer les clients en parallèle et collecter latences et erreurs."""
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(client(port, deadline, seed + i, latencies, errors)
+                           for i in range(connections)))
+    return latencies, errors
+
+
+def start_server(port):
+    """Lancer server.py et attendre qu'il soit prêt."""
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "server.py", "--port", str(port)], cwd=HERE,
+        stdout=subprocess.PIPE, text=True, encoding="utf-8")
+    if not process.stdout.readline():
+        raise RuntimeError("le serveur ne s'est pas lancé")
+    return process
+
+
+def main():
+    """Point d'entrée : charger le serveur puis afficher le débit et les latences."""
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args and args.index(name) + 1 < len(args):
+            return int(args[args.index(name) + 1])
+        return default
+
+    connections = option("--connections", DEFAULT_CONNECTIONS)
+    seconds = option("--seconds", DEFAULT_SECONDS)
+    port = option("--port", DEFAULT_PORT)
+    seed = option("--seed", 0)
+
+    process = start_server(port)
+    try:
+        before = os.times()
+        start = time.perf_counter()
+        latencies, errors = asyncio.run(run_clients(port, connections, seconds, seed))
+        elapsed = time.perf_counter() - start
+    finally:
+        process.send_signal(signal.SIGINT)
+        process.wait()
+    # Temps CPU du serveur : compté pour le processus parent une fois le serveur arrêté
+    after = os.times()
+    server_cpu = (after.children_user - before.children_user
+                  + after.children_system - before.children_system)
+
+    total = len(latencies)
+    print(f"{connections} connexions, {total} requêtes en {elapsed:.2f}s "
+          f"({total / elapsed:.0f} requêtes/s)")
+    if server_cpu > 0:
+        print(f"CPU du serveur : {server_cpu:.2f}s ({total / server_cpu:.0f} requêtes "
+              "par seconde de CPU, un seul cœur)")
+    if latencies:
+        latencies.sort()
+        print(f"latence médiane {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    if errors:
+        print(f"{len(errors)} réponses en erreur (codes {sorted(set(errors))}).")
+        sys.exit(1)
+    print("Aucune erreur.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Module Minimap - Disposition de la carte du monde, calculée depuis les sorties.
+
+Chaque salle reçoit une case (x, y) d'une grille : on part de la première
+salle et on suit les sorties, une case plus loin dans la direction de la
+sortie (N vers le haut, E vers la droite...). Les sorties N, S, E et O sont
+suivies en priorité ; U et D (en diagonale) ne servent qu'à rejoindre un
+étage qui n'est pas relié autrement. Si la case visée est déjà prise, la
+salle va dans la case libre la plus proche.
+
+La disposition ne dépend que du graphe des sorties : elle est calculée une
+fois par monde puis gardée sur le disque (CACHE_DIR), sous une empreinte des
+noms et des sorties des salles. Un monde déjà vu n'est plus recalculé.
+
+Exemples:
+
+>>> from room import Room
+>>> beach, cove, lagoon = Room("Beach", "."), Room("Cove", "."), Room("Lagoon", ".")
+>>> beach.exits = {"O": cove}
+>>> cove.exits = {"E": beach, "N": lagoon}
+>>> lagoon.exits = {"S": cove}
+>>> layout([beach, cove, lagoon])
+[(0, 0), (-1, 0), (-1, -1)]
+>>> world_key([beach, cove, lagoon]) == world_key([beach, cove, lagoon])
+True
+"""
+
+import hashlib
+import os
+from array import array
+from collections import deque
+
+import savegame
+
+# Dossier des dispositions déjà calculées
+CACHE_DIR = savegame.SAVE_DIR / "maps"
+CACHE_SUFFIX = ".map"
+
+# Déplacement sur la grille pour chaque direction (y vers le bas)
+DIRECTION_OFFSETS = {
+    "N": (0, -1), "S": (0, 1), "E": (1, 0), "O": (-1, 0),
+    "U": (1, -1), "D": (-1, 1),
+}
+# Directions suivies en priorité (les autres relient des étages)
+PLANAR_DIRECTIONS = ("N", "S", "E", "O")
+
+
+def world_key(rooms):
+    """
+    Empreinte du graphe des sorties (noms des salles et sorties).
+
+    Args:
+        rooms (list): Les salles du monde
+
+    Returns:
+        str: L'empreinte (hexadécimal)
+    """
+    indices = {id(room): index for index, room in enumerate(rooms)}
+    digest = hashlib.blake2b(digest_size=16)
+    for room in rooms:
+        digest.update(room.name.encode())
+        for direction, target in room.exits.items():
+            if target is not None:
+                digest.update(f"|{direction}{indices.get(id(target), -1)}".encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _free_cell(taken, cell):
+    """Case libre la plus proche de `cell` (anneaux de plus en plus grands)."""
+    if cell not in taken:
+        return cell
+    x, y = cell
+    radius = 1
+    while True:
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                if max(abs(dx), abs(dy)) == radius and (x + dx, y + dy) not in taken:
+                    return x + dx, y + dy
+        radius += 1
+
+
+def layout(rooms):
+    """
+    Calculer la case de chaque salle.
+
+    Args:
+        rooms (list): Les salles du monde (la première est placée en (0, 0))
+
+    Returns:
+        list: La case (x, y) de chaque salle, dans l'ordre de `rooms`
+    """
+    indices = {id(room): index for index, room in enumerate(rooms)}
+    cells = [None] * len(rooms)
+    taken = set()
+    for root in range(len(rooms)):
+        if cells[root] is not None:
+            continue
+        # Salle non reliée aux précédentes : à droite de ce qui est déjà placé
+        start = (max((x for x, _ in taken), default=-2) + 2, 0)
+        planar, vertical = deque([(root, start)]), deque()
+        while planar or vertical:
+            index, wanted = planar.popleft() if planar else vertical.popleft()
+            if cells[index] is not None:
+                continue
+            x, y = cells[index] = _free_cell(taken, wanted)
+            taken.add(cells[index])
+            for direction, target in rooms[index].exits.items():
+                target = indices.get(id(target)) if target is not None else None
+                if target is None or cells[target] is not None:
+                    continue
+                dx, dy = DIRECTION_OFFSETS.get(direction, (1, 1))
+                queue = planar if direction in PLANAR_DIRECTIONS else vertical
+                queue.append((target, (x + dx, y + dy)))
+    return cells
+
+
+def cached_layout(rooms, cache_dir=None):
+    """
+    Disposition du monde, lue sur le disque si elle a déjà été calculée.
+
+    Args:
+        rooms (list): Les salles du monde
+        cache_dir (Path, optional): Dossier des dispositions (défaut: CACHE_DIR)
+
+    Returns:
+        list: La case (x, y) de chaque salle (voir layout)
+    """
+    path = (cache_dir or CACHE_DIR) / f"{world_key(rooms)}{CACHE_SUFFIX}"
+    coordinates = array("i")
+    try:
+        with open(path, "rb") as file:
+            coordinates.frombytes(file.read())
+    except OSError:
+        pass
+    if len(coordinates) == 2 * len(rooms):
+        return list(zip(coordinates[::2], coordinates[1::2]))
+
+    cells = layout(rooms)
+    coordinates = array("i", (value for cell in cells for value in cell))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(coordinates.tobytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Sans cache, la disposition sera recalculée au prochain lancement
+    return cells
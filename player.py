@@ -8,8 +8,21 @@ Elle gère:
 - L'inventaire et la limite de poids
 - Les récompenses obtenues
 - Le mouvement dans le monde
+- Les messages reçus des autres joueurs (monde partagé)
 """
 
+from array import array
+from collections import deque
+
+import events
+import undo
+from room import Inventory
+
+# Nombre de salles mémorisées pour la commande `back`
+HISTORY_LIMIT = 64
+# Nombre de messages gardés en attente de lecture
+INBOX_LIMIT = 64
+
 
 class Player:
     """
@@ -17,11 +30,16 @@ class Player:
     
     Attributs:
         name (str): Le nom du joueur
-        current_room (Room): La salle actuelle du joueur
-        history (list): Historique des salles visitées
-        inventory (dict): Dictionnaire des items possédés
+        current_room (Room): La salle actuelle du joueur (tenue à jour dans Room.players)
+        history (deque): Dernières salles quittées (bornée à HISTORY_LIMIT, pour `back`)
+        visit_counts (array): Nombre de passages par indice de salle
+        visit_order (array): Indices des salles dans l'ordre de première visite
+        rooms (list): Salles du monde, pour retrouver une salle par son indice
+        inventory (Inventory): Piles d'items possédés (nom -> Item, avec quantités)
         max_weight (float): Poids maximum transportable (10 kg)
         rewards (list): Liste des récompenses obtenues
+        quest_manager (QuestManager): Les quêtes du joueur et leur progression
+        inbox (deque): Messages reçus des autres joueurs, non encore lus
         
     Exemples:
         >>> player = Player("Capitaine")
@@ -43,12 +61,71 @@ class Player:
             raise ValueError("Le nom du joueur doit être une chaîne non vide")
 
         self.name = name.strip()
-        self.current_room = None
-        self.history = []  # Historique des salles visitées
+        self._current_room = None
+        self.history = deque(maxlen=HISTORY_LIMIT)  # Dernières salles quittées
+        self.visit_counts = array("I")
+        self.visit_order = array("I")
+        self.rooms = []
         self.inventory = {}
         self.max_weight = 5
         self.rewards = []  # Récompenses obtenues
         self.endgame_ready = False
+        self.quest_manager = None
+        self.inbox = deque(maxlen=INBOX_LIMIT)
+
+    @property
+    def inventory(self):
+        """Inventory: Les piles d'objets du joueur."""
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, inventory):
+        self._inventory = Inventory(items=inventory)
+
+    @property
+    def current_room(self):
+        """Room: La salle actuelle du joueur."""
+        return self._current_room
+
+    @current_room.setter
+    def current_room(self, room):
+        # Chaque salle connaît les joueurs présents (diffusion des événements)
+        if self._current_room is not None:
+            self._current_room.players.pop(self.name, None)
+        if room is not None:
+            room.players[self.name] = self
+        self._current_room = room
+
+    def notify(self, message):
+        """
+        Recevoir un message d'un autre joueur ou du monde.
+
+        Args:
+            message (str): Le message
+
+        Exemples:
+            >>> player = Player("Capitaine")
+            >>> player.notify("Anne arrive.")
+            >>> player.read_messages()
+            ['Anne arrive.']
+            >>> player.read_messages()
+            []
+        """
+        self.inbox.append(message)
+
+    def read_messages(self):
+        """
+        Lire (et vider) les messages en attente.
+
+        Returns:
+            list: Les messages, du plus ancien au plus récent
+        """
+        # popleft plutôt que clear : un message déposé entre-temps par un
+        # autre thread n'est pas perdu
+        messages = []
+        while self.inbox:
+            messages.append(self.inbox.popleft())
+        return messages
 
     def print_state(self):
         """Affiche la description de la salle courante et l'historique."""
@@ -93,10 +170,14 @@ class Player:
             return False
 
         # Ajouter la salle actuelle à l'historique
+        dropped = self.history[0] if len(self.history) == self.history.maxlen else None
+        undo.record(self.undo_move, self.current_room, dropped)
         self.history.append(self.current_room)
+        self.record_visit(self.current_room)
 
         # Déplacer le joueur
         self.current_room = next_room
+        events.emit(events.PlayerMoved, self.name, self.history[-1].name, next_room.name)
 
         # Si on entre dans la forêt (mort immédiate),
         # on n'affiche pas les infos de la salle ni l'historique
@@ -141,13 +222,94 @@ class Player:
             return False
 
         # Revenir à la dernière salle visitée
+        undo.record(self.undo_back, self.current_room)
+        left_room = self.current_room
         self.current_room = self.history.pop()
+        events.emit(events.PlayerMoved, self.name, left_room.name, self.current_room.name)
         self.print_state()
         return True
 
+    def undo_move(self, room, dropped=None):
+        """
+        Annuler un déplacement fait par move() (opération inverse, voir undo).
+
+        Args:
+            room (Room): La salle quittée
+            dropped (Room): La salle sortie de l'historique plein par le déplacement
+
+        Exemples:
+            >>> from room import Room
+            >>> player = Player("Capitaine")
+            >>> beach, cove = Room("Beach", "une plage"), Room("Cove", "une crique")
+            >>> beach.index, cove.index = 0, 1
+            >>> beach.exits = {"E": cove}
+            >>> player.current_room = beach
+            >>> player.move("E", silent=True)
+            True
+            >>> player.undo_move(beach)
+            >>> player.current_room.name, list(player.history), list(player.visit_order)
+            ('Beach', [], [])
+        """
+        self.history.pop()
+        if dropped is not None:
+            self.history.appendleft(dropped)
+        index = getattr(room, "index", None)
+        if index is not None:
+            self.visit_counts[index] -= 1
+            if not self.visit_counts[index]:
+                self.visit_order.pop()
+        self.current_room = room
+
+    def undo_back(self, room):
+        """
+        Annuler un retour fait par back() (opération inverse, voir undo).
+
+        Args:
+            room (Room): La salle quittée par back()
+        """
+        self.history.append(self.current_room)
+        self.current_room = room
+
+    def record_visit(self, room):
+        """
+        Compter un passage dans une salle (mémoire constante par déplacement).
+
+        Args:
+            room (Room): La salle quittée
+
+        Exemples:
+            >>> from room import Room
+            >>> player = Player("Capitaine")
+            >>> beach = Room("Beach", "une plage")
+            >>> beach.index = 0
+            >>> player.rooms = [beach]
+            >>> player.record_visit(beach)
+            >>> player.record_visit(beach)
+            >>> list(player.visit_counts), list(player.visit_order)
+            ([2], [0])
+        """
+        index = getattr(room, "index", None)
+        if index is None:
+            return
+        counts = self.visit_counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        if not counts[index]:
+            self.visit_order.append(index)
+        counts[index] += 1
+
+    def clear_history(self):
+        """Oublier l'historique des déplacements et les compteurs de visites."""
+        self.history.clear()
+        self.visit_counts = array("I")
+        self.visit_order = array("I")
+
     def get_history(self):
         """
-        Obtenir une représentation textuelle de l'historique des salles.
+        Obtenir une représentation textuelle des salles déjà visitées.
+
+        Chaque salle n'apparaît qu'une fois, dans l'ordre de première visite,
+        avec son nombre de passages.
         
         Returns:
             str: Chaîne listant les salles visitées (vide si aucune visite)
@@ -156,11 +318,16 @@ class Player:
             >>> player.get_history()
             'Vous avez déjà visité les pièces suivantes:\\n    - une plage...'
         """
-        if not self.history:
+        if not self.visit_order:
             return ""
         lines = ["📍 Vous avez déjà visité les pièces suivantes:"]
-        for room in self.history:
-            lines.append(f"    - {room.description}")
+        # Un monde chargé à la demande lit la description sans construire la salle
+        describe = getattr(self.rooms, "room_description", None)
+        for index in self.visit_order:
+            count = self.visit_counts[index]
+            suffix = f" (×{count})" if count > 1 else ""
+            description = describe(index) if describe else self.rooms[index].description
+            lines.append(f"    - {description}{suffix}")
         return "\n".join(lines)
 
     def get_inventory(self):
@@ -182,22 +349,24 @@ class Player:
         if not self.inventory:
             return "📭 Votre inventaire est vide."
 
-        current_weight = sum(i.weight for i in self.inventory.values())
+        current_weight = self.inventory.weight()
         remaining = self.max_weight - current_weight
 
         msg = "📦 Vous disposez des items suivants :\n"
-        msg += "\n".join(f"    - {item}" for item in self.inventory.values())
+        msg += "\n".join(f"    - {item.describe(quantity)}"
+                         for item, quantity in self.inventory.stacks())
         msg += "\n"
         msg += (f"\n💪 Poids : {current_weight:.1f} kg / {self.max_weight} kg "
                 f"(Reste : {remaining:.1f} kg)")
         return msg
 
-    def add_reward(self, reward):
+    def add_reward(self, reward, effects=()):
         """
         Ajouter une récompense au joueur.
         
         Args:
             reward (str): Description de la récompense
+            effects (tuple): Ses effets, résolus par rewards.resolve (aucun par défaut)
             
         Affiche un message de confirmation.
         
@@ -212,25 +381,12 @@ class Player:
             print("\n❌ Erreur: La récompense doit être une chaîne non vide.\n")
             return
 
+        undo.record(self.rewards.pop)
         self.rewards.append(reward)
         print(f"\n🎁 Vous avez reçu : {reward}\n")
 
-        if "Sac à dos moyen" in reward:
-            self.max_weight += 5
-            print(f"💪 Votre capacité d'inventaire augmente de 5kg ! (Total: {self.max_weight}kg)")
-        elif "Grand sac à dos" in reward:
-            self.max_weight += 10
-            print(f"💪 Votre capacité d'inventaire augmente de 10kg ! (Total: {self.max_weight}kg)")
-
-        if "Beamer" in reward:
-            from item import Item # pylint: disable=import-outside-toplevel
-            beamer = Item("beamer", "un appareil de téléportation mystérieux.", 0)
-            beamer.is_beamer = True
-            if hasattr(self, 'starting_room'):
-                beamer.saved_room = self.starting_room
-                beamer.fixed_destination = True
-            self.inventory["beamer"] = beamer
-            print("✨ Vous obtenez le Beamer ! Il vous ramènera toujours au point de départ.")
+        for handler, args in effects:
+            handler(self, *args)
 
     def get_rewards(self):
         """
@@ -1,4 +1,24 @@
-""" Define the Quest class"""
+"""
+Define the Quest and QuestManager classes.
+
+Rendered quest lines are cached per quest: every change of progress gives the
+quest a new `revision` (unique, never reused, restored by undo), and a cached
+line is reused as long as its revision matches. Listing hundreds of quests
+only renders the ones that changed, and the list is shown one page at a time
+(QUESTS_PER_PAGE).
+"""
+
+import itertools
+
+import events
+import undo
+
+# Number of quests listed per page by `quests`
+QUESTS_PER_PAGE = 20
+
+# Source of quest revisions (never reused, so an undone change is never mistaken
+# for a later one)
+_revisions = itertools.count()
 
 class Quest:
     """
@@ -12,6 +32,9 @@ class Quest:
         is_completed (bool): Whether the quest is completed.
         is_active (bool): Whether the quest is currently active.
         reward (str): Optional reward for completing the quest.
+        effects (tuple): What the reward does, resolved when the quests load
+                         (see rewards.resolve).
+        revision (int): Changes whenever the progress changes.
     """
 
 
@@ -44,6 +67,16 @@ class Quest:
         self.is_completed = False
         self.is_active = False
         self.reward = reward
+        self.effects = ()
+        self.revision = next(_revisions)
+        self._status_cache = None   # (revision, text)
+        self._details_cache = None  # (revision, counters, text)
+
+
+    def _touch(self):
+        """Give the quest a new revision (its rendered lines are out of date)."""
+        undo.record_attribute(self, "revision")
+        self.revision = next(_revisions)
 
 
     def activate(self):
@@ -59,7 +92,9 @@ class Quest:
         >>> quest.is_active
         True
         """
+        undo.record_attribute(self, "is_active")
         self.is_active = True
+        self._touch()
 
 
     def complete_objective(self, objective, player=None):
@@ -86,7 +121,11 @@ class Quest:
         False
         """
         if objective in self.objectives and objective not in self.completed_objectives:
+            undo.record(self.completed_objectives.remove, objective)
             self.completed_objectives.append(objective)
+            self._touch()
+            events.emit(events.QuestObjectiveCompleted, getattr(player, "name", None),
+                        self.title, objective)
 
             # Check if all objectives are completed
             if len(self.completed_objectives) == len(self.objectives):
@@ -113,10 +152,14 @@ class Quest:
         True
         """
         if not self.is_completed:
+            undo.record_attribute(self, "is_completed")
             self.is_completed = True
+            self._touch()
+            events.emit(events.QuestCompleted, getattr(player, "name", None),
+                        self.title, self.reward)
             if self.reward:
                 if player:
-                    player.add_reward(self.reward)
+                    player.add_reward(self.reward, self.effects)
 
 
     def get_status(self):
@@ -139,13 +182,19 @@ class Quest:
         >>> quest.get_status()
         '⏳ Collect (1/2 objectifs)'
         """
+        cached = self._status_cache
+        if cached is not None and cached[0] == self.revision:
+            return cached[1]
         if not self.is_active:
-            return f"❓ {self.title} (Non activée)"
-        if self.is_completed:
-            return f"✅ {self.title} (Terminée)"
-        completed_count = len(self.completed_objectives)
-        total_count = len(self.objectives)
-        return f"⏳ {self.title} ({completed_count}/{total_count} objectifs)"
+            status = f"❓ {self.title} (Non activée)"
+        elif self.is_completed:
+            status = f"✅ {self.title} (Terminée)"
+        else:
+            completed_count = len(self.completed_objectives)
+            total_count = len(self.objectives)
+            status = f"⏳ {self.title} ({completed_count}/{total_count} objectifs)"
+        self._status_cache = (self.revision, status)
+        return status
 
 
     def get_details(self, current_counts=None):
@@ -167,20 +216,26 @@ class Quest:
         True
         >>> "Progression: 5/10" in details
         True
+        >>> quest.get_details({"Se déplacer": 5}) is details
+        True
         """
-        details = f"\n📋 Quête: {self.title}\n"
-        details += f"📖 {self.description}\n"
+        counters = tuple(current_counts.items()) if current_counts else ()
+        cached = self._details_cache
+        if cached is not None and cached[0] == self.revision and cached[1] == counters:
+            return cached[2]
 
+        lines = [f"\n📋 Quête: {self.title}", f"📖 {self.description}"]
         if self.objectives:
-            details += "\nObjectifs:\n"
+            lines.append("\nObjectifs:")
             for objective in self.objectives:
                 status = "✅" if objective in self.completed_objectives else "⬜"
                 objective_text = self._format_objective_with_progress(objective, current_counts)
-                details += f"  {status} {objective_text}\n"
-
+                lines.append(f"  {status} {objective_text}")
         if self.reward:
-            details += f"\n🎁 Récompense: {self.reward}\n"
+            lines.append(f"\n🎁 Récompense: {self.reward}")
+        details = "\n".join(lines) + "\n"
 
+        self._details_cache = (self.revision, counters, details)
         return details
 
     def _format_objective_with_progress(self, objective, current_counts):
@@ -392,6 +447,48 @@ class QuestManager:
         self.quests.append(quest)
 
 
+    def copy_for(self, player):
+        """
+        Copy every quest, with its current progress, into a new manager.
+
+        Used to give each player of a shared world their own quest progress.
+
+        Args:
+            player: The player owning the new manager.
+
+        Returns:
+            QuestManager: The new manager.
+
+        Examples:
+
+        >>> manager = QuestManager()
+        >>> manager.add_quest(Quest("Quest 1", "First quest", ["Visiter Beach"]))
+        >>> manager.activate_quest("Quest 1")
+        True
+        >>> other = manager.copy_for(None)
+        >>> other.active_quests[0].title, other.active_quests[0] is manager.quests[0]
+        ('Quest 1', False)
+        """
+        manager = QuestManager(player)
+        copies = {}
+        for quest in self.quests:
+            copy = Quest(quest.title, quest.description, list(quest.objectives), quest.reward)
+            copy.effects = quest.effects
+            copy.completed_objectives = list(quest.completed_objectives)
+            copy.is_completed = quest.is_completed
+            copy.is_active = quest.is_active
+            copies[id(quest)] = copy
+            manager.add_quest(copy)
+        manager.active_quests = [copies[id(quest)] for quest in self.active_quests]
+        return manager
+
+
+    def _retire(self, quest):
+        """Remove a completed quest from the active list (undoable)."""
+        undo.record(self.active_quests.insert, self.active_quests.index(quest), quest)
+        self.active_quests.remove(quest)
+
+
     def activate_quest(self, quest_title):
         """
         Activate a quest by its title.
@@ -417,6 +514,7 @@ class QuestManager:
         for quest in self.quests:
             if quest.title == quest_title and not quest.is_active:
                 quest.activate()
+                undo.record(self.active_quests.remove, quest)
                 self.active_quests.append(quest)
                 return True
         return False
@@ -448,7 +546,7 @@ class QuestManager:
             if quest.complete_objective(objective_text):
                 # Remove completed quests from active list
                 if quest.is_completed:
-                    self.active_quests.remove(quest)
+                    self._retire(quest)
                 return True
         return False
 
@@ -474,7 +572,7 @@ class QuestManager:
         for quest in self.active_quests[:]:  # Use slice to avoid modification during iteration
             quest.check_room_objective(room_name, self.player)
             if quest.is_completed:
-                self.active_quests.remove(quest)
+                self._retire(quest)
 
 
     def check_action_objectives(self, action, target=None):
@@ -499,7 +597,7 @@ class QuestManager:
         for quest in self.active_quests[:]:
             quest.check_action_objective(action, target, self.player)
             if quest.is_completed:
-                self.active_quests.remove(quest)
+                self._retire(quest)
 
 
     def check_counter_objectives(self, counter_name, current_count):
@@ -527,7 +625,7 @@ class QuestManager:
         for quest in self.active_quests[:]:
             quest.check_counter_objective(counter_name, current_count, self.player)
             if quest.is_completed:
-                self.active_quests.remove(quest)
+                self._retire(quest)
 
 
     def get_active_quests(self):
@@ -601,10 +699,16 @@ class QuestManager:
         return None
 
 
-    def show_quests(self):
+    def show_quests(self, page=1):
         """
-        Display all quests and their status.
-        
+        Display the quests of one page and their status.
+
+        Args:
+            page (int): The page to display (QUESTS_PER_PAGE quests per page).
+
+        Returns:
+            bool: False if the page does not exist, True otherwise.
+
         Examples:
         
         >>> manager = QuestManager()
@@ -612,6 +716,7 @@ class QuestManager:
         <BLANKLINE>
         Aucune quête disponible.
         <BLANKLINE>
+        True
         >>> quest = Quest("Display Quest", "Test display")
         >>> manager.add_quest(quest)
         >>> manager.show_quests() # doctest: +NORMALIZE_WHITESPACE
@@ -619,15 +724,38 @@ class QuestManager:
         📋 Liste des quêtes:
         Display Quest (Non activée)
         <BLANKLINE>
+        True
+        >>> for i in range(QUESTS_PER_PAGE):
+        ...     manager.add_quest(Quest(f"Q{i}", "Filler"))
+        >>> manager.show_quests(2) # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        📋 Liste des quêtes (page 2/2):
+        ❓ Q19 (Non activée)
+        <BLANKLINE>
+        True
+        >>> manager.show_quests(3)
+        <BLANKLINE>
+        Page 3 inexistante (2 pages).
+        <BLANKLINE>
+        False
         """
         if not self.quests:
             print("\nAucune quête disponible.\n")
-            return
+            return True
 
-        print("\n📋 Liste des quêtes:")
-        for quest in self.quests:
-            print(f"  {quest.get_status()}")
-        print()
+        pages = (len(self.quests) + QUESTS_PER_PAGE - 1) // QUESTS_PER_PAGE
+        if not 1 <= page <= pages:
+            print(f"\nPage {page} inexistante ({pages} pages).\n")
+            return False
+
+        start = (page - 1) * QUESTS_PER_PAGE
+        lines = ["\n📋 Liste des quêtes:" if pages == 1
+                 else f"\n📋 Liste des quêtes (page {page}/{pages}):"]
+        lines.extend(f"  {quest.get_status()}" for quest in self.quests[start:start + QUESTS_PER_PAGE])
+        if page < pages:
+            lines.append(f"  ➡️ Suite : 'quests {page + 1}'")
+        print("\n".join(lines) + "\n")
+        return True
 
 
     def show_quest_details(self, quest_title, current_counts=None):
@@ -0,0 +1,114 @@
+"""
+Module Rewards - Effets des récompenses de quêtes, déclarés par le monde.
+
+Chaque monde déclare ce que font ses récompenses (Game.reward_effects) :
+identifiant de la récompense (le texte de Quest.reward) -> liste d'effets
+(sorte, paramètres...). Une récompense sans effet déclaré est seulement
+ajoutée à la liste des récompenses du joueur.
+
+Les sortes d'effets sont enregistrées dans EFFECTS avec le décorateur
+`effect` :
+    - ("capacity", kg) : augmente la capacité de l'inventaire
+    - ("item", nom, description, poids[, quantité]) : donne un objet
+    - ("beamer",) : donne le beamer, programmé pour le point de départ
+
+Les effets de chaque quête sont résolus une fois, au chargement des quêtes
+(Game.setup) : une sorte inconnue est signalée à ce moment-là, et accorder
+une récompense n'est plus qu'une suite d'appels.
+
+Exemples:
+
+>>> from player import Player
+>>> player = Player("Anne")
+>>> effects = resolve({"Sac (+5kg)": [("capacity", 5)]}, "Sac (+5kg)")
+>>> weight = player.max_weight
+>>> player.add_reward("Sac (+5kg)", effects)  # doctest: +ELLIPSIS
+<BLANKLINE>
+🎁 Vous avez reçu : Sac (+5kg)
+<BLANKLINE>
+💪 Votre capacité d'inventaire augmente de 5kg ! (Total: ...kg)
+>>> player.max_weight - weight
+5
+
+Les effets s'annulent avec le tour qui les a donnés (commande `undo`) :
+
+>>> import contextlib, io
+>>> log = undo.UndoLog()
+>>> with log.turn(), contextlib.redirect_stdout(io.StringIO()):
+...     player.add_reward("Beamer", resolve({"Beamer": [("beamer",)]}, "Beamer"))
+>>> "beamer" in player.inventory, log.undo(), "beamer" in player.inventory
+(True, 1, False)
+>>> player.rewards
+['Sac (+5kg)']
+>>> resolve({}, "Pièce d'or")
+()
+>>> resolve({"Cape": [("voler",)]}, "Cape")
+Traceback (most recent call last):
+    ...
+ValueError: Effet de récompense inconnu : 'voler' (récompense 'Cape')
+"""
+
+import undo
+from beamer import DEFAULT_SLOT, Beamer
+from item import Item
+
+# Sorte d'effet -> fonction(joueur, *paramètres)
+EFFECTS = {}
+
+
+def effect(kind):
+    """Enregistrer une fonction comme effet de la sorte `kind`."""
+    def register(handler):
+        EFFECTS[kind] = handler
+        return handler
+    return register
+
+
+@effect("capacity")
+def increase_capacity(player, kilograms):
+    """Augmenter la capacité de l'inventaire du joueur."""
+    undo.record_attribute(player, "max_weight")
+    player.max_weight += kilograms
+    print(f"💪 Votre capacité d'inventaire augmente de {kilograms}kg ! "
+          f"(Total: {player.max_weight}kg)")
+
+
+@effect("item")
+def grant_item(player, name, description, weight, quantity=1):
+    """Donner `quantity` exemplaires d'un objet au joueur."""
+    undo.add_items(player.inventory, Item(name, description, weight), quantity)
+    print(f"🎒 Vous obtenez : {name}" + (f" (x{quantity})" if quantity > 1 else ""))
+
+
+@effect("beamer")
+def unlock_beamer(player):
+    """Donner au joueur le beamer, programmé pour le point de départ."""
+    beamer = Beamer()
+    if hasattr(player, 'starting_room'):
+        # Programmé pour le point de départ : l'emplacement ne se recharge pas
+        beamer = Beamer({DEFAULT_SLOT: player.starting_room}, locked=(DEFAULT_SLOT,))
+    undo.set_entry(player.inventory, "beamer", beamer)
+    print("✨ Vous obtenez le Beamer ! Il vous ramènera toujours au point de départ.")
+
+
+def resolve(reward_effects, reward):
+    """
+    Trouver les effets d'une récompense.
+
+    Args:
+        reward_effects (dict): Effets déclarés par le monde (identifiant -> effets)
+        reward (str): Identifiant de la récompense (None si aucune)
+
+    Returns:
+        tuple: Paires (fonction, paramètres), à appliquer dans l'ordre
+
+    Raises:
+        ValueError: Si une sorte d'effet n'est pas enregistrée dans EFFECTS
+    """
+    resolved = []
+    for kind, *args in reward_effects.get(reward, ()) if reward else ():
+        handler = EFFECTS.get(kind)
+        if handler is None:
+            raise ValueError(f"Effet de récompense inconnu : '{kind}' (récompense '{reward}')")
+        resolved.append((handler, tuple(args)))
+    return tuple(resolved)
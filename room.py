@@ -3,8 +3,219 @@
 Module Room - Gère les lieux du jeu.
 
 Ce module contient la classe Room qui représente un lieu dans le jeu.
+
+Les textes affichés (sorties, description longue, contenu du lieu) sont mis
+en cache par lieu et ne sont reconstruits que lorsque les sorties, l'inventaire
+ou les personnages du lieu changent réellement.
 """
 
+from texts import shared
+
+# Blocs de texte invalidés par la modification de chaque dictionnaire
+_EXITS_BLOCKS = ("exits", "long")
+_INVENTORY_BLOCKS = ("contents",)
+_CHARACTERS_BLOCKS = ("long", "contents")
+
+
+class WatchedDict(dict):
+    """
+    Dictionnaire qui invalide des blocs du cache de sa salle à chaque modification.
+
+    Exemples:
+
+    >>> room = Room("Cave", "une grotte")
+    >>> room.get_exit_string()
+    'Sorties :'
+    >>> room.exits["N"] = Room("Cliff", "une falaise")
+    >>> room.get_exit_string()
+    'Sorties : N'
+    """
+
+    __slots__ = ("_cache", "_blocks", "_tracker")
+
+    def __init__(self, cache, blocks, *args, tracker=None):
+        super().__init__(*args)
+        self._cache = cache
+        self._blocks = blocks
+        # (ensemble, clé) : la clé est ajoutée à l'ensemble à chaque modification
+        self._tracker = tracker
+
+    def bind(self, cache, blocks):
+        """Rattacher le dictionnaire aux blocs `blocks` du cache `cache` d'une salle."""
+        self._cache = cache
+        self._blocks = blocks
+        self.changed()
+
+    def changed(self):
+        """Invalider les blocs de texte qui dépendent de ce dictionnaire."""
+        for block in self._blocks:
+            self._cache.pop(block, None)
+        if self._tracker is not None:
+            touched, key = self._tracker
+            touched.add(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.changed()
+
+    def clear(self):
+        super().clear()
+        self.changed()
+
+
+class Inventory(WatchedDict):
+    """
+    Inventaire en piles : nom -> définition de l'objet (Item), avec une quantité par nom.
+
+    La définition d'un objet (nom, description, poids) est partagée par toutes
+    ses piles, dans tous les inventaires ; une pile ne coûte qu'une entrée du
+    dictionnaire et un compteur, quel que soit le nombre d'exemplaires.
+    Ajouter un objet déjà présent agrandit sa pile.
+
+    Attributs:
+        quantities (dict): nom -> nombre d'exemplaires
+
+    Exemples:
+
+    >>> from item import Item
+    >>> noix = Item("noix", "une noix de coco.", 1)
+    >>> bag = Inventory()
+    >>> bag.add(noix, 3)
+    3
+    >>> bag.remove("noix", 2) is noix, bag.quantity("noix"), bag.weight()
+    (True, 1, 1)
+    >>> _ = bag.remove("noix")
+    >>> "noix" in bag, bag.quantity("noix")
+    (False, 0)
+    """
+
+    __slots__ = ("quantities",)
+
+    def __init__(self, cache=None, blocks=(), items=(), tracker=None):
+        super().__init__(cache, blocks, items, tracker=tracker)
+        if isinstance(items, Inventory):
+            self.quantities = dict(items.quantities)
+        else:
+            self.quantities = dict.fromkeys(self, 1)
+
+    def __setitem__(self, name, item):
+        self.quantities.setdefault(name, 1)
+        super().__setitem__(name, item)
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        del self.quantities[name]
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.quantities.pop(args[0], None)
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        del self.quantities[item[0]]
+        return item
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        for name in self:
+            self.quantities.setdefault(name, 1)
+
+    def clear(self):
+        super().clear()
+        self.quantities.clear()
+
+    def quantity(self, name):
+        """Nombre d'exemplaires de `name` (0 si absent)."""
+        return self.quantities.get(name, 0)
+
+    def stacks(self):
+        """Liste des piles : (définition, quantité), dans l'ordre de l'inventaire."""
+        quantities = self.quantities
+        return [(item, quantities[name]) for name, item in self.items()]
+
+    def contents(self):
+        """Tuple ((nom, quantité), ...) comparable d'un état à l'autre (voir savegame)."""
+        quantities = self.quantities
+        return tuple((name, quantities[name]) for name in self)
+
+    def weight(self):
+        """Poids total, pile par pile."""
+        quantities = self.quantities
+        return sum(item.weight * quantities[name] for name, item in self.items())
+
+    def add(self, item, count=1, position=None):
+        """
+        Ajouter `count` exemplaires de `item` (à sa pile s'il est déjà présent).
+
+        Args:
+            item (Item): La définition de l'objet
+            count (int): Nombre d'exemplaires
+            position (int): Rang de la nouvelle pile (défaut: à la fin)
+
+        Returns:
+            int: La quantité de la pile
+        """
+        name = item.name
+        if name in self:
+            self.quantities[name] += count
+            self.changed()
+        elif position is None or position >= len(self):
+            self[name] = item
+            self.quantities[name] = count
+        else:
+            entries = list(self.items())
+            entries.insert(position, (name, item))
+            dict.clear(self)
+            dict.update(self, entries)
+            self.quantities[name] = count
+            self.changed()
+        return self.quantities[name]
+
+    def remove(self, name, count=1):
+        """
+        Retirer `count` exemplaires de `name` (la pile disparaît quand elle est vide).
+
+        Returns:
+            Item: La définition de l'objet
+        """
+        if count >= self.quantities[name]:
+            return self.pop(name)
+        self.quantities[name] -= count
+        self.changed()
+        return self[name]
+
+    def sort(self):
+        """Ranger les piles par nom (forme canonique, voir solver)."""
+        entries = sorted(self.items())
+        dict.clear(self)
+        dict.update(self, entries)
+        self.changed()
+
+
 class Room:
     """
     Représente un lieu (salle) dans le jeu.
@@ -14,19 +225,82 @@ class Room:
         description (str): La description du lieu.
         image (str): Chemin vers l'image du lieu (optionnel).
         exits (dict): Les sorties vers d'autres lieux.
-        inventory (dict): Les objets présents dans le lieu.
+        inventory (Inventory): Les piles d'objets présentes dans le lieu.
         characters (dict): Les personnages présents dans le lieu.
+        players (dict): Les joueurs présents dans le lieu (nom -> Player).
+        index (int): Position du lieu dans Game.rooms (None hors d'un jeu).
     """
 
     # Define the constructor.
     def __init__(self, name, description, image=None):
         self.name = name
-        self.description = description
+        self.description = shared(description)
         # Optional path (relative) to an image representing the room
         self.image = image
+        # Textes déjà rendus, par bloc ("exits", "long", "contents")
+        self._render_cache = {}
+        self._tracker = None
         self.exits = {}
         self.inventory = {}
         self.characters = {}
+        self.players = {}
+        self.index = None
+
+    @property
+    def exits(self):
+        """dict: Les sorties du lieu (direction -> Room ou None)."""
+        return self._exits
+
+    @exits.setter
+    def exits(self, exits):
+        # Un WatchedDict est adopté tel quel (ex: sorties résolues à la demande
+        # par worldstore), un dictionnaire ordinaire est copié
+        if not isinstance(exits, WatchedDict):
+            exits = WatchedDict(None, (), exits)
+        exits.bind(self._render_cache, _EXITS_BLOCKS)
+        self._exits = exits
+
+    @property
+    def inventory(self):
+        """dict: Les objets présents dans le lieu (nom -> Item)."""
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, inventory):
+        self._inventory = Inventory(self._render_cache, _INVENTORY_BLOCKS, inventory,
+                                    tracker=self._tracker)
+        self._inventory.changed()
+
+    @property
+    def characters(self):
+        """dict: Les personnages présents dans le lieu (nom -> Character)."""
+        return self._characters
+
+    @characters.setter
+    def characters(self, characters):
+        self._characters = WatchedDict(self._render_cache, _CHARACTERS_BLOCKS, characters,
+                                       tracker=self._tracker)
+        self._characters.changed()
+
+    def track_changes(self, touched):
+        """
+        Ajouter l'indice du lieu à `touched` dès que son inventaire ou ses personnages changent.
+
+        Args:
+            touched (set): Indices des lieux modifiés (voir Game.touched_rooms)
+
+        Exemples:
+            >>> room = Room("Cave", "une grotte")
+            >>> room.index = 3
+            >>> touched = set()
+            >>> room.track_changes(touched)
+            >>> room.inventory["corde"] = None
+            >>> touched
+            {3}
+        """
+        self._tracker = (touched, self.index)
+        self._inventory._tracker = self._tracker  # pylint: disable=protected-access
+        self._characters._tracker = self._tracker  # pylint: disable=protected-access
 
     def get_exit(self, direction):
         """
@@ -43,50 +317,58 @@ class Room:
         return None
 
     def get_exit_string(self):
-        """Retourne une chaîne décrivant les sorties de la pièce."""
-        exit_string = "Sorties : "
-        for direction in self.exits:
-            if self.exits.get(direction) is not None:
-                exit_string += direction + ", "
-        exit_string = exit_string.strip(", ")
+        """Retourne une chaîne décrivant les sorties de la pièce (mise en cache)."""
+        exit_string = self._render_cache.get("exits")
+        if exit_string is None:
+            directions = [d for d, room in self.exits.items() if room is not None]
+            exit_string = ("Sorties : " + ", ".join(directions)).strip(", ")
+            self._render_cache["exits"] = exit_string
         return exit_string
 
     def get_long_description(self):
         """
         Retourne une description de base de la pièce avec les sorties uniquement.
         N'affiche PAS les items ni les personnages (ils seront visibles avec 'look').
+        Le texte est mis en cache jusqu'à la prochaine modification du lieu.
         """
-        msg = f"\nVous êtes dans {self.description}\n"
-        msg += self.get_exit_string() + "\n"
+        msg = self._render_cache.get("long")
+        if msg is None:
+            parts = [f"\nVous êtes dans {self.description}\n", self.get_exit_string(), "\n"]
 
-        # Afficher les personnages automatiquement
-        if self.characters:
-            msg += "\nVous voyez :\n"
-            for character in self.characters.values():
-                msg += f"    - {character}\n"
+            # Afficher les personnages automatiquement
+            if self.characters:
+                parts.append("\nVous voyez :\n")
+                parts.extend(f"    - {character}\n" for character in self.characters.values())
 
+            msg = "".join(parts)
+            self._render_cache["long"] = msg
         return msg
 
     def get_characters(self):
         """Retourne une chaîne décrivant les items et les personnages présents dans la pièce."""
+        msg = self._render_cache.get("contents")
+        if msg is not None:
+            return msg
+
         # Si ni items ni personnages, rien à afficher
         if not self.inventory and not self.characters:
-            return ""
-
-        msg = "\nOn voit:\n"
+            msg = ""
+        else:
+            parts = ["\nOn voit:\n"]
 
-        # Afficher les items
-        for item in self.inventory.values():
-            # Certains items peuvent être représentés par un objet Item
-            # avec attributs `name`, `description`, `weight`.
-            try:
-                msg += f"    - {item.name} : {item.description} ({item.weight} kg)\n"
-            except AttributeError:
-                # Fallback si l'item est juste une chaîne
-                msg += f"    - {item}\n"
+            # Afficher les items
+            for item, quantity in self.inventory.stacks():
+                # Certains items peuvent être représentés par un objet Item
+                # avec attributs `name`, `description`, `weight`.
+                try:
+                    parts.append(f"    - {item.describe(quantity)}\n")
+                except AttributeError:
+                    # Fallback si l'item est juste une chaîne
+                    parts.append(f"    - {item}\n")
 
-        # Afficher les personnages
-        for character in self.characters.values():
-            msg += f"    - {character}\n"
+            # Afficher les personnages
+            parts.extend(f"    - {character}\n" for character in self.characters.values())
+            msg = "".join(parts)
 
+        self._render_cache["contents"] = msg
         return msg
@@ -0,0 +1,571 @@
+"""
+Module SaveGame - Sauvegarde et chargement compacts d'une partie.
+
+Seul le delta par rapport au monde d'origine est enregistré : le monde est
+reconstruit par Game.setup() puis l'état mutable est réappliqué par-dessus.
+
+Format binaire (version 8), entiers encodés en varint non signé :
+    - en-tête : MAGIC (4 octets) + version (1 octet)
+    - graine du générateur aléatoire et numéro de tour (pour le journal)
+    - joueur : nom, salle courante, historique, compteurs et ordre des visites,
+      max_weight, récompenses
+    - drapeaux de fin de partie (finished, victory, endgame_ready,
+      endgame_awaiting_response)
+    - objets créés en cours de partie (ex: le beamer et ses emplacements :
+      nom, salle, verrouillé)
+    - inventaire du joueur et inventaires des salles modifiées (piles : nom,
+      salle d'origine et quantité)
+    - progression des quêtes
+    - position et état du dialogue (nœud, prochaine réplique) des PNJ modifiés
+    - horloge des PNJ : tours de déplacement joués et dernier tour simulé de
+      chaque PNJ (pour le rattrapage des PNJ endormis)
+
+Chaque objet et chaque PNJ est désigné par son nom et sa salle d'origine : le
+chargement n'a besoin que des salles concernées, ce qui permet de restaurer un
+monde chargé à la demande (worldstore) sans le construire entièrement.
+
+Une sauvegarde ne contient qu'un joueur : une partie à plusieurs (voir
+Game.add_player) ne peut pas être sauvegardée.
+
+Exemples:
+
+>>> from game import Game
+>>> game = Game("Capitaine")
+>>> game.setup()
+>>> data = dumps(game)
+>>> data[:5]
+b'TBAS\\x08'
+>>> game.player.current_room = game.rooms[1]
+>>> other = Game()
+>>> loads(other, dumps(game))
+>>> other.player.name, other.player.current_room.name
+('Capitaine', 'Cove')
+>>> save_path("D'Artagnan-auto").name
+"D'Artagnan-auto.sav"
+>>> save_path("../../tmp/partie")
+Traceback (most recent call last):
+    ...
+savegame.SaveError: Nom de sauvegarde invalide : '../../tmp/partie' (ni séparateur de chemin, ni ':', ni point au début).
+>>> _ = game.add_player("Mary")
+>>> dumps(game)
+Traceback (most recent call last):
+    ...
+savegame.SaveError: Une sauvegarde ne contient qu'un joueur : impossible de sauvegarder une partie à 2 joueurs.
+"""
+
+import os
+import re
+from pathlib import Path
+
+from beamer import Beamer
+from item import Item
+
+MAGIC = b"TBAS"
+FORMAT_VERSION = 8
+SAVE_DIR = Path(__file__).parent / "saves"
+SAVE_SUFFIX = ".sav"
+# Noms d'emplacement acceptés : ni séparateur de chemin, ni ":", ni point au début
+# (".." ou fichier caché) ; un nom reste dans SAVE_DIR
+SAVE_NAME = re.compile(r"[^./\\:\0][^/\\:\0]*")
+NO_ROOM = 0  # Les indices de salle sont décalés de 1, 0 signifie "aucune"
+
+# Drapeaux de fin de partie
+_FINISHED = 1
+_VICTORY = 2
+_ENDGAME_READY = 4
+_ENDGAME_AWAITING = 8
+
+# Drapeaux des quêtes
+_QUEST_ACTIVE = 1
+_QUEST_COMPLETED = 2
+
+# Drapeaux des objets créés en cours de partie
+_ITEM_BEAMER = 1
+
+class SaveError(Exception):
+    """Erreur levée quand une sauvegarde est illisible ou incompatible."""
+
+
+class Writer:
+    """Tampon d'écriture binaire (varints et chaînes UTF-8)."""
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def uint(self, value):
+        """Écrire un entier non signé en varint."""
+        value = int(value)
+        while value >= 0x80:
+            self.buf.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.buf.append(value)
+
+    def text(self, value):
+        """Écrire une chaîne préfixée par sa longueur."""
+        raw = value.encode("utf-8")
+        self.uint(len(raw))
+        self.buf += raw
+
+    def texts(self, values):
+        """Écrire une liste de chaînes."""
+        self.uint(len(values))
+        for value in values:
+            self.text(value)
+
+
+class Reader:
+    """Lecteur symétrique de Writer."""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def uint(self):
+        """Lire un entier non signé encodé en varint."""
+        result = 0
+        shift = 0
+        data = self.data
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def text(self):
+        """Lire une chaîne préfixée par sa longueur."""
+        size = self.uint()
+        start = self.pos
+        self.pos += size
+        return str(self.data[start:self.pos], "utf-8")
+
+    def texts(self):
+        """Lire une liste de chaînes."""
+        return [self.text() for _ in range(self.uint())]
+
+
+def baseline(game):
+    """
+    Capturer l'état d'origine du monde, juste après Game.setup().
+
+    Sert de référence pour n'enregistrer que ce qui a changé. Un monde chargé à
+    la demande (worldstore.LazyWorld) fournit sa propre référence, relue dans
+    son fichier à la demande.
+
+    Args:
+        game (Game): Le jeu fraîchement configuré
+
+    Returns:
+        dict: Inventaires des salles (indice -> piles (nom, quantité)), salle et messages d'origine
+              des PNJ, salle d'origine des objets
+    """
+    world_baseline = getattr(game.rooms, "baseline", None)
+    if world_baseline is not None:
+        return world_baseline
+    inventories = {}
+    characters = {}
+    items = {}
+    for room in game.rooms:
+        inventories[room.index] = room.inventory.contents()
+        for name in room.inventory:
+            items[name] = room.index
+        for name, character in room.characters.items():
+            characters[name] = (room.index, character.dialogue_state())
+    return {"inventories": inventories, "characters": characters, "items": items}
+
+
+def _stateful_rooms(game):
+    """Salles dont l'inventaire ou les personnages peuvent différer de l'origine."""
+    modified_rooms = getattr(game.rooms, "modified_rooms", None)
+    if modified_rooms:
+        return modified_rooms()
+    touched_rooms = getattr(game, "touched_rooms", None)
+    if touched_rooms is None:
+        return game.rooms
+    # Ordre canonique : deux parties équivalentes donnent les mêmes octets
+    return [game.rooms[index] for index in sorted(touched_rooms)]
+
+
+def _room_index(room):
+    """Indice décalé de 1 d'une salle (NO_ROOM si None)."""
+    if room is None:
+        return NO_ROOM
+    return room.index + 1
+
+
+def _check_single_player(game):
+    """Lever SaveError si la partie compte plusieurs joueurs (non sauvegardables)."""
+    if len(game.players) > 1:
+        raise SaveError("Une sauvegarde ne contient qu'un joueur : impossible de "
+                        f"sauvegarder une partie à {len(game.players)} joueurs.")
+
+
+def dumps(game):
+    """
+    Sérialiser l'état mutable d'une partie.
+
+    Args:
+        game (Game): Le jeu à sauvegarder (setup() déjà appelé)
+
+    Returns:
+        bytes: La sauvegarde binaire
+
+    Raises:
+        SaveError: Si la partie compte plusieurs joueurs
+    """
+    # pylint: disable=too-many-locals
+    _check_single_player(game)
+    player = game.player
+    base = game.baseline
+    stateful_rooms = _stateful_rooms(game)
+    out = Writer()
+    out.buf += MAGIC
+    out.buf.append(FORMAT_VERSION)
+    out.uint(game.seed)
+    out.uint(game.turn)
+
+    # Joueur
+    out.text(player.name)
+    out.uint(_room_index(player.current_room))
+    out.uint(len(player.history))
+    for room in player.history:
+        out.uint(_room_index(room))
+    for counters in (player.visit_counts, player.visit_order):
+        out.uint(len(counters))
+        for value in counters:
+            out.uint(value)
+    out.uint(player.max_weight)
+    out.texts(player.rewards)
+
+    flags = 0
+    if game.finished:
+        flags |= _FINISHED
+    if game.victory:
+        flags |= _VICTORY
+    if getattr(player, "endgame_ready", False):
+        flags |= _ENDGAME_READY
+    if getattr(player, "endgame_awaiting_response", False):
+        flags |= _ENDGAME_AWAITING
+    out.uint(flags)
+
+    # Inventaires : les salles modifiées seulement
+    changed_rooms = [room for room in stateful_rooms
+                     if room.inventory.contents() != base["inventories"].get(room.index, ())]
+    # Une définition créée en jeu n'est écrite qu'une fois, même en plusieurs piles
+    extras = {name: item for name, item in player.inventory.items()
+              if name not in base["items"]}
+    for room in changed_rooms:
+        extras.update((name, item) for name, item in room.inventory.items()
+                      if name not in base["items"])
+
+    out.uint(len(extras))
+    for item in extras.values():
+        out.text(item.name)
+        out.text(item.description)
+        out.uint(item.weight)
+        is_beamer = isinstance(item, Beamer)
+        out.uint(_ITEM_BEAMER if is_beamer else 0)
+        if is_beamer:
+            out.uint(len(item.slots))
+            for slot, room in item.slots.items():
+                out.text(slot)
+                out.uint(_room_index(room))
+                out.uint(slot in item.locked)
+
+    _write_items(out, base, player.inventory)
+    out.uint(len(changed_rooms))
+    for room in changed_rooms:
+        out.uint(room.index)
+        _write_items(out, base, room.inventory)
+
+    # Quêtes
+    manager = game.quest_manager
+    quest_indices = {id(quest): i for i, quest in enumerate(manager.quests)}
+    progressed = [(i, quest) for i, quest in enumerate(manager.quests)
+                  if quest.is_active or quest.is_completed or quest.completed_objectives]
+    out.uint(len(progressed))
+    for i, quest in progressed:
+        out.uint(i)
+        out.uint((_QUEST_ACTIVE if quest.is_active else 0)
+                 | (_QUEST_COMPLETED if quest.is_completed else 0))
+        out.uint(len(quest.completed_objectives))
+        for objective in quest.completed_objectives:
+            out.uint(quest.objectives.index(objective))
+    out.uint(len(manager.active_quests))
+    for quest in manager.active_quests:
+        out.uint(quest_indices[id(quest)])
+
+    # PNJ : position ou état du dialogue différents de l'origine
+    moved = []
+    for room in stateful_rooms:
+        for name, character in room.characters.items():
+            origin = base["characters"].get(name)
+            state = character.dialogue_state()
+            if origin is not None and (origin[0] != room.index or origin[1] != state):
+                moved.append((name, origin[0], room.index, state))
+    out.uint(len(moved))
+    for name, origin, i, (node, cursor) in moved:
+        out.text(name)
+        out.uint(origin)
+        out.uint(i)
+        out.uint(node)
+        out.uint(cursor)
+
+    # Horloge des PNJ
+    out.uint(game.npc_rounds)
+    clocks = [(name, room.index, character.last_round)
+              for room in stateful_rooms
+              for name, character in room.characters.items() if character.last_round]
+    out.uint(len(clocks))
+    for name, i, last_round in clocks:
+        out.text(name)
+        out.uint(i)
+        out.uint(last_round)
+
+    return bytes(out.buf)
+
+
+def _write_items(out, base, inventory):
+    """
+    Écrire les piles d'un inventaire : nom de l'objet, salle d'origine de sa
+    définition (NO_ROOM si créé en jeu) et quantité.
+    """
+    out.uint(len(inventory))
+    for name, quantity in inventory.contents():
+        out.text(name)
+        origin = base["items"].get(name)
+        out.uint(NO_ROOM if origin is None else origin + 1)
+        out.uint(quantity)
+
+
+def _read_items(reader):
+    """Lire des triplets (nom d'objet, salle d'origine décalée de 1, quantité)."""
+    return [(reader.text(), reader.uint(), reader.uint()) for _ in range(reader.uint())]
+
+
+def loads(game, data):
+    """
+    Restaurer une partie à partir d'une sauvegarde binaire.
+
+    Le monde d'origine est reconstruit par Game.setup() puis le delta est appliqué.
+
+    Args:
+        game (Game): Le jeu à restaurer (son état actuel est écrasé)
+        data (bytes): La sauvegarde produite par dumps()
+
+    Raises:
+        SaveError: Si la sauvegarde est illisible ou d'une autre version
+    """
+    if bytes(data[:4]) != MAGIC:
+        raise SaveError("Ce fichier n'est pas une sauvegarde TBA.")
+    if data[4] != FORMAT_VERSION:
+        raise SaveError(f"Version de sauvegarde non supportée ({data[4]}).")
+    try:
+        _apply(game, Reader(data[5:]))
+    except (IndexError, KeyError, UnicodeDecodeError, ValueError) as e:
+        raise SaveError(f"Sauvegarde corrompue ({e}).") from e
+
+
+# pylint: disable=too-many-locals, too-many-branches, too-many-statements
+def _apply(game, reader):
+    """Reconstruire le monde puis appliquer le delta lu dans `reader`."""
+    seed = reader.uint()
+    turn = reader.uint()
+    game.player_name = reader.text()
+    game.reset()
+    game.setup()
+    game.reseed(seed)
+    game.turn = turn
+
+    rooms = game.rooms
+    player = game.player
+
+    def room_at(index):
+        return None if index == NO_ROOM else rooms[index - 1]
+
+    player.current_room = room_at(reader.uint())
+    player.history.extend(room_at(reader.uint()) for _ in range(reader.uint()))
+    player.visit_counts.extend(reader.uint() for _ in range(reader.uint()))
+    player.visit_order.extend(reader.uint() for _ in range(reader.uint()))
+    player.max_weight = reader.uint()
+    player.rewards = reader.texts()
+
+    flags = reader.uint()
+    game.finished = bool(flags & _FINISHED)
+    game.victory = bool(flags & _VICTORY)
+    player.endgame_ready = bool(flags & _ENDGAME_READY)
+    player.endgame_awaiting_response = bool(flags & _ENDGAME_AWAITING)
+
+    # Objets créés en cours de partie
+    extras = {}
+    for _ in range(reader.uint()):
+        name, description, weight = reader.text(), reader.text(), reader.uint()
+        if reader.uint() & _ITEM_BEAMER:
+            item = Beamer()
+            for _ in range(reader.uint()):
+                slot = reader.text()
+                item.slots[slot] = room_at(reader.uint())
+                if reader.uint():
+                    item.locked.add(slot)
+        else:
+            item = Item(name, description, weight)
+        extras[item.name] = item
+
+    # Les définitions d'origine sont retrouvées dans leur salle d'origine,
+    # avant que les inventaires modifiés ne soient vidés. Une définition
+    # partagée par plusieurs salles garde la salle désignée par la sauvegarde
+    # (un monde chargé à la demande retient la première salle lue).
+    origins = game.baseline["items"]
+
+    def resolve(items):
+        stacks = []
+        for name, origin, quantity in items:
+            if origin == NO_ROOM:
+                stacks.append((extras[name], quantity))
+            else:
+                stacks.append((rooms[origin - 1].inventory[name], quantity))
+                origins[name] = origin - 1
+        return stacks
+
+    inventory = resolve(_read_items(reader))
+    changed_rooms = [(rooms[reader.uint()], _read_items(reader)) for _ in range(reader.uint())]
+    changed_rooms = [(room, resolve(items)) for room, items in changed_rooms]
+    player.inventory = {}
+    for item, quantity in inventory:
+        player.inventory.add(item, quantity)
+    for room, _items in changed_rooms:
+        room.inventory.clear()
+    for room, items in changed_rooms:
+        for item, quantity in items:
+            room.inventory.add(item, quantity)
+
+    # Quêtes
+    manager = game.quest_manager
+    for _ in range(reader.uint()):
+        quest = manager.quests[reader.uint()]
+        quest_flags = reader.uint()
+        quest.is_active = bool(quest_flags & _QUEST_ACTIVE)
+        quest.is_completed = bool(quest_flags & _QUEST_COMPLETED)
+        quest.completed_objectives = [quest.objectives[reader.uint()]
+                                      for _ in range(reader.uint())]
+    manager.active_quests = [manager.quests[reader.uint()] for _ in range(reader.uint())]
+
+    # PNJ : retrouvés dans leur salle d'origine avant d'être déplacés
+    moved = []
+    for _ in range(reader.uint()):
+        name = reader.text()
+        character = rooms[reader.uint()].characters[name]
+        room = rooms[reader.uint()]
+        character.node = reader.uint()
+        character.cursor = reader.uint()
+        moved.append((character, room))
+    for character, room in moved:
+        if character.current_room is not room:
+            character.current_room.characters.pop(character.name, None)
+            room.characters[character.name] = character
+            character.current_room = room
+
+    # Horloge des PNJ (après les déplacements : les PNJ sont dans leur salle actuelle)
+    game.npc_rounds = reader.uint()
+    for _ in range(reader.uint()):
+        name = reader.text()
+        character = rooms[reader.uint()].characters[name]
+        character.last_round = reader.uint()
+
+
+def save_path(name):
+    """
+    Chemin du fichier de sauvegarde `name` dans SAVE_DIR.
+
+    Raises:
+        SaveError: Si le nom n'est pas un nom d'emplacement (voir SAVE_NAME) :
+                   un séparateur ou ".." pourrait désigner un fichier hors de SAVE_DIR
+    """
+    if not SAVE_NAME.fullmatch(name):
+        raise SaveError(f"Nom de sauvegarde invalide : '{name}' "
+                        "(ni séparateur de chemin, ni ':', ni point au début).")
+    return SAVE_DIR / f"{name}{SAVE_SUFFIX}"
+
+
+def save_game(game, name):
+    """
+    Écrire la sauvegarde de la partie sur le disque.
+
+    Le générateur aléatoire est réinitialisé avec une nouvelle graine, enregistrée
+    dans la sauvegarde, pour que la suite de la partie puisse être rejouée.
+
+    Args:
+        game (Game): Le jeu à sauvegarder
+        name (str): Nom de l'emplacement de sauvegarde
+
+    Returns:
+        Path: Le fichier écrit
+
+    Raises:
+        SaveError: Si la partie compte plusieurs joueurs ou si le nom est invalide
+    """
+    return write_save(name, snapshot(game))
+
+
+def snapshot(game):
+    """
+    Encoder la partie pour une sauvegarde sur le disque (voir save_game).
+
+    Le générateur aléatoire est réinitialisé avec une nouvelle graine, enregistrée
+    dans la sauvegarde. Seul le delta est encodé : l'appel est court, et l'écriture
+    du fichier peut se faire ensuite sur un autre thread (voir autosave).
+
+    Args:
+        game (Game): Le jeu à sauvegarder (entre deux tours)
+
+    Returns:
+        bytes: La sauvegarde
+
+    Raises:
+        SaveError: Si la partie compte plusieurs joueurs
+    """
+    _check_single_player(game)  # Avant de changer la graine
+    game.reseed(game.rng.getrandbits(32))
+    return dumps(game)
+
+
+def write_save(name, data):
+    """
+    Écrire une sauvegarde de façon atomique.
+
+    Les octets sont écrits et synchronisés dans un fichier temporaire, qui
+    remplace ensuite l'ancienne sauvegarde d'un seul coup (renommage) : un
+    arrêt brutal laisse l'ancienne ou la nouvelle sauvegarde, jamais un mélange.
+
+    Args:
+        name (str): Nom de l'emplacement de sauvegarde
+        data (bytes): La sauvegarde (voir snapshot)
+
+    Returns:
+        Path: Le fichier écrit
+    """
+    path = save_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    tmp_path.replace(path)
+    return path
+
+
+def load_game(game, name):
+    """
+    Charger une sauvegarde depuis le disque.
+
+    Args:
+        game (Game): Le jeu à restaurer
+        name (str): Nom de l'emplacement de sauvegarde
+
+    Raises:
+        FileNotFoundError: Si la sauvegarde n'existe pas
+        SaveError: Si la sauvegarde est illisible
+    """
+    loads(game, save_path(name).read_bytes())
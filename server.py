@@ -0,0 +1,399 @@
+"""
+Module Server - API HTTP/JSON locale pour jouer sans interface.
+
+Un serveur asyncio sur un seul thread tient une table de parties en mémoire.
+Chaque requête est traitée entièrement dans la boucle : une commande du jeu
+ne prend que quelques dizaines de microsecondes. Les connexions restent
+ouvertes entre deux requêtes (HTTP/1.1 keep-alive).
+
+Routes (corps et réponses en JSON) :
+    - POST   /sessions                    : créer une partie
+                                            ({"player": nom, "seed": graine})
+    - GET    /sessions/<id>               : état de la partie
+    - POST   /sessions/<id>/commands      : jouer une commande ({"command": "go N"})
+    - GET    /sessions/<id>/events?since=N : événements depuis la position N
+    - DELETE /sessions/<id>               : terminer la partie
+
+L'état (game_state) est construit depuis les objets du jeu : salle (sorties,
+objets, personnages, joueurs), inventaire, quêtes et récompenses. Une
+commande retourne aussi les événements qu'elle a produits (voir events) et
+son texte affiché (`output`, pour l'afficher tel quel). Les commandes qui
+touchent le disque ou tout le processus (BLOCKED_COMMANDS : save, load,
+debug) sont refusées.
+
+Utilisation:
+    python server.py [--host H] [--port P] [--rooms R] [--seed S]
+
+Exemples:
+
+>>> import contextlib, io
+>>> from game import Game
+>>> game = Game("Anne", seed=0)
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     game.setup()
+>>> state = game_state(game)
+>>> state["room"]["name"], state["room"]["exits"], state["room"]["characters"]
+('Beach', {'O': 'Cove'}, ['Jacob'])
+>>> state["quests"][0]["objectives"][0]
+{'text': 'Visiter Beach', 'done': True}
+>>> route("GET", "/sessions/abc/events")
+('read_events', 'abc')
+>>> route("PUT", "/sessions")
+Traceback (most recent call last):
+    ...
+server.HTTPError: (405, 'Méthode PUT non autorisée pour /sessions')
+>>> server = GameServer()
+>>> session = server.handle("POST", "/sessions", b'{"seed": 0}')[1]["session"]
+>>> server.handle("POST", f"/sessions/{session}/commands",
+...               b'{"command": "save ../../../tmp/partie"}')
+(403, {'error': "La commande 'save' n'est pas disponible par l'API."})
+>>> server.handle("POST", f"/sessions/{session}/commands", b'{"command": "DEBUG"}')[0]
+403
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import secrets
+import sys
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import events
+from game import Game
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Nombre maximal de parties en mémoire
+MAX_SESSIONS = 10_000
+# Taille maximale du corps d'une requête (octets)
+MAX_BODY = 64 * 1024
+# Délai (secondes) avant de fermer une connexion inactive
+KEEP_ALIVE_TIMEOUT = 30.0
+# Commandes refusées : les sauvegardes sont partagées par toutes les parties du
+# serveur (et par le jeu local), le mode DEBUG par tout le processus
+BLOCKED_COMMANDS = {"save", "load", "debug"}
+
+
+class HTTPError(Exception):
+    """Erreur renvoyée au client : code HTTP et message."""
+
+    def __init__(self, status, message):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+class Session:
+    """
+    Une partie jouée par l'API.
+
+    Attributs:
+        game (Game): La partie
+        position (int): Position dans son flux d'événements déjà renvoyée au client
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.position = game.events.position
+
+
+def _stacks(inventory):
+    """Piles d'un inventaire : [{"name", "description", "weight", "quantity"}]."""
+    return [{"name": item.name, "description": item.description,
+             "weight": item.weight, "quantity": quantity}
+            for item, quantity in inventory.stacks()]
+
+
+def game_state(game):
+    """
+    État de la partie, construit depuis les objets du jeu.
+
+    Args:
+        game (Game): La partie (setup() déjà appelé)
+
+    Returns:
+        dict: Tour, fin de partie, joueur, salle, inventaire et quêtes
+    """
+    player = game.player
+    room = player.current_room
+    return {
+        "turn": game.events.turns,
+        "finished": game.finished,
+        "victory": game.victory,
+        "player": {
+            "name": player.name,
+            "weight": player.inventory.weight(),
+            "max_weight": player.max_weight,
+            "rewards": list(player.rewards),
+        },
+        "room": {
+            "name": room.name,
+            "description": room.description,
+            "exits": {direction: target.name for direction, target in room.exits.items()
+                      if target is not None},
+            "items": _stacks(room.inventory),
+            "characters": list(room.characters),
+            "players": [name for name in room.players if name != player.name],
+        },
+        "inventory": _stacks(player.inventory),
+        "quests": [{
+            "title": quest.title,
+            "active": quest.is_active,
+            "completed": quest.is_completed,
+            "reward": quest.reward,
+            "objectives": [{"text": objective, "done": objective in quest.completed_objectives}
+                           for objective in quest.objectives],
+        } for quest in game.quest_manager.quests],
+    }
+
+
+# (méthode, nombre de segments du chemin, dernier segment) -> nom de l'action
+_ROUTES = {
+    ("POST", 1, "sessions"): "create",
+    ("GET", 2, None): "state",
+    ("DELETE", 2, None): "delete",
+    ("POST", 3, "commands"): "command",
+    ("GET", 3, "events"): "read_events",
+}
+
+
+def route(method, path):
+    """
+    Trouver l'action d'une requête.
+
+    Args:
+        method (str): La méthode HTTP
+        path (str): Le chemin, sans la chaîne de requête
+
+    Returns:
+        tuple: (action, identifiant de la partie ou None)
+
+    Raises:
+        HTTPError: 404 si le chemin est inconnu, 405 si la méthode ne convient pas
+    """
+    parts = [part for part in path.split("/") if part]
+    if not parts or parts[0] != "sessions" or len(parts) > 3:
+        raise HTTPError(404, f"Chemin inconnu : {path}")
+    last = "sessions" if len(parts) == 1 else None if len(parts) == 2 else parts[2]
+    if not any(key[1:] == (len(parts), last) for key in _ROUTES):
+        raise HTTPError(404, f"Chemin inconnu : {path}")
+    action = _ROUTES.get((method, len(parts), last))
+    if action is None:
+        raise HTTPError(405, f"Méthode {method} non autorisée pour {path}")
+    return action, parts[1] if len(parts) > 1 else None
+
+
+class GameServer:
+    """
+    Serveur HTTP/JSON des parties sans interface.
+
+    Attributs:
+        sessions (dict): Parties en cours (identifiant -> Session)
+        world_builder (callable): Constructeur du monde des nouvelles parties (None pour l'île)
+        requests (int): Nombre de requêtes traitées
+    """
+
+    def __init__(self, world_builder=None):
+        self.sessions = {}
+        self.world_builder = world_builder
+        self.requests = 0
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, f"Partie inconnue : {session_id}")
+        return session
+
+    def create(self, body):
+        """Créer une partie (POST /sessions)."""
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise HTTPError(503, "Trop de parties en cours.")
+        name = str(body.get("player") or "Capitaine")
+        seed = body.get("seed")
+        if seed is not None and (not isinstance(seed, int) or seed < 0):
+            raise HTTPError(400, "La graine doit être un entier positif.")
+        game = Game(name, seed=seed, world_builder=self.world_builder)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.setup()
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = Session(game)
+        return 201, {"session": session_id, "state": game_state(game)}
+
+    def state(self, session_id):
+        """État d'une partie (GET /sessions/<id>)."""
+        return 200, game_state(self._session(session_id).game)
+
+    def delete(self, session_id):
+        """Terminer une partie (DELETE /sessions/<id>)."""
+        self._session(session_id)
+        del self.sessions[session_id]
+        return 200, {"session": session_id, "deleted": True}
+
+    def command(self, session_id, body):
+        """Jouer une commande (POST /sessions/<id>/commands)."""
+        session = self._session(session_id)
+        command = body.get("command")
+        if not isinstance(command, str) or not command.strip():
+            raise HTTPError(400, "Le champ 'command' doit être une commande non vide.")
+        command_word = command.strip().split(" ")[0].lower()
+        if command_word in BLOCKED_COMMANDS:
+            raise HTTPError(403, f"La commande '{command_word}' n'est pas disponible par l'API.")
+        game = session.game
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            game.process_command(command)
+        recorded, session.position = game.events.since(session.position)
+        return 200, {"output": output.getvalue(),
+                     "events": [events.to_dict(event) for event in recorded],
+                     "state": game_state(game)}
+
+    def read_events(self, session_id, query):
+        """Événements d'une partie depuis une position (GET /sessions/<id>/events)."""
+        game = self._session(session_id).game
+        since = query.get("since", ["0"])[0]
+        if not since.isdigit():
+            raise HTTPError(400, "Le paramètre 'since' doit être un entier positif.")
+        recorded, position = game.events.since(int(since))
+        return 200, {"events": [events.to_dict(event) for event in recorded],
+                     "position": position}
+
+    def handle(self, method, target, body):
+        """
+        Traiter une requête.
+
+        Args:
+            method (str): La méthode HTTP
+            target (str): Le chemin et la chaîne de requête
+            body (bytes): Le corps de la requête
+
+        Returns:
+            tuple: (code HTTP, réponse JSON)
+        """
+        self.requests += 1
+        try:
+            url = urlsplit(target)
+            action, session_id = route(method, url.path)
+            if action in ("create", "command"):
+                try:
+                    payload = json.loads(body) if body else {}
+                except (UnicodeDecodeError, ValueError) as e:
+                    raise HTTPError(400, f"JSON invalide ({e}).") from e
+                if not isinstance(payload, dict):
+                    raise HTTPError(400, "Le corps doit être un objet JSON.")
+                if action == "create":
+                    return self.create(payload)
+                return self.command(session_id, payload)
+            if action == "read_events":
+                return self.read_events(session_id, parse_qs(url.query))
+            return getattr(self, action)(session_id)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+
+    async def serve_connection(self, reader, writer):
+        """Servir les requêtes d'une connexion jusqu'à sa fermeture."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                # Minuterie plutôt que wait_for : pas de tâche créée par requête
+                idle = loop.call_later(KEEP_ALIVE_TIMEOUT, writer.transport.abort)
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(431, {"error": "En-têtes trop longs."}, False))
+                    return
+                finally:
+                    idle.cancel()
+                try:
+                    method, target, version, headers = _parse_head(head)
+                    length = int(headers.get("content-length", "0"))
+                    if not 0 <= length <= MAX_BODY:
+                        raise ValueError(f"corps de {length} octets")
+                except ValueError as e:
+                    writer.write(_response(400, {"error": f"Requête invalide ({e})."}, False))
+                    return
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = _keep_alive(version, headers)
+                status, payload = self.handle(method, target, body)
+                writer.write(_response(status, payload, keep_alive))
+                if not keep_alive:
+                    return
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            with contextlib.suppress(ConnectionError):
+                writer.close()
+
+
+def _parse_head(head):
+    """
+    Lire la ligne de requête et les en-têtes.
+
+    Returns:
+        tuple: (méthode, cible, version, en-têtes en minuscules)
+
+    Raises:
+        ValueError: Si la requête est mal formée
+    """
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _keep_alive(version, headers):
+    """True si la connexion reste ouverte après la réponse."""
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def _response(status, payload, keep_alive):
+    """Réponse HTTP complète (en-têtes et corps JSON)."""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n").encode("latin-1") + body
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, world_builder=None):
+    """Lancer le serveur jusqu'à l'arrêt du processus."""
+    server = GameServer(world_builder)
+    listener = await asyncio.start_server(server.serve_connection, host, port)
+    print(f"🌐 Serveur prêt sur http://{host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    """Point d'entrée : lire les options et lancer le serveur."""
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args and args.index(name) + 1 < len(args):
+            return args[args.index(name) + 1]
+        return default
+
+    world_builder = None
+    if "--rooms" in args:
+        # pylint: disable=import-outside-toplevel
+        from worldgen import WorldGenerator
+        world_builder = WorldGenerator(int(option("--rooms", 0)), int(option("--seed", 0)))
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(option("--host", DEFAULT_HOST), int(option("--port", DEFAULT_PORT)),
+                          world_builder))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Module Simulate - Simulation Monte-Carlo de parties aléatoires.
+
+Joue un grand nombre de parties sans affichage en choisissant à chaque tour
+une commande légale au hasard (sorties, objets et personnages de la salle
+courante). Les parties sont réparties par lots sur un ProcessPoolExecutor,
+chaque lot ayant sa propre graine ; les statistiques sont agrégées au fil de
+l'eau, lot par lot, sans conserver les parties individuelles.
+
+Statistiques:
+    - taux de victoire
+    - taux de mort dans la Forêt
+    - nombre de tours pour terminer chaque quête du QuestManager
+
+Utilisation:
+    python simulate.py [--runs N] [--jobs J] [--seed S] [--max-turns T]
+"""
+
+import contextlib
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game import Game
+from solver import legal_commands
+
+DEFAULT_MAX_TURNS = 200
+BATCH_SIZE = 500
+
+
+class SimulationStats:
+    """
+    Statistiques agrégées d'un ensemble de parties.
+
+    Attributs:
+        runs (int): Nombre de parties jouées
+        victories (int): Parties gagnées
+        forest_deaths (int): Parties perdues dans la Forêt
+        total_turns (int): Somme des tours joués
+        quests (dict): titre -> [terminées, somme des tours, min, max]
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.victories = 0
+        self.forest_deaths = 0
+        self.total_turns = 0
+        self.quests = {}
+
+    def record(self, game, turns, quest_turns):
+        """
+        Ajouter le résultat d'une partie.
+
+        Args:
+            game (Game): La partie terminée (ou abandonnée)
+            turns (int): Nombre de tours joués
+            quest_turns (dict): titre -> tour où la quête a été terminée
+        """
+        self.runs += 1
+        self.total_turns += turns
+        if game.victory:
+            self.victories += 1
+        elif game.finished and game.player.current_room.name == "Forêt":
+            self.forest_deaths += 1
+        for title, turn in quest_turns.items():
+            stats = self.quests.setdefault(title, [0, 0, turn, turn])
+            stats[0] += 1
+            stats[1] += turn
+            stats[2] = min(stats[2], turn)
+            stats[3] = max(stats[3], turn)
+
+    def merge(self, other):
+        """
+        Fusionner les statistiques d'un autre lot.
+
+        Args:
+            other (SimulationStats): Les statistiques à ajouter
+        """
+        self.runs += other.runs
+        self.victories += other.victories
+        self.forest_deaths += other.forest_deaths
+        self.total_turns += other.total_turns
+        for title, (done, total, low, high) in other.quests.items():
+            stats = self.quests.setdefault(title, [0, 0, low, high])
+            stats[0] += done
+            stats[1] += total
+            stats[2] = min(stats[2], low)
+            stats[3] = max(stats[3], high)
+
+    def report(self):
+        """
+        Obtenir un résumé textuel des statistiques.
+
+        Returns:
+            str: Le rapport
+        """
+        if not self.runs:
+            return "Aucune partie simulée."
+        lines = [
+            f"Parties simulées : {self.runs}",
+            f"Victoires : {self.victories / self.runs:.2%}",
+            f"Morts dans la Forêt : {self.forest_deaths / self.runs:.2%}",
+            f"Tours par partie (moyenne) : {self.total_turns / self.runs:.1f}",
+            "Quêtes terminées :",
+        ]
+        for title, (done, total, low, high) in self.quests.items():
+            lines.append(f"  - {title} : {done / self.runs:.2%} des parties, "
+                         f"en {total / done:.1f} tours en moyenne (min {low}, max {high})")
+        return "\n".join(lines)
+
+
+def play_random(seed, max_turns=DEFAULT_MAX_TURNS):
+    """
+    Jouer une partie en choisissant des commandes légales au hasard.
+
+    Args:
+        seed (int): Graine de la partie (PNJ et choix des commandes)
+        max_turns (int): Nombre maximal de tours avant abandon
+
+    Returns:
+        tuple: (game, tours joués, {titre de quête: tour de fin})
+    """
+    rng = random.Random(seed)
+    game = Game("Simulation", seed=seed)
+    game.setup()
+    quests = game.quest_manager.quests
+    quest_turns = {}
+    turns = 0
+    while not game.finished and turns < max_turns:
+        commands = legal_commands(game)
+        if not commands:
+            break
+        game.process_command(rng.choice(commands))
+        turns += 1
+        for quest in quests:
+            if quest.is_completed and quest.title not in quest_turns:
+                quest_turns[quest.title] = turns
+    return game, turns, quest_turns
+
+
+def run_batch(seed, runs, max_turns=DEFAULT_MAX_TURNS):
+    """
+    Simuler un lot de parties dans un processus de travail.
+
+    Args:
+        seed (int): Graine du lot (chaque partie en dérive la sienne)
+        runs (int): Nombre de parties du lot
+        max_turns (int): Nombre maximal de tours par partie
+
+    Returns:
+        SimulationStats: Les statistiques agrégées du lot
+    """
+    stats = SimulationStats()
+    rng = random.Random(seed)
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for _ in range(runs):
+            game, turns, quest_turns = play_random(rng.getrandbits(64), max_turns)
+            stats.record(game, turns, quest_turns)
+    return stats
+
+
+def simulate(runs, jobs=None, seed=0, max_turns=DEFAULT_MAX_TURNS, batch_size=BATCH_SIZE):
+    """
+    Simuler `runs` parties réparties sur un pool de processus.
+
+    Le découpage en lots et leurs graines ne dépendent que de `seed` et
+    `batch_size` : le résultat est reproductible quel que soit `jobs`.
+
+    Args:
+        runs (int): Nombre total de parties
+        jobs (int, optional): Nombre de processus (défaut: nombre de cœurs)
+        seed (int): Graine de la simulation
+        max_turns (int): Nombre maximal de tours par partie
+        batch_size (int): Nombre de parties par lot
+
+    Returns:
+        SimulationStats: Les statistiques de toutes les parties
+    """
+    total = SimulationStats()
+    batches = [(seed * 1_000_003 + i, min(batch_size, runs - start))
+               for i, start in enumerate(range(0, runs, batch_size))]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_batch, batch_seed, count, max_turns)
+                   for batch_seed, count in batches]
+        for future in as_completed(futures):
+            total.merge(future.result())
+    return total
+
+
+def main():
+    """Point d'entrée : lancer la simulation et afficher le rapport."""
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args and args.index(name) + 1 < len(args):
+            return int(args[args.index(name) + 1])
+        return default
+
+    stats = simulate(option("--runs", 10_000), option("--jobs", None),
+                     option("--seed", 0), option("--max-turns", DEFAULT_MAX_TURNS))
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
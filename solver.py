@@ -0,0 +1,375 @@
+"""
+Module Solver - Recherche du jeu optimal dans l'espace des états.
+
+Parcours en largeur (BFS) de tous les états atteignables de la partie :
+salle, inventaires, progression des quêtes, beamer, drapeaux de fin de partie.
+Le moteur lui-même sert de fonction de transition, sur un seul jeu de travail
+dont le monde n'est construit qu'une fois : chaque commande est jouée comme un
+tour annulable (voir undo), le nouvel état est encodé, puis le tour est annulé.
+Pour passer d'un état à l'autre, le jeu remonte (undo) jusqu'à l'ancêtre commun
+dans l'arbre du parcours et rejoue les commandes qui en descendent : le coût
+d'une transition ne dépend pas de la taille du monde. Seul un tour qui ne
+s'annule pas oblige à recharger l'état (savegame.loads, qui reconstruit le
+monde).
+
+L'encodage d'un état est la sauvegarde binaire canonique de la partie
+(historique et visites oubliés, inventaires triés, graine fixe) : des octets compacts et
+hachables, qui servent de clé à la table de transposition.
+
+Résultats:
+    - la plus courte suite de commandes gagnante
+    - les coups fatals menant à une défaite (ex: entrer dans la Forêt)
+    - en mode exhaustif, les impasses : états à partir desquels la victoire
+      est devenue impossible (ex: donner le trésor au crocodile)
+
+Le BFS s'arrête à la première victoire, sauf en mode exhaustif : il faut alors
+parcourir tout l'espace atteignable (plusieurs centaines de milliers d'états
+pour l'île, car chaque objet peut être déposé dans chaque lieu).
+
+Utilisation:
+    python solver.py [--exhaustive] [--max-states N] [--rooms R] [--seed S]
+
+    --rooms R : explorer un monde généré de R salles (graine S) au lieu de l'île
+
+Exemples:
+
+>>> import contextlib, io
+>>> from game import Game
+>>> from worldgen import WorldGenerator
+>>> game = Game("Solveur", seed=SOLVER_SEED, world_builder=WorldGenerator(10_000, 1))
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     game.setup()
+>>> solve(game, max_states=300).states
+300
+>>> island = Game("Solveur", seed=SOLVER_SEED)
+>>> with contextlib.redirect_stdout(io.StringIO()):
+...     island.setup()
+>>> result = solve(island)
+>>> result.states, result.winning_path[:3], len(result.winning_path)
+(1421, ['go O', 'go N', 'go N'], 12)
+"""
+
+import contextlib
+import os
+import sys
+from array import array
+from collections import deque
+
+import savegame
+import undo
+
+# Graine fixe : les transitions doivent être déterministes
+SOLVER_SEED = 0
+
+
+class SolveResult:
+    """
+    Résultat d'une recherche.
+
+    Attributs:
+        winning_path (list): Plus courte suite de commandes gagnante (None si aucune)
+        states (int): Nombre d'états distincts explorés
+        complete (bool): True si tout l'espace atteignable a été exploré
+        dead_ends (int): Nombre d'états non terminaux sans issue gagnante
+                         (calculé seulement si l'exploration est complète)
+        fatal_moves (dict): (salle, commande) -> nombre de transitions menant
+                            à une défaite ou, si l'exploration est complète,
+                            d'un état gagnable à une impasse
+    """
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, winning_path, states, complete, dead_ends, fatal_moves):
+        self.winning_path = winning_path
+        self.states = states
+        self.complete = complete
+        self.dead_ends = dead_ends
+        self.fatal_moves = fatal_moves
+
+
+def legal_commands(game):
+    """
+    Lister les commandes susceptibles de changer l'état de la partie.
+
+    Les commandes d'affichage (look, check, quests...) et `back` (équivalent
+    à un `go`) sont ignorées.
+
+    Args:
+        game (Game): Le jeu dans l'état courant
+
+    Returns:
+        list: Les commandes à essayer
+    """
+    player = game.player
+    room = player.current_room
+    commands = [f"go {direction}" for direction, exit_room in room.exits.items()
+                if exit_room is not None]
+    commands.extend(f"take {name}" for name in room.inventory)
+    commands.extend(f"drop {name}" for name in player.inventory)
+    if room.characters:
+        commands.extend(f"talk {name}" for name in room.characters)
+        commands.extend(f"give {name}" for name in player.inventory)
+    if "beamer" in player.inventory:
+        commands.extend(("charge", "fire"))
+    if getattr(player, "endgame_awaiting_response", False):
+        commands.extend(("oui", "non"))
+    return [command for command in commands if command.split(" ")[0] in game.commands]
+
+
+def normalize(game):
+    """
+    Normaliser en place ce qui n'empêche pas d'annuler les tours joués.
+
+    Inventaires (des salles modifiées seulement) et objectifs accomplis sont
+    triés, tour et horloge des PNJ remis à zéro, et le générateur aléatoire
+    réinitialisé avec SOLVER_SEED (sans Game.reseed : le jeu de travail n'a
+    ni journal ni flux à rejouer). Les transitions ne dépendent plus que de
+    l'état encodé.
+
+    Args:
+        game (Game): Le jeu de travail du solveur
+    """
+    game.player.inventory.sort()
+    touched_rooms = getattr(game, "touched_rooms", None)
+    rooms = game.rooms if touched_rooms is None else (game.rooms[i] for i in touched_rooms)
+    for room in rooms:
+        if len(room.inventory) > 1:
+            room.inventory.sort()
+    for quest in game.quest_manager.quests:
+        if len(quest.completed_objectives) > 1:
+            quest.completed_objectives.sort(key=quest.objectives.index)
+    game.turn = 0
+    game.npc_rounds = 0  # Les PNJ de l'île ne se déplacent pas
+    game.seed = SOLVER_SEED
+    game.rng.seed(SOLVER_SEED)
+
+
+def state_key(game):
+    """
+    Encoder l'état de la partie sous forme canonique.
+
+    Le jeu est normalisé (voir normalize) ; l'historique est oublié et les
+    récompenses triées le temps de l'encodage seulement, car les tours les
+    annulent par position. Deux parties équivalentes donnent les mêmes octets.
+
+    Args:
+        game (Game): Le jeu de travail du solveur
+
+    Returns:
+        bytes: La clé de l'état
+    """
+    normalize(game)
+    return _encode(game)
+
+
+def _encode(game):
+    """Encoder un jeu déjà normalisé (voir state_key)."""
+    player = game.player
+    kept = player.history, player.visit_counts, player.visit_order, player.rewards
+    player.history = deque(maxlen=player.history.maxlen)
+    player.visit_counts, player.visit_order = array("I"), array("I")
+    player.rewards = sorted(player.rewards)
+    try:
+        return savegame.dumps(game)
+    finally:
+        player.history, player.visit_counts, player.visit_order, player.rewards = kept
+
+
+class _Walker:
+    """
+    Déplace le jeu de travail d'un état du parcours à l'autre.
+
+    Le jeu est dans l'état `path[-1]`, atteint depuis l'état chargé `path[0]`
+    par un tour annulable par pas (game.undo_log, sans limite).
+    """
+
+    def __init__(self, game, keys, parent):
+        self.game = game
+        self.keys = keys
+        self.parent = parent
+        self.path = []
+        game.undo_log = undo.UndoLog(limit=None)
+
+    def load(self, state):
+        """Recharger un état (le monde est reconstruit)."""
+        savegame.loads(self.game, self.keys[state])
+        normalize(self.game)
+        self.path = [state]
+
+    def play(self, command):
+        """
+        Jouer une commande comme un tour annulable.
+
+        Returns:
+            bool: False si le tour ne s'annule pas (il a pu modifier le jeu)
+        """
+        log = self.game.undo_log
+        before = len(log)
+        self.game.process_command(command)
+        normalize(self.game)
+        return len(log) == before + 1
+
+    def goto(self, state):
+        """Amener le jeu dans l'état `state`."""
+        route = [state]
+        while route[-1] != self.path[0] and self.parent[route[-1]][0] != -1:
+            route.append(self.parent[route[-1]][0])
+        route.reverse()
+        if route[0] != self.path[0]:
+            self.load(state)
+            return
+        common = 0
+        while (common < len(route) and common < len(self.path)
+               and route[common] == self.path[common]):
+            common += 1
+        self.game.undo_log.undo(len(self.path) - common)
+        normalize(self.game)
+        del self.path[common:]
+        for child in route[common:]:
+            if not self.play(self.parent[child][1]):
+                self.load(state)
+                return
+            self.path.append(child)
+
+
+def solve(game, max_states=None, exhaustive=False):
+    """
+    Explorer l'espace des états à partir de la partie `game`.
+
+    Args:
+        game (Game): Jeu de travail déjà configuré (il est modifié pendant la recherche,
+                     et son journal d'annulation remplacé)
+        max_states (int, optional): Nombre maximal d'états à explorer
+        exhaustive (bool): Continuer après la première victoire pour trouver les impasses
+
+    Returns:
+        SolveResult: Le chemin gagnant le plus court et les impasses
+    """
+    # pylint: disable=too-many-locals, too-many-branches
+    keys = [state_key(game)]
+    ids = {keys[0]: 0}              # Table de transposition : clé -> identifiant
+    parent = [(-1, None)]           # identifiant -> (parent, commande)
+    walker = _Walker(game, keys, parent)
+    walker.path = [0]
+    reverse = [[]]                  # identifiant -> [(parent, commande)]
+    won = set()
+    lost = set()
+    winning_path = None
+    frontier = deque([0])
+    complete = True
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        while frontier and (exhaustive or winning_path is None):
+            state = frontier.popleft()
+            walker.goto(state)
+            room_name = game.player.current_room.name
+            for command in legal_commands(game):
+                undoable = walker.play(command)
+                key = _encode(game)
+                victory, finished = game.victory, game.finished
+                if undoable:
+                    game.undo_log.undo()
+                    normalize(game)
+                elif key != keys[state] or len(game.undo_log) != len(walker.path) - 1:
+                    # Le tour a modifié le jeu (ou vidé le journal) sans s'annuler
+                    walker.load(state)
+                child = ids.get(key)
+                if child is None:
+                    if max_states is not None and len(keys) >= max_states:
+                        complete = False
+                        continue
+                    child = len(keys)
+                    ids[key] = child
+                    keys.append(key)
+                    parent.append((state, command))
+                    reverse.append([])
+                    if victory:
+                        won.add(child)
+                        if winning_path is None:
+                            winning_path = _path_to(parent, child)
+                    elif finished:
+                        lost.add(child)
+                    else:
+                        frontier.append(child)
+                if child != state:
+                    reverse[child].append((state, (room_name, command)))
+
+    # Les états gagnables sont ceux qui remontent depuis une victoire
+    winnable = set(won)
+    pending = deque(won)
+    while pending:
+        for previous, _move in reverse[pending.popleft()]:
+            if previous not in winnable:
+                winnable.add(previous)
+                pending.append(previous)
+
+    complete = complete and not frontier
+    dead_ends = 0
+    fatal_moves = {}
+    if complete:
+        dead_ends = len(keys) - len(winnable) - len(lost)
+        fatal = (child for child in range(len(keys)) if child not in winnable)
+    else:
+        fatal = iter(lost)
+    for child in fatal:
+        for previous, move in reverse[child]:
+            if previous in winnable or not complete:
+                fatal_moves[move] = fatal_moves.get(move, 0) + 1
+
+    return SolveResult(winning_path, len(keys), complete, dead_ends, fatal_moves)
+
+
+def _path_to(parent, state):
+    """Reconstruire la suite de commandes menant à `state`."""
+    path = []
+    while parent[state][0] != -1:
+        state, command = parent[state]
+        path.append(command)
+    path.reverse()
+    return path
+
+
+def main():
+    """Point d'entrée : résoudre l'île (ou un monde généré) et afficher le résultat."""
+    # pylint: disable=import-outside-toplevel
+    from game import Game
+    from worldgen import WorldGenerator
+
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args and args.index(name) + 1 < len(args):
+            return int(args[args.index(name) + 1])
+        return default
+
+    exhaustive = "--exhaustive" in args
+    max_states = option("--max-states", None)
+    world_builder = None
+    if "--rooms" in args:
+        world_builder = WorldGenerator(option("--rooms", 0), option("--seed", 0))
+
+    game = Game("Solveur", seed=SOLVER_SEED, world_builder=world_builder)
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        game.setup()
+    result = solve(game, max_states, exhaustive)
+
+    print(f"États explorés : {result.states}"
+          f"{'' if result.complete else ' (exploration incomplète)'}")
+    if result.winning_path is None:
+        print("Aucune suite de commandes gagnante trouvée.")
+    else:
+        print(f"Solution optimale en {len(result.winning_path)} commandes :")
+        for i, command in enumerate(result.winning_path, 1):
+            print(f"  {i:3}. {command}")
+    if result.complete:
+        print(f"Impasses (victoire devenue impossible) : {result.dead_ends} états")
+        print("Coups fatals :")
+    else:
+        print("Coups menant à une défaite :")
+    for (room_name, command), count in sorted(result.fatal_moves.items()):
+        print(f"  - {room_name} : '{command}' ({count} fois)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Module Startup - Mesure du démarrage à froid du jeu.
+
+Chaque mesure lance un nouvel interpréteur Python (rien n'est déjà importé) :
+    - `import game`, avec le détail de `python -X importtime` : durée totale
+      des imports et modules les plus coûteux (import compris de leurs
+      dépendances)
+    - la configuration d'une partie sans interface (Game.setup)
+    - le mode console jusqu'au premier prompt `> ` (nom du joueur saisi)
+    - le mode graphique jusqu'à la première fenêtre affichée (si un écran
+      est disponible)
+
+Chaque durée est la médiane de plusieurs lancements.
+
+Utilisation:
+    python startup.py [--runs N] [--top K]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 10
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SETUP_CODE = """
+import contextlib, io
+from game import Game
+with contextlib.redirect_stdout(io.StringIO()):
+    Game("Anne", seed=0).setup()
+"""
+
+GUI_CODE = """
+import contextlib, io
+from game import Game
+from gui import GameGUI
+with contextlib.redirect_stdout(io.StringIO()):
+    app = GameGUI(Game(player_name="Anne"))
+    app.update()
+    app._on_close()
+"""
+
+
+def run_python(args):
+    """
+    Lancer un interpréteur Python dans le dossier du jeu.
+
+    Returns:
+        tuple: (durée en millisecondes, processus terminé)
+    """
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, *args], cwd=HERE, capture_output=True,
+                             text=True, check=False)
+    return (time.perf_counter() - start) * 1000, process
+
+
+def import_times():
+    """
+    Détail des imports de `import game` (python -X importtime).
+
+    Returns:
+        tuple: (durée totale en millisecondes, liste (durée cumulée en ms, module))
+    """
+    _, process = run_python(["-X", "importtime", "-c", "import game"])
+    total = 0
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        total += int(own)
+        modules.append((int(cumulative) / 1000, name.strip()))
+    return total / 1000, modules
+
+
+def first_prompt():
+    """
+    Durée du lancement de `game.py --cli` jusqu'au premier prompt `> `.
+
+    Returns:
+        float: Durée en millisecondes
+    """
+    start = time.perf_counter()
+    with subprocess.Popen([sys.executable, "-u", "game.py", "--cli"], cwd=HERE,
+                          stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL) as process:
+        process.stdin.write(b"Anne\n")
+        process.stdin.flush()
+        output = b""
+        while not output.endswith(b"\n> "):
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("le jeu s'est arrêté avant le premier prompt")
+            output += chunk
+        elapsed = (time.perf_counter() - start) * 1000
+        process.kill()
+    return elapsed
+
+
+def gui_window():
+    """
+    Durée jusqu'à l'affichage de la fenêtre graphique.
+
+    Returns:
+        float: Durée en millisecondes (None si aucun écran n'est disponible)
+    """
+    elapsed, process = run_python(["-c", GUI_CODE])
+    return elapsed if process.returncode == 0 else None
+
+
+def median(func, runs):
+    """Médiane de `runs` appels à `func` (None si un appel retourne None)."""
+    values = [func() for _ in range(runs)]
+    return None if None in values else statistics.median(values)
+
+
+def main():
+    """Point d'entrée : mesurer chaque mode de lancement et afficher les résultats."""
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args and args.index(name) + 1 < len(args):
+            return int(args[args.index(name) + 1])
+        return default
+
+    runs = option("--runs", DEFAULT_RUNS)
+    top = option("--top", DEFAULT_TOP)
+
+    totals = []
+    for _ in range(runs):
+        total, modules = import_times()
+        totals.append(total)
+    print(f"imports de `import game` : {statistics.median(totals):.1f} ms")
+    for cumulative, name in sorted(modules, reverse=True)[:top]:
+        print(f"    {cumulative:>8.1f} ms  {name}")
+
+    rows = [
+        ("python -c 'import game'", median(lambda: run_python(["-c", "import game"])[0], runs)),
+        ("partie sans interface (setup)", median(lambda: run_python(["-c", SETUP_CODE])[0], runs)),
+        ("console jusqu'au premier prompt", median(first_prompt, runs)),
+        ("interface graphique", median(gui_window, runs)),
+    ]
+    print(f"\nmédianes sur {runs} lancements :")
+    for label, elapsed in rows:
+        value = "indisponible" if elapsed is None else f"{elapsed:.1f} ms"
+        print(f"    {label:<34} {value:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Module Stress - Test de charge multi-joueurs sur un monde partagé.
+
+Plusieurs joueurs jouent en même temps dans un même monde généré (voir
+worldgen.WorldGenerator), chacun sur son propre thread : chaque joueur envoie
+ses commandes l'une après l'autre, choisies au hasard parmi les commandes
+légales de sa salle (sauf `give`, qui détruit l'objet donné). À la fin, le
+script vérifie que l'état du monde est resté cohérent :
+
+    - le nombre d'exemplaires de chaque sorte d'objet est conservé (piles des
+      salles et des inventaires)
+    - chaque PNJ est dans exactement une salle, celle de son current_room
+    - chaque joueur est dans exactement une salle, celle de son current_room
+
+Le code de sortie vaut 1 si une de ces règles est violée.
+
+Utilisation:
+    python stress.py [--players N] [--commands C] [--rooms R] [--seed S]
+"""
+
+import contextlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from game import Game
+from solver import legal_commands
+from worldgen import WorldGenerator
+
+DEFAULT_PLAYERS = 8
+DEFAULT_COMMANDS = 2_000
+DEFAULT_ROOMS = 400
+
+
+def play(game, player, commands, seed):
+    """
+    Jouer `commands` commandes au hasard pour `player` (sur le thread courant).
+
+    Args:
+        game (Game): La partie partagée
+        player (Player): Le joueur
+        commands (int): Nombre de commandes à jouer
+        seed (int): Graine des choix du joueur
+    """
+    rng = random.Random(seed)
+    game.switch_player(player)
+    for _ in range(commands):
+        with game.lock_rooms(player.current_room):
+            choices = [command for command in legal_commands(game)
+                       if not command.startswith("give ")]
+        if choices:
+            game.process_command(rng.choice(choices), player)
+
+
+def count_items(inventories):
+    """Nombre total d'exemplaires de chaque sorte d'objet dans `inventories`."""
+    items = {}
+    for inventory in inventories:
+        for name, quantity in inventory.contents():
+            items[name] = items.get(name, 0) + quantity
+    return items
+
+
+def check_world(game, item_counts):
+    """
+    Vérifier la cohérence du monde après la partie.
+
+    Args:
+        game (Game): La partie partagée
+        item_counts (dict): Nombre d'exemplaires de chaque objet au départ
+
+    Returns:
+        list: Les violations trouvées (vide si le monde est cohérent)
+    """
+    errors = []
+    characters = {}
+    players = {}
+    items = count_items([room.inventory for room in game.rooms]
+                        + [player.inventory for player in game.players.values()])
+    for room in game.rooms:
+        for name, character in room.characters.items():
+            characters.setdefault(name, []).append(room)
+            if character.current_room is not room:
+                errors.append(f"{name} est dans {room.name} mais croit être ailleurs")
+        for name, player in room.players.items():
+            players.setdefault(name, []).append(room)
+            if player.current_room is not room:
+                errors.append(f"{name} est dans {room.name} mais croit être ailleurs")
+
+    for name, count in item_counts.items():
+        if items.get(name, 0) != count:
+            errors.append(f"l'objet {name} existe {items.get(name, 0)} fois au lieu de {count}")
+    errors.extend(f"objet inconnu : {name}" for name in set(items) - set(item_counts))
+    errors.extend(f"{name} est dans {len(rooms)} salles"
+                  for name, rooms in characters.items() if len(rooms) != 1)
+    for name in game.players:
+        if len(players.get(name, ())) != 1:
+            errors.append(f"le joueur {name} est dans {len(players.get(name, ()))} salles")
+    return errors
+
+
+def main():
+    """Point d'entrée : faire jouer les joueurs en parallèle puis vérifier le monde."""
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args and args.index(name) + 1 < len(args):
+            return int(args[args.index(name) + 1])
+        return default
+
+    n_players = option("--players", DEFAULT_PLAYERS)
+    commands = option("--commands", DEFAULT_COMMANDS)
+    seed = option("--seed", 0)
+    world = WorldGenerator(option("--rooms", DEFAULT_ROOMS), seed)
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        game = Game("Joueur-0", seed=seed, world_builder=world)
+        game.setup()
+        players = [game.player]
+        players.extend(game.add_player(f"Joueur-{i}") for i in range(1, n_players))
+        item_counts = count_items(room.inventory for room in game.rooms)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_players) as executor:
+            futures = [executor.submit(play, game, player, commands, seed + i)
+                       for i, player in enumerate(players)]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+    total = n_players * commands
+    print(f"{n_players} joueurs, {total} commandes en {elapsed:.2f}s "
+          f"({total / elapsed:.0f} commandes/s)")
+    errors = check_world(game, item_counts)
+    for error in errors:
+        print(f"  - {error}")
+    if errors:
+        print(f"Monde incohérent : {len(errors)} violations.")
+        sys.exit(1)
+    print("Monde cohérent.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Module Texts - Textes statiques partagés par tout le processus.
+
+Les descriptions des salles, des objets et des personnages, ainsi que les
+répliques des PNJ, sont stockées une seule fois par processus : chaque objet du
+modèle référence l'exemplaire commun au lieu de garder sa propre copie, que le
+texte vienne du code, d'un monde généré, d'un fichier de monde (worldstore) ou
+d'une sauvegarde. Une partie ne possède ainsi en propre que son état mutable.
+
+En Python, une référence vers une chaîne partagée coûte autant qu'un indice
+dans une table, sans indirection à la lecture : la table de textes est la table
+d'internement de l'interpréteur (sys.intern).
+
+Exemples:
+
+>>> a = shared("".join(["une plage ", "de sable"]))
+>>> b = shared("".join(["une plage de ", "sable"]))
+>>> a is b
+True
+>>> shared({"Beach": "".join(["Coco ", "!"])})["Beach"] is shared("Coco !")
+True
+"""
+
+import sys
+
+
+def shared(text):
+    """
+    Renvoyer l'exemplaire partagé de `text`.
+
+    Args:
+        text (str | dict): Le texte, ou un dict nom de salle -> texte
+                           (None est renvoyé tel quel)
+
+    Returns:
+        str | dict: Le texte partagé
+    """
+    if text is None:
+        return None
+    if isinstance(text, dict):
+        return {key: sys.intern(value) for key, value in text.items()}
+    return sys.intern(text)
@@ -0,0 +1,201 @@
+"""
+Module Undo - Annulation des derniers tours par opérations inverses.
+
+Chaque modification de l'état pendant un tour (objet pris, déposé ou donné,
+déplacement du joueur ou d'un PNJ, réplique d'un PNJ, progression des
+quêtes...) enregistre l'opération qui la défait : un tuple (fonction,
+arguments), quelques références par modification, jamais une copie de la
+partie. La commande `undo` rejoue les opérations inverses des derniers tours,
+de la plus récente à la plus ancienne.
+
+Les modifications sont enregistrées dans le journal du tour en cours sur le
+thread courant (voir UndoLog.turn) ; hors d'un tour, record() ne fait rien.
+
+Exemples:
+
+>>> log = UndoLog()
+>>> inventory = {"corde": 1}
+>>> with log.turn():
+...     record(restore_entry, inventory, "corde", inventory.pop("corde"), 0)
+>>> inventory
+{}
+>>> log.undo()
+1
+>>> inventory
+{'corde': 1}
+"""
+
+import contextlib
+import threading
+from collections import deque
+
+# Nombre de tours qu'il est possible d'annuler
+UNDO_LIMIT = 100
+
+# Marque l'absence d'une valeur (clé ou attribut qui n'existait pas)
+MISSING = object()
+
+_active = threading.local()
+
+
+def record(operation, *args):
+    """
+    Enregistrer l'opération inverse d'une modification du tour en cours.
+
+    Args:
+        operation (callable): La fonction qui défait la modification
+        *args: Ses arguments
+    """
+    operations = getattr(_active, "operations", None)
+    if operations is not None:
+        operations.append((operation, *args))
+
+
+def pending():
+    """Vrai si le tour en cours a déjà enregistré une modification."""
+    return bool(getattr(_active, "operations", None))
+
+
+def record_attribute(obj, name):
+    """
+    Enregistrer la valeur actuelle d'un attribut, avant de le modifier.
+
+    Args:
+        obj: L'objet
+        name (str): Le nom de l'attribut
+    """
+    if getattr(_active, "operations", None) is not None:
+        record(restore_attribute, obj, name, getattr(obj, name, MISSING))
+
+
+def restore_attribute(obj, name, value):
+    """Remettre un attribut à `value` (le supprimer si `value` est MISSING)."""
+    if value is MISSING:
+        if hasattr(obj, name):
+            delattr(obj, name)
+    else:
+        setattr(obj, name, value)
+
+
+def restore_entry(mapping, key, value, position):
+    """
+    Remettre `key` dans `mapping`, à sa place d'origine.
+
+    Args:
+        mapping (dict): Le dictionnaire (inventaire, personnages d'une salle...)
+        key: La clé retirée
+        value: Sa valeur
+        position (int): Son rang dans le dictionnaire avant le retrait
+    """
+    if position >= len(mapping):
+        mapping[key] = value
+        return
+    entries = list(mapping.items())
+    entries.insert(position, (key, value))
+    mapping.clear()
+    mapping.update(entries)
+
+
+def remove_entry(mapping, key):
+    """Retirer `key` de `mapping` (inverse d'un ajout)."""
+    mapping.pop(key, None)
+
+
+def pop_entry(mapping, key):
+    """
+    Retirer `key` de `mapping` en enregistrant comment l'y remettre.
+
+    Returns:
+        La valeur retirée
+    """
+    if getattr(_active, "operations", None) is not None:
+        record(restore_entry, mapping, key, mapping[key], list(mapping).index(key))
+    return mapping.pop(key)
+
+
+def set_entry(mapping, key, value):
+    """Ajouter (ou remplacer) `key` dans `mapping` en enregistrant comment revenir en arrière."""
+    if key in mapping:
+        record(mapping.__setitem__, key, mapping[key])
+    else:
+        record(remove_entry, mapping, key)
+    mapping[key] = value
+
+
+def add_items(inventory, item, count=1):
+    """Ajouter `count` exemplaires à un inventaire en enregistrant comment les retirer."""
+    record(inventory.remove, item.name, count)
+    return inventory.add(item, count)
+
+
+def remove_items(inventory, name, count=1):
+    """
+    Retirer `count` exemplaires d'un inventaire en enregistrant comment les remettre.
+
+    Returns:
+        Item: La définition de l'objet
+    """
+    if getattr(_active, "operations", None) is not None:
+        record(inventory.add, inventory[name], count, list(inventory).index(name))
+    return inventory.remove(name, count)
+
+
+class UndoLog:
+    """
+    Journal borné des opérations inverses, tour par tour.
+
+    Seuls les tours qui ont modifié l'état sont gardés : `undo` ne compte
+    pas les commandes d'affichage (look, help...).
+
+    Attributs:
+        turns (deque): Opérations inverses des derniers tours (UNDO_LIMIT au plus)
+    """
+
+    def __init__(self, limit=UNDO_LIMIT):
+        self.turns = deque(maxlen=limit)
+        self._generation = 0
+
+    def __len__(self):
+        return len(self.turns)
+
+    @contextlib.contextmanager
+    def turn(self):
+        """Enregistrer les modifications faites sur ce thread pendant le bloc `with`."""
+        operations = []
+        generation = self._generation
+        previous = getattr(_active, "operations", None)
+        _active.operations = operations
+        try:
+            yield
+        finally:
+            _active.operations = previous
+            # Un tour qui a vidé le journal (restart, load) ne s'annule pas
+            if operations and generation == self._generation:
+                self.turns.append(operations)
+
+    def clear(self):
+        """Oublier tous les tours (partie rechargée ou sauvegardée)."""
+        self.turns.clear()
+        self._generation += 1
+
+    def undo(self, count=1):
+        """
+        Annuler les `count` derniers tours.
+
+        Args:
+            count (int): Nombre de tours à annuler
+
+        Returns:
+            int: Nombre de tours effectivement annulés
+        """
+        undone = 0
+        previous = getattr(_active, "operations", None)
+        _active.operations = None  # Les opérations inverses ne s'enregistrent pas
+        try:
+            while undone < count and self.turns:
+                for operation, *args in reversed(self.turns.pop()):
+                    operation(*args)
+                undone += 1
+        finally:
+            _active.operations = previous
+        return undone
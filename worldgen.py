@@ -0,0 +1,280 @@
+"""
+Module WorldGen - Génération procédurale de mondes pour tester le moteur à grande échelle.
+
+Un WorldGenerator produit, à partir d'une graine, un monde valide pour Game
+(jusqu'à plusieurs millions de salles) :
+- des salles disposées en grille : chaque rangée est un couloir Est/Ouest,
+  les rangées sont reliées Nord/Sud au hasard (toujours sur la première colonne,
+  ce qui garantit que tout le monde est connexe) ;
+- des passages à sens unique (`D`), comme Cliff -> Cave sur l'île ;
+- des piles d'objets pesants (une définition partagée par sorte d'objet) et
+  des personnages qui se déplacent ;
+- des chaînes de quêtes dont chaque étape s'active en entrant dans un lieu.
+
+La génération est un flux : records() produit les salles une par une, en ne
+gardant en mémoire qu'une rangée de la grille. Le générateur s'utilise
+directement comme constructeur de monde :
+
+    game = Game("Capitaine", world_builder=WorldGenerator(100_000, seed=1))
+    game.setup()
+
+Exemples:
+
+>>> from game import Game
+>>> game = Game("Test", seed=0, world_builder=WorldGenerator(50, seed=1))
+>>> game.setup()
+>>> len(game.rooms)
+50
+>>> game.player.current_room is game.rooms[0]
+True
+>>> game.npc_mixing_rounds
+226
+"""
+
+import random
+from collections import deque
+from math import isqrt
+
+from character import Character
+from item import Item
+from quest import Quest
+from room import Room
+
+# Taille (en salles) du côté d'une région de même biome
+REGION_SIZE = 16
+
+BIOMES = (
+    ("Plage", "une plage de sable blanc balayée par les alizés."),
+    ("Jungle", "une jungle épaisse où résonnent des cris d'oiseaux."),
+    ("Marais", "un marais brumeux aux eaux stagnantes."),
+    ("Rocher", "un éperon rocheux battu par les vagues."),
+    ("Clairière", "une clairière baignée de lumière."),
+    ("Grotte", "une grotte humide aux parois luisantes."),
+)
+
+ITEM_KINDS = (
+    ("coquillage", "un coquillage nacré.", 0),
+    ("noix", "une noix de coco bien mûre.", 1),
+    ("corde", "une corde de chanvre enroulée.", 2),
+    ("pierre", "une pierre polie par la mer.", 3),
+    ("coffre", "un petit coffre cabossé.", 5),
+)
+
+CHARACTER_KINDS = (
+    ("Perroquet", "un perroquet bavard qui vole de branche en branche.",
+     ("Coco ! Coco !", "Le trésor n'est jamais là où on le cherche !")),
+    ("Singe", "un singe curieux qui vous observe.",
+     ("Ouh ouh ah ah !",)),
+    ("Tortue", "une vieille tortue qui avance lentement.",
+     ("J'ai vu passer bien des naufragés...", "Prends ton temps, voyageur.")),
+)
+
+# Nombre maximal d'exemplaires d'une pile d'objets générée
+MAX_STACK = 3
+
+REWARD_GOLD = "Pièce d'or"
+REWARD_BAG = "Sac à dos moyen (+5kg)"
+# Effets des récompenses (voir rewards) : la pièce d'or n'est qu'un souvenir
+REWARD_EFFECTS = {REWARD_BAG: [("capacity", 5)]}
+
+
+class WorldGenerator:
+    """
+    Générateur de mondes déterministe (même graine, même monde).
+
+    Attributs:
+        n_rooms (int): Nombre de salles
+        seed (int): Graine de la génération
+        width (int): Largeur de la grille de salles
+        item_rate (float): Probabilité qu'une salle contienne un objet
+        character_rate (float): Probabilité qu'un personnage naisse dans une salle
+        link_rate (float): Probabilité d'un passage Nord/Sud entre deux rangées
+        one_way_rate (float): Probabilité d'un passage à sens unique depuis une salle
+        quest_every (int): Nombre de salles par chaîne de quêtes
+    """
+
+    # pylint: disable=too-many-instance-attributes, too-many-arguments
+    def __init__(self, n_rooms, seed=0, item_rate=0.3, character_rate=0.02,
+                 link_rate=0.5, one_way_rate=0.05, quest_every=100):
+        if n_rooms < 1:
+            raise ValueError("Le monde doit contenir au moins une salle")
+        self.n_rooms = n_rooms
+        self.seed = seed
+        self.width = isqrt(n_rooms - 1) + 1
+        self.item_rate = item_rate
+        self.character_rate = character_rate
+        self.link_rate = link_rate
+        self.one_way_rate = one_way_rate
+        self.quest_every = quest_every
+
+    def _biome(self, index):
+        """Biome de la région qui contient la salle `index`."""
+        region_x = (index % self.width) // REGION_SIZE
+        region_y = (index // self.width) // REGION_SIZE
+        mixed = (region_x * 73856093) ^ (region_y * 19349663) ^ (self.seed * 83492791)
+        return BIOMES[mixed % len(BIOMES)]
+
+    def room_name(self, index):
+        """Nom (unique) de la salle `index`."""
+        return f"{self._biome(index)[0]}-{index}"
+
+    def room_description(self, index):
+        """Description de la salle `index` (partagée par les salles d'un même biome)."""
+        return self._biome(index)[1]
+
+    # pylint: disable=too-many-locals, too-many-branches, too-many-statements
+    def records(self):
+        """
+        Produire le monde sous forme de flux d'enregistrements.
+
+        Yields:
+            tuple: ("room", (indice, nom, description, {direction: indice},
+                             [(nom, description, poids, quantité)],
+                             [(nom, description, messages)]))
+                   ou ("quest", (titre, description, objectifs, récompense,
+                                 nom du lieu déclencheur ou None))
+        """
+        rng = random.Random(self.seed)
+        n_rooms = self.n_rooms
+        width = self.width
+        linked_north = bytearray(width)  # Passage Sud depuis la rangée précédente
+        recent_rooms = []
+        recent_items = []
+        recent_characters = []
+        triggers = set()
+        chain = 0
+
+        for index in range(n_rooms):
+            x = index % width
+            exits = {}
+            if x > 0:
+                exits["O"] = index - 1
+            if linked_north[x]:
+                exits["N"] = index - width
+            if x + 1 < width and index + 1 < n_rooms:
+                exits["E"] = index + 1
+            south = index + width < n_rooms and (x == 0 or rng.random() < self.link_rate)
+            if south:
+                exits["S"] = index + width
+            linked_north[x] = south
+            if index + 1 < n_rooms and rng.random() < self.one_way_rate:
+                exits["D"] = rng.randrange(index + 1, min(n_rooms, index + 3 * width))
+
+            name = self.room_name(index)
+            items = []
+            if rng.random() < self.item_rate:
+                kind, description, weight = ITEM_KINDS[rng.randrange(len(ITEM_KINDS))]
+                items.append((kind, description, weight, 1 + rng.randrange(MAX_STACK)))
+                recent_items.append((kind, name))
+            characters = []
+            if index and rng.random() < self.character_rate:
+                kind, description, msgs = CHARACTER_KINDS[rng.randrange(len(CHARACTER_KINDS))]
+                characters.append((f"{kind}-{index}", description, msgs))
+                recent_characters.append(characters[0][0])
+            recent_rooms.append(name)
+
+            yield "room", (index, name, self.room_description(index), exits, items, characters)
+
+            if len(recent_rooms) >= self.quest_every or index + 1 == n_rooms:
+                yield from self._quest_chain(rng, chain, recent_rooms, recent_items,
+                                             recent_characters, triggers)
+                chain += 1
+                recent_rooms = []
+                recent_items = []
+                recent_characters = []
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    @staticmethod
+    def _quest_chain(rng, chain, rooms, items, characters, triggers):
+        """
+        Produire une chaîne de quêtes sur les salles, objets et personnages d'une zone.
+
+        La première étape s'active en entrant dans la zone (dès le départ pour la
+        chaîne 0), chaque étape suivante en visitant le dernier lieu de la précédente.
+        """
+        def trigger(room_name):
+            if room_name in triggers:
+                return None
+            triggers.add(room_name)
+            return room_name
+
+        first, second = rng.sample(rooms, 2) if len(rooms) > 1 else (rooms[0], rooms[0])
+        yield "quest", (f"Exploration {chain}", "Explorez les environs.",
+                        [f"Visiter {first}", f"Visiter {second}"], REWARD_GOLD,
+                        None if chain == 0 else trigger(rooms[0]))
+        last_room = second
+        if items:
+            item_name, item_room = items[rng.randrange(len(items))]
+            reward = REWARD_BAG if chain % 5 == 4 else REWARD_GOLD
+            yield "quest", (f"Collecte {chain}", "Récupérez un objet oublié.",
+                            [f"prendre {item_name}"], reward, trigger(last_room))
+            last_room = item_room
+        if characters:
+            yield "quest", (f"Rencontre {chain}", "Trouvez un habitant de l'île.",
+                            [f"parler avec {characters[rng.randrange(len(characters))]}"],
+                            REWARD_GOLD, trigger(last_room))
+
+    @property
+    def mixing_rounds(self):
+        """
+        int: Ordre de grandeur du temps de mélange de la marche des PNJ, en tours.
+
+        Sur une grille de w x h salles, une marche aléatoire oublie son point de
+        départ après environ w² + h² déplacements ; un PNJ se déplace un tour
+        sur deux.
+        """
+        height = -(-self.n_rooms // self.width)
+        return 2 * (self.width ** 2 + height ** 2)
+
+    def __call__(self, game):
+        """
+        Construire le monde dans `game` (utilisé comme Game.world_builder).
+
+        Args:
+            game (Game): Le jeu en cours de configuration
+
+        Returns:
+            Room: La salle de départ
+        """
+        rooms = [Room(self.room_name(i), self.room_description(i))
+                 for i in range(self.n_rooms)]
+        game.rooms.extend(rooms)
+        game.reward_effects = dict(REWARD_EFFECTS)
+        game.npc_mixing_rounds = self.mixing_rounds
+        definitions = {}  # Une seule définition (Item) par sorte d'objet
+        for kind, record in self.records():
+            if kind == "room":
+                index, _name, _description, exits, items, characters = record
+                room = rooms[index]
+                if exits:
+                    room.exits = {direction: rooms[target] for direction, target in exits.items()}
+                for name, description, weight, quantity in items:
+                    item = definitions.get(name)
+                    if item is None:
+                        item = definitions[name] = Item(name, description, weight)
+                    room.inventory.add(item, quantity)
+                for name, description, msgs in characters:
+                    room.characters[name] = Character(name, description, room, msgs)
+            else:
+                add_quest(game, record)
+        return rooms[0]
+
+
+def add_quest(game, record):
+    """
+    Ajouter au jeu une quête produite par WorldGenerator.records().
+
+    Args:
+        game (Game): Le jeu en cours de configuration
+        record (tuple): (titre, description, objectifs, récompense,
+                         nom du lieu déclencheur ou None)
+    """
+    title, description, objectives, reward, trigger_room = record
+    quest = Quest(title, description, objectives, reward)
+    manager = game.quest_manager
+    manager.add_quest(quest)
+    if trigger_room is None:
+        quest.activate()
+        manager.active_quests.append(quest)
+    else:
+        game.auto_activate_map[trigger_room] = title
@@ -0,0 +1,525 @@
+"""
+Module WorldStore - Monde stocké sur disque et chargé à la demande.
+
+Un monde généré (worldgen.WorldGenerator) est écrit une fois dans un fichier
+découpé en régions de salles contiguës, puis lu par mmap : seules les salles à
+moins de `radius` passages d'un joueur sont construites en mémoire (Room, objets,
+personnages). Les salles qui s'éloignent sont évincées ; si leur inventaire ou
+leurs personnages (présence, dialogue, horloge) ont changé, seul cet état est
+conservé, puis réappliqué quand la salle est rechargée. La mémoire occupée
+dépend du voisinage du joueur et de ce qu'il a modifié, pas de la taille du
+monde.
+
+Les PNJ ne sont simulés qu'à proximité d'un joueur. Un PNJ lu dans le fichier
+part de sa salle d'origine sans rattraper les tours écoulés avant son
+chargement ; ensuite, chaque réveil rattrape les tours manqués (borné par le
+temps de mélange enregistré avec le monde, voir Character.sample_position).
+
+Format du fichier (entiers fixes en little-endian, enregistrements en varint
+comme dans savegame) :
+    - en-tête : MAGIC, version, nombre de salles, salles par région,
+      positions de la table des régions, des textes et des métadonnées
+    - régions : position (uint32, relative à la région) de chaque salle, puis
+      les salles (nom, description, sorties, piles d'objets, personnages)
+    - table des régions : position (uint64) de chaque région
+    - table des textes : descriptions et répliques, chacune écrite une seule
+      fois ; les salles, objets et personnages y renvoient par indice
+    - métadonnées : directions utilisées, quêtes, salle de départ, temps de
+      mélange de la marche des PNJ (WorldGenerator.mixing_rounds)
+
+Utilisation:
+    python worldstore.py <fichier> <salles> [graine]
+
+Exemples:
+
+>>> import gc, os, tempfile
+>>> from game import Game
+>>> from worldgen import WorldGenerator
+>>> path = os.path.join(tempfile.mkdtemp(), "monde.tbaw")
+>>> write_world(path, WorldGenerator(10_000, seed=1))
+>>> game = Game("Test", seed=0, world_builder=StoredWorld(path))
+>>> game.setup()
+>>> len(game.rooms), len(game.rooms.resident) < 50
+(10000, True)
+>>> game.player.current_room.name
+'Jungle-0'
+>>> game.npc_mixing_rounds == WorldGenerator(10_000, seed=1).mixing_rounds
+True
+
+Une salle évincée garde l'état de ses PNJ (ici un dialogue entamé) :
+
+>>> perroquet = game.rooms[5005].characters["Perroquet-5005"]
+>>> _ = perroquet.get_msg()
+>>> del perroquet
+>>> game.rooms.refresh([game.player.current_room])
+>>> _ = gc.collect()
+>>> 5005 in game.rooms.resident
+False
+>>> game.rooms[5005].characters["Perroquet-5005"].dialogue_state() != (0, 0)
+True
+"""
+
+import mmap
+import struct
+import sys
+import threading
+import weakref
+
+from character import Character
+from item import Item
+from room import Room, WatchedDict
+from savegame import Reader, Writer
+from texts import shared
+from worldgen import REWARD_EFFECTS, WorldGenerator, add_quest
+
+MAGIC = b"TBAW"
+FORMAT_VERSION = 4
+REGION_ROOMS = 1024
+DEFAULT_RADIUS = 2
+
+_HEADER = struct.Struct("<4sBQIQQQ")
+_ROOM_OFFSET = struct.Struct("<I")
+_REGION_OFFSET = struct.Struct("<Q")
+
+
+class WorldStoreError(Exception):
+    """Erreur levée quand un fichier de monde est illisible ou incompatible."""
+
+
+def write_world(path, generator, region_rooms=REGION_ROOMS):
+    """
+    Écrire le monde produit par `generator` dans un fichier.
+
+    Le flux generator.records() est consommé au fil de l'eau : seules la région
+    en cours d'écriture, les quêtes et la table des textes sont gardées en mémoire.
+
+    Args:
+        path (str | Path): Le fichier à écrire
+        generator (WorldGenerator): Le générateur du monde
+        region_rooms (int): Nombre de salles par région
+    """
+    # pylint: disable=too-many-locals
+    directions = set()
+    quests = []
+    region_offsets = []
+    strings = {}  # texte -> indice dans la table des textes
+    region = Writer()
+    room_offsets = []
+    n_rooms = 0
+
+    with open(path, "wb") as file:
+        file.write(bytes(_HEADER.size))
+
+        def text_ref(text):
+            region.uint(strings.setdefault(text, len(strings)))
+
+        def flush_region():
+            region_offsets.append(file.tell())
+            table_size = _ROOM_OFFSET.size * len(room_offsets)
+            for offset in room_offsets:
+                file.write(_ROOM_OFFSET.pack(table_size + offset))
+            file.write(region.buf)
+            region.buf.clear()
+            room_offsets.clear()
+
+        for kind, record in generator.records():
+            if kind == "quest":
+                quests.append(record)
+                continue
+            _index, name, description, exits, items, characters = record
+            directions.update(exits)
+            room_offsets.append(len(region.buf))
+            region.text(name)
+            text_ref(description)
+            region.uint(len(exits))
+            for direction, target in exits.items():
+                region.text(direction)
+                region.uint(target)
+            region.uint(len(items))
+            for item_name, item_description, weight, quantity in items:
+                region.text(item_name)
+                text_ref(item_description)
+                region.uint(weight)
+                region.uint(quantity)
+            region.uint(len(characters))
+            for character_name, character_description, msgs in characters:
+                region.text(character_name)
+                text_ref(character_description)
+                region.uint(len(msgs))
+                for line in msgs:
+                    text_ref(line)
+            n_rooms += 1
+            if len(room_offsets) == region_rooms:
+                flush_region()
+        if room_offsets:
+            flush_region()
+
+        table_offset = file.tell()
+        for offset in region_offsets:
+            file.write(_REGION_OFFSET.pack(offset))
+
+        strings_offset = file.tell()
+        table = Writer()
+        table.texts(list(strings))
+        file.write(table.buf)
+
+        meta_offset = file.tell()
+        meta = Writer()
+        meta.texts(sorted(directions))
+        meta.uint(len(quests))
+        for title, description, objectives, reward, trigger_room in quests:
+            meta.text(title)
+            meta.text(description)
+            meta.texts(objectives)
+            meta.text(reward)
+            meta.text(trigger_room or "")
+        meta.uint(0)  # Salle de départ
+        meta.uint(generator.mixing_rounds)
+        file.write(meta.buf)
+
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, n_rooms, region_rooms,
+                                table_offset, strings_offset, meta_offset))
+
+
+class LazyExits(WatchedDict):
+    """
+    Sorties d'une salle stockée : direction -> indice, résolu en Room à la lecture.
+
+    Lire une sortie charge la salle voisine ; targets() donne les indices sans
+    rien charger.
+    """
+
+    __slots__ = ("_world",)
+
+    def __init__(self, world, targets):
+        super().__init__(None, (), targets)
+        self._world = world
+
+    def targets(self):
+        """Indices des salles voisines, sans les charger."""
+        return dict.values(self)
+
+    def __getitem__(self, direction):
+        return self._world[dict.__getitem__(self, direction)]
+
+    def get(self, direction, default=None):
+        target = dict.get(self, direction)
+        return default if target is None else self._world[target]
+
+    def values(self):
+        return [self._world[target] for target in dict.values(self)]
+
+    def items(self):
+        return [(direction, self._world[target]) for direction, target in dict.items(self)]
+
+    def walk(self, moves, rng):
+        """
+        Marche aléatoire de `moves` déplacements depuis cette salle (voir
+        Character.sample_position), sur les indices : seule la salle
+        d'arrivée est chargée.
+
+        Returns:
+            Room: La salle d'arrivée (None si la marche n'a pas bougé)
+        """
+        world = self._world
+        targets = list(dict.values(self))
+        index = None
+        for _ in range(moves):
+            if not targets:
+                break
+            index = rng.choice(targets)
+            targets = world.exit_targets(index)
+        return None if index is None else world[index]
+
+
+class _StoredInventories:
+    """Inventaires d'origine (baseline["inventories"]), relus dans le fichier à la demande."""
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ("_world",)
+
+    def __init__(self, world):
+        self._world = world
+
+    def get(self, index, default=None):
+        """Piles (nom, quantité) d'origine de la salle `index`."""
+        if not 0 <= index < len(self._world):
+            return default
+        items = self._world._read_room(index)[3]  # pylint: disable=protected-access
+        return tuple((item[0], item[3]) for item in items)
+
+
+class _StoredCharacters:
+    """
+    Origine des PNJ (baseline["characters"]) : seuls les PNJ encore en mémoire
+    sont connus, les autres n'ont pas quitté leur état d'origine.
+    """
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ("_world",)
+
+    def __init__(self, world):
+        self._world = world
+
+    def get(self, name, default=None):
+        """(salle d'origine, état du dialogue d'origine) du PNJ `name`."""
+        world = self._world
+        character = world._characters.get(name)  # pylint: disable=protected-access
+        if character is None:
+            return default
+        return world._origins[character], (0, 0)  # pylint: disable=protected-access
+
+
+class LazyWorld:
+    """
+    Salles d'un fichier de monde, construites à la demande.
+
+    S'utilise comme la liste Game.rooms : len(world), world[i] (qui charge la
+    salle si besoin) ; l'itération ne parcourt que les salles chargées.
+
+    Attributs:
+        radius (int): Distance (en passages) en deçà de laquelle les salles restent chargées
+        resident (dict): indice -> Room des salles chargées
+        baseline (dict): État d'origine du monde (voir savegame.baseline), relu dans
+                         le fichier plutôt que gardé en mémoire
+    """
+
+    def __init__(self, path, radius=DEFAULT_RADIUS):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise WorldStoreError("Ce fichier n'est pas un monde TBA.")
+        (magic, version, self._n_rooms, self._region_rooms, self._table_offset,
+         strings_offset, self._meta_offset) = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise WorldStoreError("Ce fichier n'est pas un monde TBA.")
+        if version != FORMAT_VERSION:
+            raise WorldStoreError(f"Version de monde non supportée ({version}).")
+        reader = Reader(self._map)
+        reader.pos = strings_offset
+        self._strings = [shared(text) for text in reader.texts()]
+        self.radius = radius
+        self.resident = {}
+        self._alive = weakref.WeakValueDictionary()  # Salles encore référencées ailleurs
+        self._overlay = {}      # indice -> (inventaire, personnages) des salles évincées modifiées
+        self._characters = weakref.WeakValueDictionary()  # nom -> PNJ lu dans le fichier
+        self._origins = weakref.WeakKeyDictionary()       # PNJ -> indice de sa salle d'origine
+        self._item_types = {}   # nom -> définition (Item) partagée par toutes les piles
+        self.baseline = {"inventories": _StoredInventories(self),
+                         "characters": _StoredCharacters(self),
+                         "items": {}}  # Une entrée par nom d'objet, pas par salle
+        # Chargement et éviction peuvent venir de threads différents (un par joueur)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._n_rooms
+
+    def __iter__(self):
+        return iter(list(self.resident.values()))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._n_rooms
+        if not 0 <= index < self._n_rooms:
+            raise IndexError("Indice de salle hors du monde.")
+        room = self.resident.get(index)
+        if room is None:
+            with self._lock:
+                room = self.resident.get(index) or self._alive.get(index)
+                if room is None:
+                    room = self._load(index)
+                else:
+                    self._overlay.pop(index, None)
+                self.resident[index] = room
+        return room
+
+    def metadata(self):
+        """
+        Lire les métadonnées du monde.
+
+        Returns:
+            tuple: (directions, [(titre, description, objectifs, récompense,
+                    lieu déclencheur ou None)], indice de la salle de départ,
+                    temps de mélange de la marche des PNJ en tours)
+        """
+        reader = Reader(self._map)
+        reader.pos = self._meta_offset
+        directions = reader.texts()
+        quests = [(reader.text(), reader.text(), reader.texts(), reader.text(),
+                   reader.text() or None) for _ in range(reader.uint())]
+        return directions, quests, reader.uint(), reader.uint()
+
+    def _reader(self, index):
+        """Lecteur positionné sur l'enregistrement de la salle `index`."""
+        region, slot = divmod(index, self._region_rooms)
+        (start,) = _REGION_OFFSET.unpack_from(
+            self._map, self._table_offset + _REGION_OFFSET.size * region)
+        (offset,) = _ROOM_OFFSET.unpack_from(self._map, start + _ROOM_OFFSET.size * slot)
+        reader = Reader(self._map)
+        reader.pos = start + offset
+        return reader
+
+    def room_description(self, index):
+        """Description de la salle `index`, lue sans construire la salle."""
+        room = self.resident.get(index)
+        if room is not None:
+            return room.description
+        reader = self._reader(index)
+        reader.text()
+        return self._strings[reader.uint()]
+
+    def _read_room(self, index):
+        """Décoder l'enregistrement de la salle `index` dans le fichier."""
+        reader = self._reader(index)
+        strings = self._strings
+        name = reader.text()
+        description = strings[reader.uint()]
+        exits = {reader.text(): reader.uint() for _ in range(reader.uint())}
+        items = [(reader.text(), strings[reader.uint()], reader.uint(), reader.uint())
+                 for _ in range(reader.uint())]
+        characters = [(reader.text(), strings[reader.uint()],
+                       [strings[reader.uint()] for _ in range(reader.uint())])
+                      for _ in range(reader.uint())]
+        return name, description, exits, items, characters
+
+    def exit_targets(self, index):
+        """Indices des salles voisines de la salle `index`, sans la charger."""
+        room = self.resident.get(index)
+        if room is not None:
+            return list(room.exits.targets())
+        reader = self._reader(index)
+        reader.text()  # Nom
+        reader.uint()  # Description
+        targets = []
+        for _ in range(reader.uint()):
+            reader.text()  # Direction
+            targets.append(reader.uint())
+        return targets
+
+    def _load(self, index):
+        """Construire la salle `index` et lui réappliquer son état modifié."""
+        name, description, exits, items, characters = self._read_room(index)
+        room = Room(name, description)
+        room.index = index
+        room.exits = LazyExits(self, exits)
+
+        for item in items:
+            self.baseline["items"].setdefault(item[0], index)
+
+        overlay = self._overlay.pop(index, None)
+        if overlay is None:
+            for item_name, item_description, weight, quantity in items:
+                item = self._item_types.get(item_name)
+                if item is None:
+                    item = self._item_types[item_name] = Item(item_name, item_description,
+                                                              weight)
+                room.inventory.add(item, quantity)
+            for character_name, character_description, msgs in characters:
+                character = Character(character_name, character_description, room, msgs)
+                character.last_round = None  # Pas encore simulé (voir Game._move_character)
+                room.characters[character_name] = character
+                self._characters[character_name] = character
+                self._origins[character] = index
+        else:
+            room.inventory, room.characters = overlay
+            for character in room.characters.values():
+                character.current_room = room
+        self._alive[index] = room
+        return room
+
+    def _evict(self, index):
+        """Retirer une salle de la mémoire en ne gardant que son état modifié."""
+        room = self.resident.pop(index)
+        _name, _description, _exits, items, characters = self._read_room(index)
+        # Un PNJ qui a parlé ou déjà été simulé garde son état (dialogue, horloge)
+        if (room.inventory.contents() != tuple((item[0], item[3]) for item in items)
+                or tuple(room.characters) != tuple(character[0] for character in characters)
+                or any(character.dialogue_state() != (0, 0) or character.last_round is not None
+                       for character in room.characters.values())):
+            self._overlay[index] = (room.inventory, room.characters)
+
+    def refresh(self, centers):
+        """
+        Charger les salles à moins de `radius` passages des `centers`, évincer les autres.
+
+        Args:
+            centers (list): Les salles des joueurs
+        """
+        near = {center.index for center in centers if center is not None}
+        ring = list(near)
+        with self._lock:
+            for _ in range(self.radius):
+                next_ring = []
+                for index in ring:
+                    for target in self[index].exits.targets():
+                        if target not in near:
+                            near.add(target)
+                            next_ring.append(target)
+                ring = next_ring
+            for index in ring:
+                self[index]  # pylint: disable=pointless-statement
+            for index in list(self.resident):
+                if index not in near:
+                    self._evict(index)
+
+    def modified_rooms(self):
+        """
+        Lister les salles qui peuvent différer de l'origine (pour savegame).
+
+        Returns:
+            list: Les salles chargées, encore référencées ou évincées avec un état modifié
+        """
+        with self._lock:
+            indices = set(self._alive.keys()) | set(self._overlay)
+            return [self[index] for index in sorted(indices)]
+
+
+class StoredWorld:
+    """
+    Constructeur de monde (Game.world_builder) qui lit un fichier de write_world().
+
+    Attributs:
+        path (str | Path): Le fichier du monde
+        radius (int): Rayon des salles gardées en mémoire autour des joueurs
+    """
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, path, radius=DEFAULT_RADIUS):
+        self.path = path
+        self.radius = radius
+
+    def __call__(self, game):
+        """
+        Ouvrir le monde dans `game` : Game.rooms devient un LazyWorld.
+
+        Args:
+            game (Game): Le jeu en cours de configuration
+
+        Returns:
+            Room: La salle de départ
+        """
+        world = LazyWorld(self.path, self.radius)
+        game.rooms = world
+        directions, quests, start, mixing_rounds = world.metadata()
+        game.valid_directions.update(directions)
+        game.npc_mixing_rounds = mixing_rounds
+        game.reward_effects = dict(REWARD_EFFECTS)
+        for record in quests:
+            add_quest(game, record)
+        return world[start]
+
+
+def main():
+    """Point d'entrée : générer un monde et l'écrire dans un fichier."""
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print("Utilisation: python worldstore.py <fichier> <salles> [graine]")
+        return
+    seed = int(args[2]) if len(args) > 2 else 0
+    write_world(args[0], WorldGenerator(int(args[1]), seed))
+    print(f"Monde de {int(args[1])} salles écrit dans {args[0]}.")
+
+
+if __name__ == "__main__":
+    main()